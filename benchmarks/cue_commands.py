@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Edit, undo and redo of the settings of many selected cues.
+
+The `UpdateCuesCommand`, keeping only the changed properties, is compared
+with a command storing the whole properties of the cues as strings (the
+previous implementation). The memory retained by the command is also
+reported. Each measure is the best of some runs.
+"""
+
+from ast import literal_eval
+from argparse import ArgumentParser
+from time import perf_counter
+
+from lisp.command.cue import UpdateCuesCommand
+from lisp.core.util import deep_sizeof
+from lisp.cues.cue import Cue
+
+
+class StringUpdateCuesCommand:
+    """The previous UpdateCuesCommand, the properties are kept as strings."""
+
+    def __init__(self, properties, cues):
+        self.__cues = cues
+        self.__new = properties
+        self.__old = str([cue.properties() for cue in cues])
+
+    def do(self):
+        for cue in self.__cues:
+            cue.update_properties(self.__new)
+
+        self.__new = str(self.__new)
+
+    def undo(self):
+        for cue, old in zip(self.__cues, literal_eval(self.__old)):
+            cue.update_properties(old)
+
+    def redo(self):
+        self.__new = literal_eval(self.__new)
+        self.do()
+
+    def memory(self):
+        return deep_sizeof((self.__new, self.__old))
+
+
+def measure(command_class, cues, repeat):
+    """Return the best edit, undo and redo times, and the command memory."""
+    times = []
+    for run in range(repeat):
+        properties = {"pre_wait": run + 1.5, "stylesheet": f"color: #{run}"}
+
+        started = perf_counter()
+        command = command_class(properties, cues)
+        command.do()
+        edit = perf_counter() - started
+
+        started = perf_counter()
+        command.undo()
+        undo = perf_counter() - started
+
+        started = perf_counter()
+        command.redo()
+        redo = perf_counter() - started
+
+        times.append((edit, undo, redo))
+        command.undo()
+
+    edit, undo, redo = (min(column) for column in zip(*times))
+    return edit, undo, redo, command.memory()
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--cues", type=int, nargs="+", default=[100, 1000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for cues_count in args.cues:
+        cues = [Cue(None) for _ in range(cues_count)]
+        for name, command_class in (
+            ("changed", UpdateCuesCommand),
+            ("string", StringUpdateCuesCommand),
+        ):
+            edit, undo, redo, memory = measure(command_class, cues, args.repeat)
+            print(
+                f"{cues_count:5} cues, {name:<8}: edit {edit * 1000:8.2f}ms "
+                f"undo {undo * 1000:8.2f}ms redo {redo * 1000:8.2f}ms, "
+                f"memory {memory / 1024:8.1f}KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cue lookups by class, state and name, on a large synthetic model.
+
+The `CueModel` indexed lookups are compared with a scan of all the cues
+(the previous implementation): filtering by class, finding the running
+cues, and searching by name as the user types (with the incremental
+search). The cost of the indexes, when adding and renaming cues, is also
+reported. Each measure is the best of some runs.
+"""
+
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+
+from lisp.cues.cue import Cue, CueState
+from lisp.cues.cue_index import search_tokens
+from lisp.cues.cue_model import CueModel
+
+WORDS = (
+    "intro overture scene act thunder rain wind door bell phone car crowd "
+    "music applause blackout fade chase spot wash finale bow encore"
+).split()
+
+# The text typed in a search box, one keystroke at a time
+TYPED = "scene 42 th"
+
+
+class AudioCue(Cue):
+    pass
+
+
+class VideoCue(Cue):
+    pass
+
+
+class ActionCue(Cue):
+    pass
+
+
+CLASSES = (AudioCue, AudioCue, AudioCue, VideoCue, ActionCue)
+
+
+def new_cues(count):
+    random.seed(0)
+    cues = []
+    for n in range(count):
+        cue = random.choice(CLASSES)(None)
+        cue.name = (
+            f"Scene {n // 100} {random.choice(WORDS)} {random.choice(WORDS)}"
+        )
+        cue.index = n
+        cues.append(cue)
+
+    return cues
+
+
+def scan_search(model, text):
+    query = search_tokens(text)
+    found = []
+    for cue in model:
+        tokens = search_tokens(cue.name)
+        if all(any(t.startswith(q) for t in tokens) for q in query):
+            found.append(cue)
+
+    return sorted(found, key=lambda cue: cue.index)
+
+
+def cue_ids(result):
+    """The cues ids, of each keystroke for the typing results."""
+    if result and isinstance(result[0], list):
+        return [cue_ids(step) for step in result]
+
+    return [cue.id for cue in result]
+
+
+def best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = perf_counter()
+        result = function()
+        times.append(perf_counter() - started)
+
+    return min(times), result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, default=10000)
+    parser.add_argument("--running", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cues = new_cues(args.cues)
+    model = CueModel()
+
+    started = perf_counter()
+    model.add_many(cues)
+    print(
+        f"{args.cues} cues, add_many {(perf_counter() - started) * 1000:.2f}ms"
+    )
+
+    for cue in random.sample(cues, args.running):
+        cue._state = CueState.Running
+        cue.started.emit(cue)
+
+    def typing(search):
+        return [search(TYPED[: n + 1]) for n in range(len(TYPED))]
+
+    lookups = (
+        (
+            "filter(AudioCue)",
+            lambda: list(model.filter(AudioCue)),
+            lambda: [cue for cue in model if isinstance(cue, AudioCue)],
+        ),
+        (
+            "in_state(IsRunning)",
+            lambda: list(model.in_state(CueState.IsRunning)),
+            lambda: [cue for cue in model if cue.state & CueState.IsRunning],
+        ),
+        (
+            f"search({TYPED!r})",
+            lambda: model.search(TYPED),
+            lambda: scan_search(model, TYPED),
+        ),
+        (
+            f"typing {TYPED!r}",
+            lambda: typing(model.searcher().update),
+            lambda: typing(lambda text: scan_search(model, text)),
+        ),
+    )
+
+    for name, indexed, scan in lookups:
+        indexed_time, indexed_result = best(indexed, args.repeat)
+        scan_time, scan_result = best(scan, args.repeat)
+
+        # Same cues, in the same order
+        assert cue_ids(indexed_result) == cue_ids(scan_result)
+        print(
+            f"  {name:<22} index {indexed_time * 1000:8.3f}ms  "
+            f"scan {scan_time * 1000:8.3f}ms"
+        )
+
+    def rename(renamed):
+        for n, cue in enumerate(renamed):
+            cue.name = f"Renamed {n} {WORDS[n % len(WORDS)]}"
+
+    # Cues not in a model are not indexed
+    renamed = cues[:1000]
+    indexed_time, _ = best(lambda: rename(renamed), 1)
+    not_indexed = new_cues(len(renamed))
+    plain_time, _ = best(lambda: rename(not_indexed), 1)
+    print(
+        f"  {'rename (per cue)':<22} index {indexed_time * 1000:8.3f}µs  "
+        f"no index {plain_time * 1000:8.3f}µs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""CPU usage of many concurrent (python) fades.
+
+Compare the `Fader`, whose steps are performed by the `FadeScheduler`
+thread, with a fader stepping in its own thread (the previous
+implementation), measuring the process CPU time and the fades duration.
+"""
+
+from argparse import ArgumentParser
+from threading import Thread
+from time import perf_counter, process_time
+
+from lisp.core.fade_functions import FadeInType, ntime
+from lisp.core.fader import BaseFader, Fader
+from lisp.core.util import rgetattr, rsetattr
+
+
+class ThreadFader(BaseFader):
+    """The previous Fader, each fade loops in the calling thread."""
+
+    def _fade(self, duration, to_value, fade_type):
+        time = 0
+        functor = fade_type.value
+        duration = int(duration * 100)
+        base_value = rgetattr(self._target, self._attribute)
+        value_diff = to_value - base_value
+
+        while time <= duration and not self._running.is_set():
+            rsetattr(
+                self._target,
+                self._attribute,
+                round(
+                    functor(ntime(time, 0, duration), value_diff, base_value),
+                    6,
+                ),
+            )
+
+            time += 1
+            self._running.wait(0.01)
+
+    def current_time(self):
+        return 0
+
+
+class Target:
+    def __init__(self):
+        self.value = 0.0
+
+
+def measure(fader_class, fades, duration):
+    """Return (cpu seconds, mean fade duration, max fade duration)."""
+    durations = []
+
+    def fade():
+        fader = fader_class(Target(), "value")
+        fader.prepare()
+
+        started = perf_counter()
+        fader.fade(duration, 1, FadeInType.Linear)
+        durations.append(perf_counter() - started)
+
+    threads = [Thread(target=fade) for _ in range(fades)]
+
+    cpu = process_time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu = process_time() - cpu
+
+    return cpu, sum(durations) / len(durations), max(durations)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--fades", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.fades} concurrent fades of {args.duration}s")
+    for name, fader_class in (("Scheduler", Fader), ("Thread", ThreadFader)):
+        cpu, mean_duration, max_duration = measure(
+            fader_class, args.fades, args.duration
+        )
+        print(
+            f"  {name:<10} cpu {cpu:6.3f}s ({cpu / args.duration:5.1%})"
+            f"  duration mean {mean_duration:6.3f}s  max {max_duration:6.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
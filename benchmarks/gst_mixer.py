@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""CPU, memory and start latency of concurrent media, with and without the
+shared mixer.
+
+"pipeline" media end with their own sink (one device stream each), "mixer"
+media end with the "Mixer Out" element, sending the audio to the shared
+mixer output. For each number of concurrent media, all of them are
+started one after the other, the start latency (`GstMedia.start_latency`)
+is collected, then the CPU usage is measured while all of them are
+playing, and the resident memory (RSS) growth is reported.
+
+Requires GStreamer (and PyGObject) and an audio output, each measure runs
+in a new process.
+"""
+
+import os
+import sys
+import tempfile
+import wave
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from math import pi, sin
+from multiprocessing import get_context
+from time import perf_counter, process_time, sleep
+
+# Media output element, and mixer output sink, for each sink
+SINKS = {
+    "auto": ("AutoSink", "autoaudiosink"),
+    "pulse": ("PulseSink", "pulsesink"),
+    "alsa": ("AlsaSink", "alsasink"),
+    "jack": ("JackSink", "jackaudiosink"),
+}
+
+
+def rss():
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def write_wav(path, seconds, rate=44100):
+    frames = bytearray()
+    for n in range(rate):
+        sample = int(8000 * sin(2 * pi * 440 * n / rate))
+        frames += sample.to_bytes(2, "little", signed=True) * 2
+
+    with wave.open(path, "wb") as file:
+        file.setnchannels(2)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        for _ in range(seconds):
+            file.writeframes(frames)
+
+
+def run_events(app, seconds):
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        app.processEvents()
+        sleep(0.005)
+
+
+def measure(mode, concurrent, sink, uri, seconds):
+    """Return (latencies ms, cpu usage, rss bytes)."""
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+
+    from lisp.core.configuration import DummyConfiguration
+    from lisp.plugins.gst_backend import GstBackend, elements
+    from lisp.plugins.gst_backend.gi_repository import Gst
+    from lisp.plugins.gst_backend.gst_media import GstMedia
+    from lisp.plugins.gst_backend.gst_mixer import GstMixer
+
+    Gst.init(None)
+    elements.load()
+
+    output, mixer_output = SINKS[sink]
+    GstBackend.Config = DummyConfiguration({"mixerOutput": mixer_output})
+    if mode == "mixer":
+        output = "MixerSink"
+        # The mixer output is persistent, it's not part of a cue start
+        GstMixer().output(mixer_output)
+
+    properties = {
+        "pipe": ("UriInput", "Volume", output),
+        "elements": {"UriInput": {"uri": uri}},
+    }
+
+    media = []
+    for _ in range(concurrent):
+        media.append(GstMedia())
+        media[-1].update_properties(properties)
+        media[-1].arm()
+    run_events(app, 0.5)
+
+    memory = rss()
+    latencies = []
+    for item in media:
+        item.play()
+        latencies.append(item.start_latency)
+    run_events(app, 0.5)
+
+    cpu = process_time()
+    run_events(app, seconds)
+    cpu = (process_time() - cpu) / seconds
+    memory = rss() - memory
+
+    for item in media:
+        item.stop()
+    GstMixer().dispose()
+
+    return latencies, cpu, memory
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--concurrent", type=int, nargs="+", default=[1, 10, 50]
+    )
+    parser.add_argument("--sink", choices=tuple(SINKS), default="auto")
+    parser.add_argument(
+        "--seconds", type=int, default=5, help="CPU measure duration"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sine.wav")
+        write_wav(path, args.seconds + 5)
+        uri = "file://" + path
+
+        for concurrent in args.concurrent:
+            for mode in ("pipeline", "mixer"):
+                with ProcessPoolExecutor(1, get_context("spawn")) as executor:
+                    latencies, cpu, memory = executor.submit(
+                        measure, mode, concurrent, args.sink, uri, args.seconds
+                    ).result()
+
+                print(
+                    f"{concurrent:3} media, {mode:<8}: "
+                    f"start mean {sum(latencies) / len(latencies):6.2f}ms "
+                    f"max {max(latencies):6.2f}ms, "
+                    f"cpu {cpu:6.1%}, rss +{memory / 2**20:6.1f}MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Session load time and memory of media cues, lazy and eager pipelines.
+
+Media are created as when loading a session, by updating their properties.
+"lazy" leaves the pipelines in the NULL state (the current behavior),
+"eager" also moves all of them to READY, as they were before.
+The load time, the resident memory (RSS) growth and the number of
+pipelines holding their resources are reported. For the lazy mode also the
+mean time to arm a media, that is the cost moved to its first play, or to
+when it becomes the standby cue.
+
+Requires GStreamer (and PyGObject), each measure runs in a new process.
+"""
+
+import os
+import sys
+import tempfile
+import wave
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+
+PIPE = ("UriInput", "Volume", "Equalizer10", "DbMeter", "AutoSink")
+
+
+def rss():
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def write_wav(path, seconds=2, rate=44100):
+    with wave.open(path, "wb") as file:
+        file.setnchannels(2)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(bytes(4 * rate * seconds))
+
+
+def measure(mode, cues_count, pipe, uri):
+    """Return (load seconds, rss bytes, resident pipelines, arm seconds)."""
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+
+    from lisp.plugins.gst_backend import elements
+    from lisp.plugins.gst_backend.gi_repository import Gst
+    from lisp.plugins.gst_backend.gst_media import GstMedia
+    from lisp.plugins.gst_backend.gst_pipeline_pool import GstPipelinePool
+
+    Gst.init(None)
+    elements.load()
+    # As before, no limit to the idle pipelines
+    GstPipelinePool().max_idle = cues_count
+
+    properties = {"pipe": pipe, "elements": {"UriInput": {"uri": uri}}}
+    # Warm-up, load the GStreamer plugins
+    GstMedia().update_properties(properties)
+
+    memory = rss()
+    started = perf_counter()
+    media = []
+    for _ in range(cues_count):
+        media.append(GstMedia())
+        media[-1].update_properties(properties)
+        if mode == "eager":
+            media[-1].arm()
+    load = perf_counter() - started
+    app.processEvents()
+    memory = rss() - memory
+
+    arm = 0
+    if mode == "lazy":
+        armed = media[: min(16, cues_count)]
+        started = perf_counter()
+        for item in armed:
+            item.arm()
+        arm = (perf_counter() - started) / len(armed)
+
+        # The armed pipelines would be counted as resident
+        for item in armed:
+            item.release()
+
+    return load, memory, GstPipelinePool().resident(), arm
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, nargs="+", default=[50, 200, 600])
+    parser.add_argument(
+        "--pipe", nargs="+", default=PIPE, help="the media elements"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "silence.wav")
+        write_wav(path)
+        uri = "file://" + path
+
+        for cues_count in args.cues:
+            for mode in ("lazy", "eager"):
+                with ProcessPoolExecutor(1, get_context("spawn")) as executor:
+                    load, memory, resident, arm = executor.submit(
+                        measure, mode, cues_count, tuple(args.pipe), uri
+                    ).result()
+
+                print(
+                    f"{cues_count:4} cues, {mode:<5}: load {load:7.3f}s, "
+                    f"rss +{memory / 2**20:7.1f}MiB, "
+                    f"{resident:4} resident pipelines"
+                    + (f", arm {arm * 1000:6.2f}ms" if mode == "lazy" else "")
+                )
+
+
+if __name__ == "__main__":
+    main()
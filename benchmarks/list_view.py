@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Open time, scroll speed, and idle CPU usage of the list layout view.
+
+For each session size, the cues are created and added to the model, as
+when a session is loaded, and the (already shown) view is painted ("open"), then the view is scrolled page by page,
+rendering the whole view each time ("scroll", in frames per second).
+Finally the CPU time used while idle (no running cue) is measured, running
+the qt event-loop.
+"""
+
+import sys
+from argparse import ArgumentParser
+from time import perf_counter, process_time
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from lisp.cues.cue import Cue
+from lisp.cues.cue_model import CueModel
+from lisp.plugins.list_layout.list_view import CueListView
+from lisp.plugins.list_layout.models import CueListModel
+from lisp.ui.icons import IconTheme
+
+
+def run_loop(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+
+def measure(app, cues_count, scroll_steps, idle_seconds):
+    cue_model = CueModel()
+    list_model = CueListModel(cue_model)
+    view = CueListView(list_model)
+    view.resize(800, 600)
+    view.show()
+
+    started = perf_counter()
+    cues = []
+    for n in range(cues_count):
+        cue = Cue(None)
+        cue.name = f"Cue {n}"
+        cues.append(cue)
+    cue_model.add_many(cues)
+    view.grab()
+    app.processEvents()
+    open_time = perf_counter() - started
+
+    scroll_bar = view.verticalScrollBar()
+    started = perf_counter()
+    for step in range(scroll_steps):
+        scroll_bar.setValue(
+            (step * scroll_bar.pageStep()) % (scroll_bar.maximum() + 1)
+        )
+        view.grab()
+        app.processEvents()
+    fps = scroll_steps / (perf_counter() - started)
+
+    run_loop(0.2)
+    cpu = process_time()
+    run_loop(idle_seconds)
+    idle_cpu = (process_time() - cpu) / idle_seconds
+
+    view.close()
+    view.deleteLater()
+    cue_model.reset()
+    app.processEvents()
+
+    return open_time, fps, idle_cpu
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--cues", type=int, nargs="+", default=[500, 3000, 10000]
+    )
+    parser.add_argument("--scroll-steps", type=int, default=200)
+    parser.add_argument("--idle", type=float, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    IconTheme.set_theme_name("Numix")
+
+    for cues_count in args.cues:
+        open_time, fps, idle_cpu = measure(
+            app, cues_count, args.scroll_steps, args.idle
+        )
+        print(
+            f"{cues_count:6} cues: open {open_time:7.3f}s, "
+            f"scroll {fps:7.1f} fps, idle cpu {idle_cpu:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
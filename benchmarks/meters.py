@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""CPU usage of the dB-meters of many running cues, hidden and shown.
+
+The `MeterService` ("service") is compared with the meters connected
+directly to their element, always posting its levels ("direct", the
+previous implementation). Meters are "hidden" as when on another cart page,
+or scrolled out of view.
+
+To run without GStreamer, a stand-in element posts random levels every 33ms
+(as the `level` element), from the qt event-loop, while metering. The cost
+of parsing the GStreamer messages is not included.
+Each measure runs in a new process.
+"""
+
+import random
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import process_time
+
+
+class MeterElement:
+    """Stand-in for the DbMeter element."""
+
+    def __init__(self, metering):
+        from PyQt5.QtCore import QTimer
+
+        from lisp.core.signal import Signal
+
+        self.level_ready = Signal()
+        self.metering = metering
+
+        self.timer = QTimer()
+        self.timer.setInterval(33)
+        self.timer.timeout.connect(self.__post)
+        self.timer.start()
+
+    def set_metering(self, enable):
+        self.metering = enable
+
+    def __post(self):
+        if self.metering:
+            value = random.uniform(-40, 0)
+            self.level_ready.emit(
+                [value, value - 1], [value, value], [value + 1, value]
+            )
+
+
+def measure(mode, shown, meters, seconds):
+    """Return the CPU usage."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+    app = QApplication(sys.argv)
+
+    from lisp.ui.meters import MeterService
+    from lisp.ui.widgets import DBMeter
+
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    # Keep a reference, signals only hold weak-references to the slots
+    elements = []
+    for _ in range(meters):
+        element = MeterElement(metering=mode == "direct")
+        widget = DBMeter()
+        widget.setMinimumSize(200, 20)
+        widget.setVisible(shown)
+        layout.addWidget(widget)
+
+        if mode == "direct":
+            element.level_ready.connect(widget.plot)
+        else:
+            MeterService().watch(widget, element)
+
+        elements.append((element, widget))
+
+    window.resize(400, 900)
+    window.show()
+
+    loop = QEventLoop()
+    QTimer.singleShot(500, loop.quit)
+    loop.exec_()
+
+    cpu = process_time()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+    return (process_time() - cpu) / seconds
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--meters", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.meters} meters, {args.seconds}s")
+    for mode in ("direct", "service"):
+        for shown in (False, True):
+            with ProcessPoolExecutor(1, get_context("spawn")) as executor:
+                cpu = executor.submit(
+                    measure, mode, shown, args.meters, args.seconds
+                ).result()
+
+            print(f"  {mode:<8} {'shown' if shown else 'hidden':<7} {cpu:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Throughput of the waveform envelope reducer (peak and rms).
+
+The `audio_utils.peak_rms` is measured with each of its implementations
+available: audioop (removed in python 3.13, integer samples only), NumPy
+(if installed) and pure python. The channels mixed together by `audioop`
+(the implementation before `peak_rms`) are the reference. Buffers contain
+interleaved samples, as produced by the analysis pipeline.
+Results are given as "x realtime", i.e. seconds of audio per second.
+"""
+
+import array
+import random
+from argparse import ArgumentParser
+from time import perf_counter
+
+from lisp.backend import audio_utils
+
+
+def make_buffers(seconds, rate, channels, buffer_ms, floating):
+    frames = rate * buffer_ms // 1000
+    count = seconds * 1000 // buffer_ms
+    random.seed(0)
+
+    if floating:
+        samples = array.array(
+            "f", (random.uniform(-1, 1) for _ in range(frames * channels))
+        )
+    else:
+        samples = array.array(
+            "h",
+            (random.randint(-32768, 32767) for _ in range(frames * channels)),
+        )
+
+    # Different objects, but the same content, generation is slow
+    data = samples.tobytes()
+    return [bytes(data) for _ in range(count)]
+
+
+def run(name, function, buffers, seconds):
+    started = perf_counter()
+    for buffer in buffers:
+        function(buffer)
+    elapsed = perf_counter() - started
+
+    print(f"  {name:<20} {seconds / elapsed:10.0f}x realtime")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--buffer-ms", type=int, default=10)
+    args = parser.parse_args()
+
+    audioop = audio_utils.audioop
+    numpy = audio_utils.numpy
+    channels = args.channels
+
+    def peak_rms(data):
+        return audio_utils.peak_rms(data, channels, floating)
+
+    for floating in (False, True):
+        print(
+            f"{'float32' if floating else 'int16'}, {channels} channels, "
+            f"{args.rate}Hz, {args.buffer_ms}ms buffers, {args.seconds}s"
+        )
+        buffers = make_buffers(
+            args.seconds, args.rate, channels, args.buffer_ms, floating
+        )
+
+        variants = [("python", None, None)]
+        if numpy is not None:
+            variants.insert(0, ("numpy", None, numpy))
+        if audioop is not None and not floating:
+            variants.insert(0, ("audioop", audioop, numpy))
+
+        for name, variant_audioop, variant_numpy in variants:
+            audio_utils.audioop = variant_audioop
+            audio_utils.numpy = variant_numpy
+            try:
+                run(f"peak_rms ({name})", peak_rms, buffers, args.seconds)
+            finally:
+                audio_utils.audioop = audioop
+                audio_utils.numpy = numpy
+
+        if audioop is not None and not floating:
+            # The previous implementation, all the channels mixed together
+            run(
+                "audioop (mixed)",
+                lambda data: (audioop.max(data, 2), audioop.rms(data, 2)),
+                buffers,
+                args.seconds,
+            )
+
+
+if __name__ == "__main__":
+    main()
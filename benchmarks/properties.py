@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cost of the properties of a session of cues.
+
+Measure the cost of writing a plain attribute and a property of a cue, and
+of `properties()` (as when saving) and `update_properties()` (as when
+loading) over all the cues of a session.
+Each measure is the best of some runs.
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from lisp.core.util import filter_live_properties
+from lisp.cues.cue import Cue
+
+
+def best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = perf_counter()
+        function()
+        times.append(perf_counter() - started)
+
+    return min(times)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cues = [Cue(None) for _ in range(args.cues)]
+    cue = cues[0]
+
+    def write_attribute():
+        for n in range(args.writes):
+            cue._benchmark = n
+
+    def write_property():
+        for n in range(args.writes):
+            cue.pre_wait = n
+
+    saved = []
+
+    def save():
+        saved[:] = [
+            cue.properties(defaults=False, filter=filter_live_properties)
+            for cue in cues
+        ]
+
+    def load():
+        for cue, properties in zip(cues, saved):
+            cue.update_properties(properties)
+
+    for name, function, count in (
+        ("attribute write", write_attribute, args.writes),
+        ("property write", write_property, args.writes),
+    ):
+        elapsed = best(function, args.repeat)
+        print(f"{name:<20} {elapsed / count * 1e6:8.3f}µs")
+
+    for cue in cues:
+        cue.name = f"Cue {id(cue)}"
+        cue.description = "A description"
+
+    for name, function in (
+        ("properties()", save),
+        ("update_properties()", load),
+    ):
+        elapsed = best(function, args.repeat)
+        print(f"{name:<20} {elapsed * 1000:8.3f}ms ({args.cues} cues)")
+
+
+if __name__ == "__main__":
+    main()
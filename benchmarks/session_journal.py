@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Save and load time of a journaled session, against a full rewrite.
+
+"full" saves encode all the cues and rewrite the session file, as a not
+journaled session (without re-using the encoded cues).
+"journal" saves append the changes to the session journal (synced to disk).
+Loading reads the session file, and for the journaled session replays the
+journal records (as many as the compaction threshold).
+"""
+
+import json
+import os
+import tempfile
+from argparse import ArgumentParser
+from time import perf_counter
+
+from lisp.core.has_properties import HasProperties
+from lisp.core.session import Session
+from lisp.core.session_journal import SessionJournal
+from lisp.core.util import filter_live_properties
+from lisp.cues.cue import Cue
+from lisp.cues.cue_model import CueModel
+
+DUMP_OPTIONS = {"sort_keys": True, "indent": 4}
+
+
+class BenchmarkLayout(HasProperties):
+    """Only what a Session needs from its layout."""
+
+    def __init__(self, cue_model):
+        super().__init__()
+        self.cue_model = cue_model
+
+
+def new_session(cues_count):
+    cue_model = CueModel()
+    for n in range(cues_count):
+        cue = Cue(None)
+        cue.name = f"Cue {n}"
+        cue.description = f"The description of the cue number {n}"
+        cue.index = n
+        cue_model.add(cue)
+
+    return Session(BenchmarkLayout(cue_model))
+
+
+def session_dict(session, journal=None):
+    session_properties = session.properties()
+    session_properties.pop("session_file", None)
+    meta = {"journal": journal.meta(journal.seq)} if journal else {}
+
+    return {
+        "meta": meta,
+        "session": session_properties,
+        "cues": [
+            cue.properties(filter=filter_live_properties)
+            for cue in sorted(session.cue_model, key=lambda cue: cue.index)
+        ],
+    }
+
+
+def write_full(session, session_file, journal=None):
+    with open(session_file, mode="w", encoding="utf-8") as file:
+        file.write(json.dumps(session_dict(session, journal), **DUMP_OPTIONS))
+
+
+def edit(cues, step, changed):
+    for cue in cues[:changed]:
+        cue.name = f"Cue {cue.index} (edit {step})"
+
+
+def measure(cues_count, changed, saves, directory):
+    """Return the mean save times (full, journal), and the load times
+    (full, journal) in seconds."""
+    session = new_session(cues_count)
+    cues = sorted(session.cue_model, key=lambda cue: cue.index)
+
+    full_file = os.path.join(directory, "full.lsp")
+    started = perf_counter()
+    for step in range(saves):
+        edit(cues, step, changed)
+        write_full(session, full_file)
+    full_save = (perf_counter() - started) / saves
+
+    journal_file = os.path.join(directory, "journal.lsp")
+    journal = SessionJournal(journal_file)
+    journal.attach(session)
+    write_full(session, journal_file, journal)
+    journal.rebase(journal.seq)
+
+    started = perf_counter()
+    for step in range(saves):
+        edit(cues, step, changed)
+        journal.save()
+    journal_save = (perf_counter() - started) / saves
+    journal.detach()
+
+    started = perf_counter()
+    with open(full_file, mode="r", encoding="utf-8") as file:
+        json.load(file)
+    full_load = perf_counter() - started
+
+    started = perf_counter()
+    with open(journal_file, mode="r", encoding="utf-8") as file:
+        loaded = json.load(file)
+    SessionJournal.load(journal_file, loaded)
+    journal_load = perf_counter() - started
+
+    # The replayed session is the same as the saved one
+    expected = session_dict(session)["cues"]
+    assert loaded["cues"] == expected, "the replayed session is different"
+
+    return full_save, journal_save, full_load, journal_load
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--changed", type=int, nargs="+", default=[1, 10])
+    parser.add_argument(
+        "--saves", type=int, default=100, help="as the compaction threshold"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for cues_count in args.cues:
+            for changed in args.changed:
+                full_save, journal_save, full_load, journal_load = measure(
+                    cues_count, changed, args.saves, directory
+                )
+                print(
+                    f"{cues_count:5} cues, {changed:3} changed: "
+                    f"save full {full_save * 1000:8.2f}ms "
+                    f"journal {journal_save * 1000:6.2f}ms | "
+                    f"load full {full_load * 1000:7.2f}ms "
+                    f"journal {journal_load * 1000:7.2f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
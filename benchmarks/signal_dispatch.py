@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Signal dispatch cost, for Direct, QtQueued and Async connections.
+
+The `Signal`, whose emission iterates a slots snapshot without locking, is
+compared with a signal emitting under its lock (the previous
+implementation), and with the instrumentation enabled.
+
+For QtQueued and Async connections the emission cost is measured first,
+then the time until all the calls are delivered ("delivered"), the best
+of some runs is reported.
+Finally a thread emits to a slow slot, while another connects and
+disconnects a slot, the connect latency is measured.
+"""
+
+import sys
+import traceback
+from argparse import ArgumentParser
+from threading import Event, Thread
+from time import perf_counter, sleep
+
+from PyQt5.QtWidgets import QApplication
+
+from lisp.core.signal import Connection, Signal
+
+
+class LockedSignal(Signal):
+    """The previous Signal, emissions iterate the slots holding the lock."""
+
+    def emit(self, *args, **kwargs):
+        with self._Signal__lock:
+            for slot in self._Signal__slots.values():
+                try:
+                    slot.call(*args, **kwargs)
+                except Exception:
+                    traceback.print_exc()
+
+
+class Receiver:
+    def __init__(self):
+        # Slots can be called concurrently (Async), list.append is atomic
+        self.calls = []
+
+    def slot(self, *args):
+        self.calls.append(None)
+
+
+class SlowReceiver:
+    def slot(self, *args):
+        sleep(0.001)
+
+
+def wait_calls(app, receivers, expected):
+    while sum(len(receiver.calls) for receiver in receivers) < expected:
+        app.processEvents()
+
+
+def dispatch(app, signal_class, mode, slots, emissions, repeat):
+    """Return the best emission and delivery times (in µs/emission)."""
+    results = []
+    for _ in range(repeat):
+        signal = signal_class()
+        receivers = [Receiver() for _ in range(slots)]
+        for receiver in receivers:
+            signal.connect(receiver.slot, mode)
+
+        started = perf_counter()
+        for n in range(emissions):
+            signal.emit(n)
+        emitted = perf_counter() - started
+
+        wait_calls(app, receivers, slots * emissions)
+        delivered = perf_counter() - started
+
+        results.append((emitted, delivered))
+
+    emitted, delivered = min(results)
+    return emitted / emissions * 1e6, delivered / emissions * 1e6
+
+
+def emit_until(signal, stop):
+    while not stop.is_set():
+        signal.emit()
+
+
+def connect_latency(signal_class, connections):
+    """Return the mean and max time (in ms) to connect a slot, while a
+    thread is emitting to a slow slot."""
+    signal = signal_class()
+    slow = SlowReceiver()
+    signal.connect(slow.slot)
+
+    stop = Event()
+    emitter = Thread(target=emit_until, args=(signal, stop))
+    emitter.start()
+
+    times = []
+    receiver = Receiver()
+    for _ in range(connections):
+        started = perf_counter()
+        signal.connect(receiver.slot)
+        times.append(perf_counter() - started)
+        signal.disconnect(receiver.slot)
+        sleep(0.0005)
+
+    stop.set()
+    emitter.join()
+
+    return sum(times) / len(times) * 1000, max(times) * 1000
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--emissions", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    variants = (
+        ("locked", LockedSignal, False),
+        ("snapshot", Signal, False),
+        ("instrumented", Signal, True),
+    )
+
+    print(f"{args.emissions} emissions, {args.slots} slots (µs/emission)")
+    for mode in (Connection.Direct, Connection.QtQueued, Connection.Async):
+        for name, signal_class, instrumented in variants:
+            Signal.set_instrumented(instrumented)
+            try:
+                emitted, delivered = dispatch(
+                    app,
+                    signal_class,
+                    mode,
+                    args.slots,
+                    args.emissions,
+                    args.repeat,
+                )
+            finally:
+                Signal.set_instrumented(False)
+
+            print(
+                f"  {mode.name:<9} {name:<13} emit {emitted:8.2f}"
+                f"  delivered {delivered:8.2f}"
+            )
+
+    print("connect while emitting to a slow (1ms) slot (ms)")
+    for name, signal_class, _ in variants[:2]:
+        mean, max_ = connect_latency(signal_class, args.connections)
+        print(f"  {name:<13} mean {mean:7.3f}  max {max_:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+"""GO to `started` latency of N simultaneous cues.
+
+A single GO executes N cues, as a collection cue does with its targets,
+the time from the GO until each cue emits `started` is measured.
+Meanwhile some other cues are pre-waiting, blocking their workers.
+The cues `__start__` blocks for a while, as a media cue starting its
+pipeline.
+
+The `SharedWorkerPool` is compared with a new thread for each call (the
+previous implementation). Each measure runs in a new process.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from statistics import mean, median
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+
+
+class ThreadPerCall:
+    """The previous implementation, a new thread for each call."""
+
+    def submit(self, fn, *args, priority=None, key=None, **kwargs):
+        Thread(target=fn, args=args, kwargs=kwargs, daemon=True).start()
+
+    def release_key(self):
+        pass
+
+
+def measure(mode, cues_count, waiting, start_ms, repeat):
+    """Return the latencies (ms) of all the cues, of all the runs."""
+    from lisp.core import decorators
+    from lisp.cues import cue as cue_module
+    from lisp.cues.cue import Cue, CueState
+
+    if mode == "thread":
+        decorators.SharedWorkerPool = ThreadPerCall()
+        cue_module.SharedWorkerPool = decorators.SharedWorkerPool
+
+    class StartingCue(Cue):
+        def __start__(self, fade=False):
+            sleep(start_ms / 1000)
+            return True
+
+        def __stop__(self, fade=False):
+            return True
+
+    latencies = []
+    lock = Lock()
+    done = Event()
+
+    class Receiver:
+        def __init__(self):
+            self.go = 0
+
+        def started(self, cue):
+            with lock:
+                latencies.append((perf_counter() - self.go) * 1000)
+                if len(latencies) % cues_count == 0:
+                    done.set()
+
+    # Keep a reference, signals only hold weak-references to the slots
+    receiver = Receiver()
+
+    waiting_cues = [Cue(None) for _ in range(waiting)]
+    for cue in waiting_cues:
+        cue.pre_wait = 3600
+        cue.start()
+
+    cues = [StartingCue(None) for _ in range(cues_count)]
+    for cue in cues:
+        cue.started.connect(receiver.started)
+
+    sleep(0.2)
+    for _ in range(repeat):
+        done.clear()
+        receiver.go = perf_counter()
+        for cue in cues:
+            cue.execute()
+
+        done.wait()
+        for cue in cues:
+            cue.stop()
+        while any(cue.state & CueState.IsRunning for cue in cues):
+            sleep(0.005)
+
+    for cue in waiting_cues:
+        cue.stop()
+
+    return latencies
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--waiting", type=int, default=20)
+    parser.add_argument(
+        "--start-ms", type=float, default=2, help="the cues start time"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{args.waiting} cues pre-waiting, {args.start_ms}ms to start a cue,"
+        f" {args.repeat} GO (ms)"
+    )
+    for cues_count in args.cues:
+        for mode in ("pool", "thread"):
+            with ProcessPoolExecutor(1, get_context("spawn")) as executor:
+                latencies = executor.submit(
+                    measure,
+                    mode,
+                    cues_count,
+                    args.waiting,
+                    args.start_ms,
+                    args.repeat,
+                ).result()
+
+            print(
+                f"  {cues_count:3} cues, {mode:<6}: "
+                f"mean {mean(latencies):7.2f}  "
+                f"median {median(latencies):7.2f}  "
+                f"max {max(latencies):7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
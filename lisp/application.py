@@ -19,15 +19,16 @@ import json
 import logging
 from os.path import exists, dirname, abspath
 
-from PyQt5.QtWidgets import QDialog, qApp
+from PyQt5.QtWidgets import QDialog, QMessageBox, qApp
 
 from lisp import layout, __version__ as lisp_version
 from lisp.command.stack import CommandsStack
 from lisp.core.configuration import Configuration, DummyConfiguration
 from lisp.core.session import Session
-from lisp.core.signal import Signal
+from lisp.core.session_journal import SessionJournal
+from lisp.core.session_writer import SessionWriter
+from lisp.core.signal import Signal, Connection
 from lisp.core.singleton import Singleton
-from lisp.core.util import filter_live_properties
 from lisp.cues.cue import Cue
 from lisp.cues.cue_factory import CueFactory
 from lisp.cues.cue_model import CueModel
@@ -60,9 +61,29 @@ class Application(metaclass=Singleton):
         self.__cue_factory = CueFactory(self)
         self.__cue_model = CueModel()
         self.__session = None
-        self.__commands_stack = CommandsStack()
+        self.__commands_stack = CommandsStack(
+            stack_size=self.__conf.get("actions.maxStackSize", 0) or None,
+            memory_budget=self.__commands_memory_budget(),
+        )
         self.__main_window = MainWindow(self)
 
+        self.__session_writer = SessionWriter()
+        self.__session_writer.written.connect(
+            self.__session_written, Connection.QtQueued
+        )
+        self.__session_writer.failed.connect(
+            self.__session_write_failed, Connection.QtQueued
+        )
+        self.__save_points = {}
+        self.__journal = None
+
+        # Journal the changes made by each command
+        self.__commands_stack.done.connect(self.__journal_commit)
+        self.__commands_stack.undone.connect(self.__journal_commit)
+        self.__commands_stack.redone.connect(self.__journal_commit)
+        self.__conf.changed.connect(self.__update_commands_budget)
+        self.__conf.updated.connect(self.__update_commands_budget)
+
         # Register general settings widget
         AppConfigurationDialog.registerSettingsPage(
             "general", AppGeneral, self.__conf
@@ -131,6 +152,7 @@ class Application(metaclass=Singleton):
 
     def finalize(self):
         self.__delete_session()
+        self.__session_writer.wait()
 
         self.__cue_model = None
         self.__main_window = None
@@ -167,56 +189,114 @@ class Application(metaclass=Singleton):
         if self.__session is not None:
             self.session_before_finalize.emit(self.session)
 
+            if self.__journal is not None:
+                self.__journal.detach()
+                self.__journal = None
+
             self.__session.finalize()
             self.__commands_stack.clear()
+            self.__session_writer.invalidate()
 
     def __save_to_file(self, session_file):
         """Save the current session into a file."""
         self.session.session_file = session_file
 
+        journaled = self.conf.get("session.journal", False)
+        journal = self.__journal
+
+        if (
+            journaled
+            and journal is not None
+            and journal.session_file == session_file
+        ):
+            # Only append the changes to the journal
+            journal.save()
+            self.__session_saved(session_file, self.commands_stack.top())
+
+            # Fold the journal in the session file, in background
+            if journal.records_count() >= self.conf.get(
+                "session.journalCompaction", 200
+            ):
+                self.__write_session(session_file, journal)
+        else:
+            if journal is not None:
+                journal.detach()
+                self.__journal = None
+
+            if journaled:
+                self.__journal = SessionJournal(session_file)
+                self.__journal.attach(self.session)
+
+            self.__write_session(session_file, self.__journal)
+
+    def __write_session(self, session_file, journal=None):
         # Get session settings
         session_props = self.session.properties()
         session_props.pop("session_file", None)
 
-        # Get session cues
-        session_cues = []
-        for cue in self.layout.cues():
-            session_cues.append(cue.properties(filter=filter_live_properties))
-
-        session_dict = {
-            "meta": {
-                "version": lisp_version,
-                "plugins": {
-                    name: plugin.Version for name, plugin in get_plugins()
-                },
-            },
-            "session": session_props,
-            "cues": session_cues,
+        meta = {
+            "version": lisp_version,
+            "plugins": {name: plugin.Version for name, plugin in get_plugins()},
         }
+        if journal is not None:
+            meta["journal"] = journal.meta()
+
+        # Encode the session, only modified cues are re-encoded
+        snapshot = self.__session_writer.snapshot(
+            meta=meta,
+            session=session_props,
+            cues=self.layout.cues(),
+            minimal=self.conf.get("session.minSave", False),
+        )
 
-        # Write to a file the json-encoded session
-        with open(session_file, mode="w", encoding="utf-8") as file:
-            if self.conf.get("session.minSave", False):
-                dump_options = {"separators": (",", ":")}
-            else:
-                dump_options = {"sort_keys": True, "indent": 4}
+        # The session is saved as it is now, even if changed while writing
+        self.__save_points[snapshot] = (self.commands_stack.top(), journal)
+
+        # Write the file in background
+        self.__session_writer.write(session_file, snapshot)
 
-            file.write(json.dumps(session_dict, **dump_options))
+    def __session_written(self, session_file, snapshot):
+        save_point, journal = self.__save_points.pop(snapshot, (None, None))
 
+        if journal is not None:
+            # Drop the records now included in the session file
+            journal.rebase(snapshot.meta["journal"]["seq"])
+        else:
+            SessionJournal.delete(session_file)
+
+        self.__session_saved(session_file, save_point)
+
+    def __session_saved(self, session_file, save_point):
         # Save last session path
         self.conf.set("session.lastPath", dirname(session_file))
         self.conf.write()
 
         # Set the session as saved
-        self.commands_stack.set_saved()
-        self.window.updateWindowTitle()
+        if save_point is not None:
+            self.commands_stack.set_saved(save_point)
+        if self.__main_window is not None:
+            self.__main_window.updateWindowTitle()
+
+    def __session_write_failed(self, session_file, snapshot):
+        self.__save_points.pop(snapshot, None)
 
     def __load_from_file(self, session_file):
         """Load a saved session from file"""
+        # The file might be still being written
+        self.__session_writer.wait()
+
         try:
             with open(session_file, mode="r", encoding="utf-8") as file:
                 session_dict = json.load(file)
 
+            # Apply the changes saved in the journal, if any
+            journal = SessionJournal.load(abspath(session_file), session_dict)
+            if journal is not None and journal.unsaved:
+                if self.__ask_recovery():
+                    journal.recover(session_dict)
+                else:
+                    journal.discard()
+
             # New session
             self.__new_session(
                 layout.get_layout(session_dict["session"]["layout_type"])
@@ -243,6 +323,10 @@ class Application(metaclass=Singleton):
 
             self.commands_stack.set_saved()
 
+            if journal is not None:
+                self.__journal = journal
+                self.__journal.attach(self.session)
+
             self.session_loaded.emit(self.session)
         except Exception:
             logger.exception(
@@ -252,3 +336,30 @@ class Application(metaclass=Singleton):
                 ).format(session_file)
             )
             self.__new_session_dialog()
+
+    def __ask_recovery(self):
+        answer = QMessageBox.question(
+            self.window,
+            translate("Application", "Session recovery"),
+            translate(
+                "Application",
+                "The session has changes that were not saved, probably "
+                "because of an unexpected shutdown.\n"
+                "Do you want to recover them?",
+            ),
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+
+        return answer == QMessageBox.Yes
+
+    def __journal_commit(self, *_):
+        if self.__journal is not None:
+            self.__journal.commit()
+
+    def __commands_memory_budget(self):
+        # The budget is configured in MiB, 0 means no limit
+        return self.__conf.get("actions.maxStackMemory", 64) * 1024 * 1024
+
+    def __update_commands_budget(self, *_):
+        self.__commands_stack.memory_budget = self.__commands_memory_budget()
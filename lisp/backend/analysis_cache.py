@@ -0,0 +1,105 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+from os import path, makedirs, replace
+from threading import Lock
+
+from lisp import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Persistent results of the audio analysis of media files.
+
+    Results are stored as a JSON dictionary for each file, keyed by the
+    file fingerprint (see `Waveform.fingerprint`), so they are shared by
+    all the users of the same content.
+
+    Known keys:
+
+    * "track_gain": ReplayGain track gain (dB), at `reference_level`
+    * "reference_level": ReplayGain reference level (dB)
+    * "peak": sample peak, as linear amplitude
+    * "channels_peak": sample peak of each channel, as linear amplitude
+    * "head_silence", "tail_silence": silence at the file head/tail (ms)
+    * "probe": media information, see `GstMediaProbe`
+    """
+
+    CACHE_VERSION = 1
+    CACHE_DIR_NAME = "analysis"
+
+    # Results are merged (read, update, write), serialize the stores
+    __StoreLock = Lock()
+
+    def __init__(self, cache_dir=None):
+        if not cache_dir:
+            cache_dir = DEFAULT_CACHE_DIR
+
+        self.directory = path.join(cache_dir, self.CACHE_DIR_NAME)
+
+    def cache_path(self, fingerprint):
+        return path.join(self.directory, fingerprint + ".json")
+
+    def load(self, fingerprint):
+        """Return the stored results for the given fingerprint.
+
+        :rtype: dict
+        """
+        if fingerprint:
+            try:
+                with open(self.cache_path(fingerprint), "r") as file:
+                    results = json.load(file)
+
+                if results.pop("_version_", None) == self.CACHE_VERSION:
+                    return results
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logger.warning(
+                    f"Cannot read analysis results: {fingerprint}",
+                    exc_info=True,
+                )
+
+        return {}
+
+    def store(self, fingerprint, results):
+        """Merge the given results with the stored ones."""
+        if not fingerprint:
+            return
+
+        with AnalysisCache.__StoreLock:
+            stored = self.load(fingerprint)
+            stored.update(results)
+            stored["_version_"] = self.CACHE_VERSION
+
+            try:
+                makedirs(self.directory, exist_ok=True)
+
+                cache_path = self.cache_path(fingerprint)
+                temp_path = cache_path + ".tmp"
+                with open(temp_path, "w") as file:
+                    json.dump(stored, file)
+
+                replace(temp_path, cache_path)
+            except OSError:
+                logger.warning(
+                    f"Cannot save analysis results: {fingerprint}",
+                    exc_info=True,
+                )
@@ -15,10 +15,28 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-import aifc
 import math
+import warnings
 import wave
 
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    # Removed in python 3.13
+    try:
+        import aifc
+    except ImportError:
+        aifc = None
+
+    try:
+        import audioop
+    except ImportError:
+        audioop = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # Decibel value to be considered -inf
 
 MIN_VOLUME_DB = -144
@@ -72,6 +90,94 @@ def slider_to_fader(value):
     return 3.162_277_66 * (value**3.7)
 
 
+def peak_rms(data, channels=1, floating=False):
+    """Compute the peak and rms values, for each channel, of the given samples.
+
+    `data` can be any object supporting the buffer protocol (bytes,
+    memoryview, mapped buffers, ...), containing interleaved native-endian
+    samples, 16bit integers or 32bit floats (if `floating` is True).
+    Integer samples of one or two channels are reduced with audioop, while
+    available (removed in python 3.13), other samples with NumPy, if
+    installed, or in pure python (much slower).
+
+    Values are normalized, 1.0 is the maximum value for integer samples,
+    floating samples can exceed it.
+
+    :return: two lists, with the peak and rms value of each channel
+    :rtype: (list[float], list[float])
+    """
+    if floating:
+        scale = 1
+        size = 4
+    else:
+        scale = 32768
+        size = 2
+
+    # Ignore a trailing incomplete sample
+    data = memoryview(data).cast("B")
+    data = data[: len(data) - len(data) % size]
+
+    if audioop is not None and not floating and channels <= 2:
+        frames = len(data) // (size * channels)
+        if not frames:
+            return [0.0] * channels, [0.0] * channels
+
+        data = data[: frames * size * channels]
+        if channels == 1:
+            channels_data = (data,)
+        else:
+            channels_data = (
+                audioop.tomono(data, size, 1, 0),
+                audioop.tomono(data, size, 0, 1),
+            )
+
+        peaks = [audioop.max(d, size) / scale for d in channels_data]
+        rms = [audioop.rms(d, size) / scale for d in channels_data]
+        return peaks, rms
+
+    if numpy is not None:
+        samples = numpy.frombuffer(
+            data, dtype=numpy.float32 if floating else numpy.int16
+        )
+        frames = len(samples) // channels
+        if not frames:
+            return [0.0] * channels, [0.0] * channels
+
+        samples = samples[: frames * channels].reshape(frames, channels)
+
+        peaks = []
+        rms = []
+        for channel in range(channels):
+            # Reducing a single (1-D) channel is faster than reducing along
+            # the axis, in float64 (int16 abs() would overflow with -32768)
+            channel_samples = samples[:, channel].astype(numpy.float64)
+            peaks.append(float(numpy.abs(channel_samples).max()) / scale)
+            rms.append(
+                math.sqrt(channel_samples.dot(channel_samples) / frames) / scale
+            )
+
+        return peaks, rms
+
+    samples = data.cast("f" if floating else "h")
+    frames = len(samples) // channels
+    samples = samples[: frames * channels]
+
+    peaks = []
+    rms = []
+    for channel in range(channels):
+        channel_samples = samples[channel::channels]
+        if frames:
+            peak = max(max(channel_samples), -min(channel_samples))
+            # hypot() gives the square root of the sum of squares
+            peaks.append(peak / scale)
+            rms.append(math.hypot(*channel_samples) / math.sqrt(frames) / scale)
+        else:
+            peaks.append(0.0)
+            rms.append(0.0)
+
+    return peaks, rms
+
+
 def python_duration(path, sound_module):
     """Returns audio-file duration using the given standard library module."""
     duration = 0
@@ -86,7 +192,10 @@ def python_duration(path, sound_module):
 
 def audio_file_duration(path: str):
     """Return the audio-file duration, using the given file path"""
-    for mod in [wave, aifc]:
+    for mod in (wave, aifc):
+        if mod is None:
+            continue
+
         duration = python_duration(path, mod)
         if duration > 0:
             return duration
@@ -98,6 +98,12 @@ class Media(HasProperties):
     def input_uri(self) -> Union[SessionURI, type(None)]:
         """Return the media SessionURI, or None."""
 
+    def arm(self):
+        """Prepare the media for the playback, so that it starts faster.
+
+        By default does nothing.
+        """
+
     @abstractmethod
     def pause(self):
         """The media go in PAUSED state (pause the playback)."""
@@ -16,28 +16,79 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import mmap
 import pickle
+import struct
 from abc import ABCMeta, abstractmethod
-from os import path, makedirs
+from array import array
+from math import ceil, floor, sqrt
+from os import path, makedirs, replace
 
 from lisp import DEFAULT_CACHE_DIR
+from lisp.backend.waveform_service import WaveformService, WaveformPriority
+from lisp.core.fingerprint import FingerprintIndex
 from lisp.core.session_uri import SessionURI
 from lisp.core.signal import Signal
-from lisp.core.util import file_hash
 
 logger = logging.getLogger(__name__)
 
 
+def reduce_peaks(peaks):
+    """Halve the resolution of the given peak samples (max of pairs)."""
+    if len(peaks) % 2:
+        peaks = peaks + peaks[-1:]
+
+    return array("h", map(max, peaks[0::2], peaks[1::2]))
+
+
+def reduce_rms(rms):
+    """Halve the resolution of the given rms samples (rms of pairs)."""
+    if len(rms) % 2:
+        rms = rms + rms[-1:]
+
+    return array(
+        "h",
+        map(
+            lambda a, b: round(sqrt((a * a + b * b) / 2)), rms[0::2], rms[1::2]
+        ),
+    )
+
+
 class Waveform(metaclass=ABCMeta):
+    """Peak/RMS envelope of a media file.
+
+    The samples are stored as 16bit integers, at multiple resolutions:
+    the first "level" contains the samples at full resolution, every
+    following level halves the resolution of the previous one.
+
+    The cache files have the following (native byte-order) binary format:
+
+    * Header: magic (8 bytes), format version (uint16), levels (uint16)
+    * Levels table: samples count for each level (uint32)
+    * Data: for each level, peak samples followed by rms samples (int16)
+
+    Cache files are memory-mapped when loaded, so only the accessed levels
+    are actually read from disk.
+    """
+
     CACHE_VERSION = "1"
     CACHE_DIR_NAME = "waveforms"
-    MAX_DECIMALS = 5
+    CACHE_MAGIC = b"LiSPWAVE"
+    CACHE_FORMAT = 2
+    CACHE_HEADER = struct.Struct("=8sHH")
+    CACHE_LEVEL = struct.Struct("=I")
+
+    # Duration of each sample, in milliseconds, at full resolution
+    SAMPLE_DURATION = 10
+    # The smallest level, in samples, to generate
+    MIN_LEVEL_SAMPLES = 128
+    MAX_SAMPLE_VALUE = 32767
 
     def __init__(
         self,
         uri: SessionURI,
         duration,
-        max_samples=2560,
+        max_samples=65536,
         enable_cache=True,
         cache_dir=None,
     ):
@@ -49,57 +100,160 @@ class Waveform(metaclass=ABCMeta):
 
         self._uri = uri
         self._hash = None
+        self._cache_root = cache_dir
         self._cache_dir = path.join(cache_dir, self.CACHE_DIR_NAME)
         self._enable_cache = enable_cache
 
-        self.rms_samples = []
-        self.peak_samples = []
+        # [(peak_samples, rms_samples), ...], from the highest resolution
+        self._levels = []
+        self._mmap = None
+        self._resampled = {}
 
         self.ready = Signal()
         self.failed = Signal()
 
-    def cache_path(self, refresh=True):
-        """Return the path of the file used to cache the waveform.
+    @property
+    def uri(self):
+        return self._uri
+
+    @property
+    def samples(self):
+        """The number of samples (at full resolution) to generate."""
+        return max(
+            1, min(int(self.duration) // self.SAMPLE_DURATION, self.max_samples)
+        )
+
+    @property
+    def cache_root(self):
+        return self._cache_root
 
-        The path name is based on the hash of the source file, which will be
-        calculated and saved the first time.
+    def fingerprint(self, refresh=True):
+        """Return the content-hash of the source file.
+
+        Hashes are retrieved from the cache `FingerprintIndex`, so the file
+        content is read only if it has changed since the last time.
+        For non-local files an empty string is returned.
         """
         if not self._uri.is_local:
             return ""
 
-        file_path = self._uri.absolute_path
         if not self._hash or refresh:
-            self._hash = file_hash(
-                file_path,
-                digest_size=16,
-                person=self.CACHE_VERSION.encode(),
+            self._hash = self.file_fingerprint(
+                self._cache_root, self._uri.absolute_path
             )
 
+        return self._hash
+
+    @classmethod
+    def file_fingerprint(cls, cache_root, file_path):
+        """Return the content-hash of the given (local) file.
+
+        The same hash is used to key all the cached data of a file
+        (e.g. waveforms and `AnalysisCache` results).
+        """
+        return FingerprintIndex.get(cache_root).fingerprint(
+            file_path, digest_size=16, person=cls.CACHE_VERSION.encode()
+        )
+
+    def cache_path(self, refresh=True):
+        """Return the path of the file used to cache the waveform.
+
+        The path name is based on the hash of the source file,
+        see `fingerprint`.
+        """
+        fingerprint = self.fingerprint(refresh)
+        if not fingerprint:
+            return ""
+
         return path.join(
-            path.dirname(file_path),
+            path.dirname(self._uri.absolute_path),
             self._cache_dir,
-            self._hash + ".waveform",
+            fingerprint + ".waveform",
         )
 
-    def load_waveform(self):
+    def load_waveform(self, priority=WaveformPriority.Normal):
         """Load the waveform.
 
         If the waveform is ready returns True, False otherwise, in that case
         the "ready" signal will be emitted when the processing is complete.
+
+        The processing is scheduled by the `WaveformService`, with the given
+        priority, see `WaveformPriority`.
         """
         if self.is_ready() or self._from_cache():
             # The waveform has already been loaded, or is in cache
             return True
         else:
-            # Delegate the actual work to concrete subclasses
-            return self._load_waveform()
+            # Let the service schedule the actual work
+            WaveformService().request(self, priority)
+            return False
 
     def is_ready(self):
-        return bool(self.peak_samples and self.rms_samples)
+        return bool(self._levels)
 
     def clear(self):
-        self.rms_samples = []
-        self.peak_samples = []
+        self._levels = []
+        self._resampled.clear()
+
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Some view is still around, will be closed when collected
+                pass
+
+            self._mmap = None
+
+    def levels(self):
+        """Return the available levels as [(peak_samples, rms_samples), ...]
+
+        The levels are sorted from the highest to the lowest resolution,
+        samples are 16bit integers (see MAX_SAMPLE_VALUE).
+        """
+        return self._levels
+
+    def level(self, size):
+        """Return the lowest resolution level with at least `size` samples.
+
+        If no level is big enough, the one with the highest resolution
+        is returned.
+
+        :rtype: (Sequence[int], Sequence[int])
+        """
+        for level in reversed(self._levels):
+            if len(level[0]) >= size:
+                return level
+
+        return self._levels[0]
+
+    def resample(self, size):
+        """Re-bin the waveform data to the given number of samples.
+
+        Each value is the max of the peaks and the mean of the rms of the
+        samples falling in the bin, normalized in the [0, 1] range.
+        The results are cached by size. A waveform without samples (e.g.
+        of an empty file) is resampled to zeros.
+
+        :rtype: (array, array)
+        """
+        resampled = self._resampled.get(size)
+        if resampled is None and size > 0 and self.is_ready():
+            peak_samples, rms_samples = self.level(size)
+            samples_per_bin = len(peak_samples) / size
+            max_value = self.MAX_SAMPLE_VALUE
+
+            peaks = array("f", bytes(4 * size))
+            rms = array("f", bytes(4 * size))
+            for i in range(size if len(peak_samples) else 0):
+                s0 = floor(i * samples_per_bin)
+                s1 = ceil(i * samples_per_bin + samples_per_bin)
+
+                peaks[i] = max(peak_samples[s0:s1]) / max_value
+                rms[i] = sum(rms_samples[s0:s1]) / (s1 - s0) / max_value
+
+            resampled = self._resampled[size] = (peaks, rms)
+
+        return resampled
 
     @abstractmethod
     def _load_waveform(self):
@@ -110,26 +264,88 @@ class Waveform(metaclass=ABCMeta):
         Once available the "ready" signal should be emitted.
         """
 
+    def _share(self, other):
+        """Use the data of another (ready) waveform of the same file."""
+        self.clear()
+        self._levels = list(other.levels())
+
+    def _set_samples(self, peak_samples, rms_samples):
+        """Set the waveform data, at full resolution, and build the levels.
+
+        :param peak_samples: peak values as 16bit integers
+        :param rms_samples: rms values as 16bit integers
+        """
+        # Only drop the data, not the (subclasses) processing state
+        Waveform.clear(self)
+
+        peaks = array("h", peak_samples)
+        rms = array("h", rms_samples)
+        self._levels.append((peaks, rms))
+
+        while len(peaks) > self.MIN_LEVEL_SAMPLES:
+            peaks = reduce_peaks(peaks)
+            rms = reduce_rms(rms)
+            self._levels.append((peaks, rms))
+
     def _from_cache(self):
         """Retrieve data from a cache file, if caching is enabled."""
         try:
             cache_path = self.cache_path()
             if self._enable_cache and path.exists(cache_path):
                 with open(cache_path, "rb") as cache_file:
-                    cache_data = pickle.load(cache_file)
-                    if len(cache_data) >= 2:
-                        self.peak_samples = cache_data[0]
-                        self.rms_samples = cache_data[1]
+                    magic = cache_file.read(len(self.CACHE_MAGIC))
+                    cache_file.seek(0)
 
-                        logger.debug(
-                            f"Loaded waveform from the cache: {cache_path}"
-                        )
-                        return True
+                    if magic == self.CACHE_MAGIC:
+                        self._load_cache(cache_file)
+                    else:
+                        self._migrate_cache(cache_file)
+
+                logger.debug(f"Loaded waveform from the cache: {cache_path}")
+                return True
         except Exception:
-            pass
+            self.clear()
 
         return False
 
+    def _load_cache(self, cache_file):
+        data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, levels = self.CACHE_HEADER.unpack_from(data)
+        if version != self.CACHE_FORMAT:
+            data.close()
+            raise ValueError(f"unsupported waveform cache format: {version}")
+
+        self.clear()
+        self._mmap = data
+
+        view = memoryview(data)
+        offset = self.CACHE_HEADER.size + self.CACHE_LEVEL.size * levels
+        for level in range(levels):
+            (count,) = self.CACHE_LEVEL.unpack_from(
+                data, self.CACHE_HEADER.size + self.CACHE_LEVEL.size * level
+            )
+
+            size = count * 2
+            peaks = view[offset : offset + size].cast("h")
+            rms = view[offset + size : offset + size * 2].cast("h")
+            offset += size * 2
+
+            self._levels.append((peaks, rms))
+
+    def _migrate_cache(self, cache_file):
+        """Load an old (pickle) cache file, and replace it."""
+        cache_data = pickle.load(cache_file)
+        if len(cache_data) < 2:
+            raise ValueError("invalid waveform cache file")
+
+        self._set_samples(
+            (round(v * self.MAX_SAMPLE_VALUE) for v in cache_data[0]),
+            (round(v * self.MAX_SAMPLE_VALUE) for v in cache_data[1]),
+        )
+        self._to_cache()
+
+        logger.debug(f"Migrated waveform cache: {cache_file.name}")
+
     def _to_cache(self):
         """Dump the waveform data to a file, if caching is enabled."""
         if self._enable_cache:
@@ -139,13 +355,23 @@ class Waveform(metaclass=ABCMeta):
                 if not path.exists(cache_dir):
                     makedirs(cache_dir, exist_ok=True)
 
-                with open(cache_path, "wb") as cache_file:
-                    pickle.dump(
-                        (
-                            self.peak_samples,
-                            self.rms_samples,
-                        ),
-                        cache_file,
+                # Write to a temporary file and then replace, the old file
+                # might be memory-mapped
+                temp_path = cache_path + ".tmp"
+                with open(temp_path, "wb") as cache_file:
+                    cache_file.write(
+                        self.CACHE_HEADER.pack(
+                            self.CACHE_MAGIC,
+                            self.CACHE_FORMAT,
+                            len(self._levels),
+                        )
                     )
+                    for peaks, _ in self._levels:
+                        cache_file.write(self.CACHE_LEVEL.pack(len(peaks)))
+                    for peaks, rms in self._levels:
+                        cache_file.write(peaks)
+                        cache_file.write(rms)
+
+                replace(temp_path, cache_path)
 
                 logger.debug(f"Dumped waveform to the cache: {cache_path}")
@@ -0,0 +1,341 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from heapq import heappush, heappop
+from itertools import count
+from threading import Lock, RLock
+
+from lisp.core.signal import Signal
+from lisp.core.singleton import Singleton
+from lisp.core.worker_pool import SharedWorkerPool, TaskPriority
+
+logger = logging.getLogger(__name__)
+
+
+class WaveformPriority:
+    Visible = 0
+    Standby = 1
+    Normal = 2
+    Background = 3
+
+
+class WaveformBatch:
+    """Track the progress of a group of waveform requests.
+
+    `progress` is emitted with (completed, total) every time a request is
+    completed (or failed), `finished` once all of them are.
+
+    The waveforms of a batch are only generated (and cached), their data is
+    released once completed.
+    """
+
+    def __init__(self, waveforms):
+        self.total = len(waveforms)
+        self.completed = 0
+        self.cancelled = False
+
+        self.progress = Signal()
+        self.finished = Signal()
+
+        self._waveforms = {id(waveform): waveform for waveform in waveforms}
+        self.__lock = Lock()
+
+    def is_finished(self):
+        return self.completed >= self.total
+
+    def cancel(self):
+        """Cancel all the (not yet completed) requests of the batch."""
+        WaveformService().cancel_batch(self)
+
+    def _advance(self, waveforms, release=True):
+        with self.__lock:
+            for waveform in waveforms:
+                if self._waveforms.pop(id(waveform), None) is not None:
+                    if release:
+                        waveform.clear()
+
+                    self.completed += 1
+
+            completed = self.completed
+
+        self.progress.emit(completed, self.total)
+        if completed >= self.total:
+            self.finished.emit()
+
+
+class _Job:
+    """All the requests for the same file.
+
+    Only the first waveform (the "leader") is actually processed, the other
+    ones receive its data when ready.
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "key",
+        "priority",
+        "waveforms",
+        "batches",
+        "started",
+        "done",
+    )
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.waveforms = []
+        self.batches = []
+        self.started = False
+        self.done = False
+
+    @property
+    def leader(self):
+        return self.waveforms[0]
+
+    def _ready(self):
+        WaveformService()._complete(self, True)
+
+    def _failed(self):
+        WaveformService()._complete(self, False)
+
+
+class WaveformService(metaclass=Singleton):
+    """Schedule the generation of waveforms.
+
+    Requests are processed by priority (see :class:`WaveformPriority`), and
+    at most `workers` waveforms are generated at the same time, so that
+    decoding many files doesn't starve the playback.
+
+    Requests for the same file (by URI) are merged, the file is decoded only
+    once, and all the requesting waveforms are notified when done.
+    """
+
+    def __init__(self, workers=2):
+        self.__workers = max(1, workers)
+        self.__lock = RLock()
+        self.__counter = count()
+
+        self.__queue = []
+        self.__jobs = {}
+        self.__running = 0
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @workers.setter
+    def workers(self, workers):
+        with self.__lock:
+            self.__workers = max(1, workers)
+
+        self.__schedule()
+
+    def pending(self):
+        """Number of files waiting to be processed."""
+        with self.__lock:
+            return len(self.__jobs) - self.__running
+
+    def running(self):
+        """Number of files currently being processed."""
+        return self.__running
+
+    def request(self, waveform, priority=WaveformPriority.Normal, batch=None):
+        """Schedule the generation of the given waveform.
+
+        When the waveform is ready its "ready" signal is emitted, if the
+        generation fails the "failed" signal is emitted instead.
+        Requesting again an already scheduled waveform only raises its
+        priority, when higher.
+
+        :param waveform: the waveform to generate
+        :type waveform: lisp.backend.waveform.Waveform
+        :param priority: the request priority, see WaveformPriority
+        :param batch: the batch tracking the request, if any
+        :type batch: WaveformBatch
+        """
+        key = waveform.uri.uri
+
+        with self.__lock:
+            job = self.__jobs.get(key)
+            if job is None:
+                job = self.__jobs[key] = _Job(key, priority)
+                self.__push(job)
+            elif priority < job.priority and not job.started:
+                job.priority = priority
+                # The old queue entry will be discarded
+                self.__push(job)
+
+            if waveform not in job.waveforms:
+                job.waveforms.append(waveform)
+            if batch is not None and batch not in job.batches:
+                job.batches.append(batch)
+
+        self.__schedule()
+
+    def prerender(self, waveforms, priority=WaveformPriority.Background):
+        """Request the generation of many waveforms.
+
+        :rtype: WaveformBatch
+        """
+        batch = WaveformBatch(list(waveforms))
+
+        for waveform in batch._waveforms.values():
+            self.request(waveform, priority, batch=batch)
+
+        if not batch.total:
+            batch.finished.emit()
+
+        return batch
+
+    def cancel(self, waveform):
+        """Cancel the request for the given waveform, if any.
+
+        The file processing is stopped only if no other waveform is waiting
+        for it.
+        """
+        self.__abort(self.__cancel(waveform))
+
+    def cancel_batch(self, batch):
+        """Cancel all the (not yet completed) requests of the given batch."""
+        with self.__lock:
+            batch.cancelled = True
+            for job in self.__jobs.values():
+                if batch in job.batches:
+                    job.batches.remove(batch)
+
+            waveforms = list(batch._waveforms.values())
+            jobs = [self.__cancel(waveform) for waveform in waveforms]
+
+        self.__abort(*jobs)
+        # Some waveform might still be needed by other requests
+        batch._advance(waveforms, release=False)
+
+    def cancel_all(self):
+        """Cancel all the requests, stopping the processing of all files."""
+        with self.__lock:
+            jobs = list(self.__jobs.values())
+            for job in jobs:
+                self.__finish(job)
+
+        self.__abort(*jobs)
+
+    def __cancel(self, waveform):
+        """Remove the waveform request, return the job if it must be aborted."""
+        with self.__lock:
+            job = self.__jobs.get(waveform.uri.uri)
+            if job is None or waveform not in job.waveforms:
+                return None
+
+            if len(job.waveforms) > 1:
+                if job.leader is not waveform or not job.started:
+                    job.waveforms.remove(waveform)
+                # else, the leader is needed to complete the job
+
+                return None
+
+            # Mark the job as done, so it's not started anymore
+            self.__finish(job)
+            return job
+
+    def __push(self, job):
+        heappush(self.__queue, (job.priority, next(self.__counter), job))
+
+    def __abort(self, *jobs):
+        # The jobs must be already marked as done
+        for job in jobs:
+            if job is None:
+                continue
+
+            if job.started:
+                job.leader.ready.disconnect(job._ready)
+                job.leader.failed.disconnect(job._failed)
+                # Stop the processing
+                job.leader.clear()
+
+            for batch in job.batches:
+                batch.cancelled = True
+                batch._advance(job.waveforms)
+
+        self.__schedule()
+
+    def __finish(self, job):
+        # Must be called while holding the lock
+        job.done = True
+        self.__jobs.pop(job.key, None)
+        if job.started:
+            self.__running -= 1
+
+    def __schedule(self):
+        with self.__lock:
+            while self.__queue and self.__running < self.__workers:
+                priority, _, job = heappop(self.__queue)
+                if job.done or job.started or priority != job.priority:
+                    # Stale entry
+                    continue
+
+                job.started = True
+                self.__running += 1
+
+                # Hashing the file (for the cache lookup) and creating the
+                # pipeline might take a while, don't block the caller
+                SharedWorkerPool.submit(
+                    self.__start, job, priority=TaskPriority.Low
+                )
+
+    def __start(self, job):
+        with self.__lock:
+            if job.done:
+                return
+
+            leader = job.leader
+            leader.ready.connect(job._ready)
+            leader.failed.connect(job._failed)
+
+        # Another request (e.g. for a copy of the file) might have generated
+        # the waveform in the meantime
+        if leader.is_ready() or leader._from_cache():
+            leader.ready.emit()
+        elif leader._load_waveform():
+            # The processing completed (or failed) immediately
+            if leader.is_ready():
+                leader.ready.emit()
+            else:
+                leader.failed.emit()
+
+    def _complete(self, job, ready):
+        with self.__lock:
+            if job.done:
+                return
+
+            self.__finish(job)
+            leader, *followers = job.waveforms
+
+        leader.ready.disconnect(job._ready)
+        leader.failed.disconnect(job._failed)
+
+        for waveform in followers:
+            if ready:
+                waveform._share(leader)
+                waveform.ready.emit()
+            else:
+                waveform.failed.emit()
+
+        for batch in job.batches:
+            batch._advance(job.waveforms)
+
+        self.__schedule()
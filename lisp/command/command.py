@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import sys
 from abc import ABC, abstractmethod
 
 
@@ -56,3 +57,11 @@ class Command(ABC):
         The log message should be user-friendly and localized.
         """
         return ""
+
+    def memory(self) -> int:
+        """Return an estimate of the memory (in bytes) used by the command.
+
+        Used to keep the commands history within its memory budget,
+        commands holding considerable data should override it.
+        """
+        return sys.getsizeof(self)
@@ -15,31 +15,30 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from ast import literal_eval
+from copy import deepcopy
 
 from lisp.command.command import Command
+from lisp.core.util import deep_sizeof
 from lisp.ui.ui_utils import translate
 
 
 class UpdateCueCommand(Command):
+    """Update the cue properties, only the changed ones are kept."""
+
     __slots__ = ("__cue", "__new", "__old")
 
     def __init__(self, properties, cue):
         self.__cue = cue
-
-        self.__new = properties
-        self.__old = str(cue.properties())
+        self.__old, self.__new = deepcopy(cue.changed_properties(properties))
 
     def do(self):
         self.__cue.update_properties(self.__new)
-        self.__new = str(self.__new)
 
     def undo(self):
-        self.__cue.update_properties(literal_eval(self.__old))
+        self.__cue.update_properties(self.__old)
 
-    def redo(self):
-        self.__new = literal_eval(self.__new)
-        self.do()
+    def memory(self):
+        return super().memory() + deep_sizeof((self.__old, self.__new))
 
     def log(self):
         return translate("CueCommandLog", 'Cue settings changed: "{}"').format(
@@ -48,26 +47,38 @@ class UpdateCueCommand(Command):
 
 
 class UpdateCuesCommand(Command):
-    __slots__ = ("__cues", "__new", "__old")
+    """Update the properties of multiple cues.
+
+    For each cue only the changed properties are kept, cues left unchanged
+    are not referenced at all.
+    """
+
+    __slots__ = ("__changes",)
 
     def __init__(self, properties, cues):
-        self.__cues = cues
-        self.__new = properties
-        self.__old = str([cue.properties() for cue in cues])
+        # The new values are shared by all the cues
+        properties = deepcopy(properties)
 
-    def do(self):
-        for cue in self.__cues:
-            cue.update_properties(self.__new)
+        self.__changes = []
+        for cue in cues:
+            old, new = cue.changed_properties(properties)
+            if new:
+                if new == properties:
+                    # Usually nothing is filtered out, share the same dict
+                    new = properties
+
+                self.__changes.append((cue, deepcopy(old), new))
 
-        self.__new = str(self.__new)
+    def do(self):
+        for cue, _, new in self.__changes:
+            cue.update_properties(new)
 
     def undo(self):
-        for cue, old in zip(self.__cues, literal_eval(self.__old)):
+        for cue, old, _ in reversed(self.__changes):
             cue.update_properties(old)
 
-    def redo(self):
-        self.__new = literal_eval(self.__new)
-        self.do()
+    def memory(self):
+        return super().memory() + deep_sizeof(self.__changes)
 
     def log(self):
         return translate("CueCommandLog", "Cues settings changed.")
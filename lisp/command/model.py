@@ -38,12 +38,10 @@ class ModelAddItemsCommand(ModelItemsCommand):
         super().__init__(model, *items)
 
     def do(self):
-        for item in self._items:
-            self._model.add(item)
+        self._model.add_many(self._items)
 
     def undo(self):
-        for item in self._items:
-            self._model.remove(item)
+        self._model.remove_many(self._items)
 
 
 class ModelRemoveItemsCommand(ModelItemsCommand):
@@ -51,12 +49,10 @@ class ModelRemoveItemsCommand(ModelItemsCommand):
         super().__init__(model, *items)
 
     def do(self):
-        for item in self._items:
-            self._model.remove(item)
+        self._model.remove_many(self._items)
 
     def undo(self):
-        for item in self._items:
-            self._model.add(item)
+        self._model.add_many(self._items)
 
 
 class ModelInsertItemsCommand(ModelItemsCommand):
@@ -68,19 +64,11 @@ class ModelInsertItemsCommand(ModelItemsCommand):
         self._items = items
 
     def do(self):
-        if self._index >= 0:
-            # We know where we should insert the items
-            for index, item in enumerate(self._items, self._index):
-                self._model.insert(item, index)
-        else:
-            # We don't know where to insert the item, the model will choose the
-            # best position
-            for item in self._items:
-                self._model.insert(item, -1)
+        # With a negative index the model will choose the best position
+        self._model.insert_many(self._items, self._index)
 
     def undo(self):
-        for item in self._items:
-            self._model.remove(item)
+        self._model.remove_many(self._items)
 
 
 class ModelMoveItemCommand(ModelCommand):
@@ -99,47 +87,31 @@ class ModelMoveItemCommand(ModelCommand):
 
 
 class ModelMoveItemsCommand(ModelCommand):
-    __slots__ = ("_old_indexes", "_new_index", "_before", "_after")
+    """Move the items at `old_indexes` next to each other, at `new_index`.
+
+    Items before `new_index` are placed so that the last one is at
+    `new_index`, the others follow them, relative order is preserved.
+    """
+
+    __slots__ = ("_old_indexes", "_new_indexes")
 
     def __init__(self, model_adapter, old_indexes, new_index):
         super().__init__(model_adapter)
-        self._old_indexes = old_indexes
-        self._new_index = new_index
-        self._before = 0
-        self._after = 0
+        self._old_indexes = tuple(sorted(old_indexes))
 
-        if self._new_index < 0:
-            self._new_index = 0
-        elif self._new_index >= len(model_adapter):
-            self._new_index = len(model_adapter) - 1
+        if new_index < 0:
+            new_index = 0
+        elif new_index >= len(model_adapter):
+            new_index = len(model_adapter) - 1
 
-        for old_index in old_indexes:
-            if old_index < new_index:
-                self._before += 1
-            elif old_index > new_index:
-                self._after += 1
+        before = sum(1 for index in self._old_indexes if index < new_index)
+        start = new_index - before + 1 if before else new_index
+        start = min(start, len(model_adapter) - len(self._old_indexes))
 
-    def do(self):
-        before = after = 0
-        shift = bool(self._before)
+        self._new_indexes = tuple(range(start, start + len(self._old_indexes)))
 
-        for index in self._old_indexes:
-            if index <= self._new_index:
-                self._model.move(index - before, self._new_index)
-                before += 1
-            elif index > self._new_index:
-                self._model.move(index, self._new_index + after + shift)
-                after += 1
+    def do(self):
+        self._model.move_many(self._old_indexes, self._new_indexes)
 
     def undo(self):
-        before = self._before
-        after = self._after
-        shift = bool(self._before)
-
-        for old_index in self._old_indexes:
-            if old_index <= self._new_index:
-                before -= 1
-                self._model.move(self._new_index - before, old_index)
-            elif old_index > self._new_index:
-                after -= 1
-                self._model.move(self._new_index + shift, old_index + after)
+        self._model.move_many(self._new_indexes, self._old_indexes)
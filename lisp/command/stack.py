@@ -26,19 +26,33 @@ logger = logging.getLogger(__name__)
 
 
 class CommandsStack:
-    """Provide a classic undo/redo mechanism based on stacks."""
+    """Provide a classic undo/redo mechanism based on stacks.
+
+    The stacks can be limited in size (number of commands), and in memory,
+    as estimated by `Command.memory()`. When the memory budget is exceeded
+    the oldest commands are discarded.
+    """
 
     DO_STR = "{}"
     UNDO_STR = translate("CommandsStack", "Undo: {}")
     REDO_STR = translate("CommandsStack", "Redo: {}")
 
-    def __init__(self, stack_size=None):
+    def __init__(self, stack_size=None, memory_budget=None):
+        """
+        :param stack_size: maximum number of commands in each stack
+        :param memory_budget: maximum memory (bytes) used by the commands
+        """
         super().__init__()
 
         self._undo = deque(maxlen=stack_size)
         self._redo = deque(maxlen=stack_size)
         self._saved = None
 
+        self._memory = {}
+        # id(command) -> estimated memory of the commands in the stacks
+        self._memory_used = 0
+        self._memory_budget = memory_budget
+
         self.done = Signal()
         self.saved = Signal()
         self.undone = Signal()
@@ -50,14 +64,35 @@ class CommandsStack:
         self._redo.clear()
         self._saved = None
 
+        self._memory.clear()
+        self._memory_used = 0
+
+    @property
+    def memory_budget(self):
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, budget):
+        self._memory_budget = budget
+        self._evict()
+
+    def memory_used(self):
+        """Estimated memory (bytes) used by the commands in the stacks."""
+        return self._memory_used
+
     def do(self, command: Command):
         """Execute the command, and add it the `undo` stack."""
         command.do()
 
         self._logging(command, CommandsStack.DO_STR)
-        self._undo.append(command)
         # Clean the redo stack for maintain consistency
-        self._redo.clear()
+        while self._redo:
+            self._forget(self._redo.pop())
+
+        self._push(self._undo, command)
+        self._memory[id(command)] = command.memory()
+        self._memory_used += self._memory[id(command)]
+        self._evict()
 
         self.done.emit(command)
 
@@ -68,7 +103,7 @@ class CommandsStack:
             command.undo()
 
             self._logging(command, CommandsStack.UNDO_STR)
-            self._redo.append(command)
+            self._push(self._redo, command)
 
             self.undone.emit(command)
 
@@ -79,16 +114,28 @@ class CommandsStack:
             command.redo()
 
             self._logging(command, CommandsStack.REDO_STR)
-            self._undo.append(command)
+            self._push(self._undo, command)
 
             self.redone.emit(command)
 
-    def set_saved(self):
-        """Set the command at the _top_ of the `undo` stack as `save-point`."""
-        if self._undo:
-            self._saved = self._undo[-1]
+    def set_saved(self, command=None):
+        """Set the command at the _top_ of the `undo` stack as `save-point`.
+
+        :param command: the command to set as `save-point` instead, as
+            returned by `top()` when the saved state was captured
+        """
+        if command is None and self._undo:
+            command = self._undo[-1]
+
+        if command is not None:
+            self._saved = command
             self.saved.emit()
 
+    def top(self):
+        """Return the command at the _top_ of the `undo` stack, if any."""
+        if self._undo:
+            return self._undo[-1]
+
     def is_saved(self) -> bool:
         """Return True if the command at the _top_ of the `undo` stack is the
         one that was on the _top_ of stack the last time `set_saved()`
@@ -99,6 +146,31 @@ class CommandsStack:
 
         return True
 
+    def _push(self, stack, command):
+        # A full stack discards the command at the other end
+        if len(stack) == stack.maxlen:
+            self._forget(stack[0])
+
+        stack.append(command)
+
+    def _forget(self, command):
+        self._memory_used -= self._memory.pop(id(command), 0)
+
+    def _evict(self):
+        """Discard the oldest commands, until within the memory budget.
+
+        The last executed command is always kept.
+        """
+        if not self._memory_budget:
+            return
+
+        while self._memory_used > self._memory_budget and len(self._undo) > 1:
+            self._forget(self._undo.popleft())
+
+        # The redo stack is discarded starting from the newest commands
+        while self._memory_used > self._memory_budget and self._redo:
+            self._forget(self._redo.popleft())
+
     @staticmethod
     def _logging(command: Command, template: str):
         message = command.log()
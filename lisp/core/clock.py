@@ -15,39 +15,124 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from threading import Lock
+from threading import RLock
+from time import monotonic
 
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt, QTimer
 
+from lisp.core.singleton import Singleton
 
-class Clock(QTimer):
-    """Clock based on Qt.QTimer class.
 
-    The clock is running only when there's one, or more, callbacks.
+class _Rate:
+    __slots__ = ("interval", "deadline", "callbacks")
+
+    def __init__(self, interval):
+        self.interval = interval / 1000
+        self.deadline = 0
+        self.callbacks = ()
+
+
+class MasterClock(metaclass=Singleton):
+    """Single high-resolution clock, shared by all the `Clock` objects.
+
+    The underlying timer ticks at the smallest requested interval, on each
+    tick the callbacks registered for an interval are called if their deadline
+    is elapsed.
+
+    Deadlines are advanced by their interval (not from the current time), so
+    the delivery rate doesn't drift; if the clock falls behind, the missed
+    ticks are coalesced into a single call.
+
+    The `ticks` counter can be used to cache values for the duration of
+    a single tick (e.g. to query a value only once for multiple callbacks).
     """
 
-    def __init__(self, timeout):
-        super().__init__()
-        self.setInterval(timeout)
+    def __init__(self):
+        self.__lock = RLock()
+        self.__rates = {}
+        self.__snapshot = ()
+        self.__ticks = 0
 
-        self.__lock = Lock()
-        self.__clients = 0
+        self.__timer = QTimer()
+        self.__timer.setTimerType(Qt.PreciseTimer)
+        self.__timer.timeout.connect(self.__tick)
 
-    def add_callback(self, callback):
+    @property
+    def ticks(self):
+        return self.__ticks
+
+    def add_callback(self, callback, interval):
+        """Call `callback` every `interval` milliseconds."""
         with self.__lock:
-            self.timeout.connect(callback)
+            rate = self.__rates.get(interval)
+            if rate is None:
+                rate = self.__rates[interval] = _Rate(interval)
+                rate.deadline = monotonic() + rate.interval
 
-            self.__clients += 1
-            if self.__clients == 1:
-                self.start()
+            if callback not in rate.callbacks:
+                rate.callbacks = rate.callbacks + (callback,)
 
-    def remove_callback(self, callback):
+            self.__update()
+
+    def remove_callback(self, callback, interval):
         with self.__lock:
-            self.timeout.disconnect(callback)
+            rate = self.__rates.get(interval)
+            if rate is not None and callback in rate.callbacks:
+                rate.callbacks = tuple(
+                    c for c in rate.callbacks if c != callback
+                )
+
+                if not rate.callbacks:
+                    self.__rates.pop(interval)
+
+                self.__update()
+
+    def __update(self):
+        self.__snapshot = tuple(self.__rates.values())
 
-            self.__clients -= 1
-            if self.__clients == 0:
-                self.stop()
+        if self.__rates:
+            self.__timer.setInterval(int(min(self.__rates)))
+            if not self.__timer.isActive():
+                self.__timer.start()
+        else:
+            self.__timer.stop()
+
+    def __tick(self):
+        self.__ticks += 1
+
+        now = monotonic()
+        # Deliver a bit early, rather than a full timer-interval late
+        now_tolerant = now + self.__timer.interval() / 2000
+
+        for rate in self.__snapshot:
+            if rate.deadline <= now_tolerant:
+                rate.deadline += rate.interval
+                if rate.deadline <= now:
+                    # We are late, skip the missed ticks
+                    late = now - rate.deadline
+                    rate.deadline += (late // rate.interval + 1) * rate.interval
+
+                for callback in rate.callbacks:
+                    callback()
+
+
+class Clock:
+    """Clock with a fixed interval, driven by the `MasterClock`.
+
+    The clock is running only when there's one, or more, callbacks.
+    """
+
+    def __init__(self, timeout):
+        """
+        :param timeout: the interval in milliseconds (can be a float)
+        """
+        self.timeout = timeout
+
+    def add_callback(self, callback):
+        MasterClock().add_callback(callback, self.timeout)
+
+    def remove_callback(self, callback):
+        MasterClock().remove_callback(callback, self.timeout)
 
 
 Clock_10 = Clock(10)
@@ -17,18 +17,40 @@
 
 import logging
 from functools import wraps, partial
-from threading import Thread, Lock, RLock
+from threading import Lock, RLock
 
+from lisp.core.worker_pool import SharedWorkerPool, TaskPriority
 
-def async_function(target):
+
+def async_function(target=None, *, priority=TaskPriority.Normal, key=None):
     """Decorator. Make a function asynchronous.
 
-    The decorated function is executed in a different thread.
+    The decorated function is executed by a worker of the `SharedWorkerPool`.
+
+    When `key` is given, it's called with the same arguments of the decorated
+    function, and must return a hashable key, calls with the same key (e.g.
+    methods called on the same object) are never reordered, nor run
+    concurrently, unless a call releases its key before blocking (see
+    `WorkerPool.release_key`).
+
+    :param target: the function to decorate
+    :param priority: the priority of the calls, see `TaskPriority`
+    :param key: a function returning the ordering key of a call
     """
 
+    # If called with (keywords) arguments
+    if target is None:
+        return partial(async_function, priority=priority, key=key)
+
     @wraps(target)
     def wrapped(*args, **kwargs):
-        Thread(target=target, args=args, kwargs=kwargs, daemon=True).start()
+        SharedWorkerPool.submit(
+            target,
+            *args,
+            priority=priority,
+            key=key(*args, **kwargs) if key is not None else None,
+            **kwargs,
+        )
 
     return wrapped
 
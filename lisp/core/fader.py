@@ -15,14 +15,18 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+import logging
 from abc import abstractmethod, ABC
-from threading import Event
+from threading import Condition, Event, RLock, Thread
+from time import monotonic
 from typing import Union
 
 from lisp.core.decorators import locked_method
 from lisp.core.fade_functions import ntime, FadeInType, FadeOutType
 from lisp.core.util import rsetattr, rgetattr, typename
 
+logger = logging.getLogger(__name__)
+
 
 class BaseFader(ABC):
     """Base class for "faders"
@@ -150,16 +154,91 @@ class DummyFader(BaseFader):
         return 0
 
 
+class FadeScheduler:
+    """Drive the steps of all the running (python) fades from a single thread.
+
+    A fade is represented by a callable that perform a single step, and
+    returns False when the fade is completed. When no fade is running the
+    thread sleeps.
+    """
+
+    def __init__(self, interval=0.01):
+        """
+        :param interval: the time between steps, in seconds
+        """
+        self.interval = interval
+
+        self.__fades = []
+        self.__condition = Condition()
+        self.__thread = None
+
+    def add(self, step):
+        with self.__condition:
+            self.__fades.append(step)
+
+            if self.__thread is None:
+                self.__thread = Thread(
+                    target=self.__run, name="FadeScheduler", daemon=True
+                )
+                self.__thread.start()
+            else:
+                self.__condition.notify()
+
+    def __run(self):
+        next_tick = monotonic()
+
+        while True:
+            with self.__condition:
+                while not self.__fades:
+                    self.__condition.wait()
+                    next_tick = monotonic()
+
+                fades = self.__fades.copy()
+
+            # Steps are performed without holding the lock, so that they
+            # can start or stop other fades (e.g. from a signal slot)
+            completed = []
+            for step in fades:
+                try:
+                    running = step()
+                except Exception:
+                    logger.exception("Exception during fade step.")
+                    running = False
+
+                if not running:
+                    completed.append(step)
+
+            with self.__condition:
+                for step in completed:
+                    self.__fades.remove(step)
+
+                # Keep a steady rate, skipping steps if we are late
+                next_tick += self.interval
+                delay = next_tick - monotonic()
+                if delay < 0:
+                    next_tick -= delay
+                    delay = 0
+
+                self.__condition.wait(delay)
+
+
 class Fader(BaseFader):
     """Perform fades on "generic" objects attributes.
 
     * Fades have a resolution of `1-hundredth-of-second`
+    * The steps of all the running faders are performed by a single thread,
+      see `FadeScheduler`, the thread calling `fade()` just waits
     """
 
+    Scheduler = FadeScheduler()
+
     def __init__(self, target, attribute):
         super().__init__(target, attribute)
         # current fade time in hundredths-of-seconds
         self._time = 0
+        self._done = Event()
+        # Held while a step is changing the target
+        self._step_lock = RLock()
 
     def _fade(
         self,
@@ -169,31 +248,60 @@ class Fader(BaseFader):
     ) -> bool:
         self._time = 0
 
-        begin = 0
         functor = fade_type.value
-        duration = int(duration * 100)
+        duration = max(int(duration * 100), 1)
         base_value = rgetattr(self._target, self._attribute)
         value_diff = to_value - base_value
 
         if value_diff == 0:
             return True
 
-        while self._time <= duration and not self._running.is_set():
-            rsetattr(
-                self._target,
-                self._attribute,
-                round(
-                    functor(
-                        ntime(self._time, begin, duration),
-                        value_diff,
-                        base_value,
-                    ),
-                    6,
-                ),
-            )
+        start = monotonic()
+        # A new event for each fade, a stopped fade is never resumed
+        done = self._done = Event()
+
+        def step():
+            running = False
+            try:
+                with self._step_lock:
+                    if self._running.is_set() or done.is_set():
+                        return False
+
+                    self._time = min(int((monotonic() - start) * 100), duration)
+                    rsetattr(
+                        self._target,
+                        self._attribute,
+                        round(
+                            functor(
+                                ntime(self._time, 0, duration),
+                                value_diff,
+                                base_value,
+                            ),
+                            6,
+                        ),
+                    )
+
+                    running = self._time < duration
+            finally:
+                if not running:
+                    done.set()
+
+            return running
+
+        self.Scheduler.add(step)
+        done.wait()
+
+    def stop(self):
+        if not self._running.is_set():
+            self._running.set()
 
-            self._time += 1
-            self._running.wait(0.01)
+            # Wait for a running step, then wake the fading thread, without
+            # waiting for the next step, the caller might be a slot called
+            # by a step, in the scheduler thread
+            with self._step_lock:
+                self._done.set()
+
+            self._is_ready.wait()
 
     def _after_fade(self, interrupted):
         self._time = 0
@@ -0,0 +1,219 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import logging
+import os
+from os import path
+from threading import Lock, Timer
+
+from lisp.core.util import file_hash
+
+logger = logging.getLogger(__name__)
+
+
+def file_sampled_hash(file_path, block_size=1048576, **hasher_kwargs):
+    """Hash a file using only a few blocks of its content.
+
+    The blocks at the head, in the middle, and at the tail of the file are
+    hashed together with the file size. This is a lot faster than
+    `file_hash` for big files, but changes in other parts of the file are
+    not detected.
+
+    :param file_path: the path of the file to hash
+    :param block_size: the size in bytes of each block
+    :param **hasher_kwargs: will be passed to the hash function
+    """
+    h = hashlib.blake2b(**hasher_kwargs)
+    size = path.getsize(file_path)
+    h.update(size.to_bytes(8, "little"))
+
+    with open(file_path, "rb") as file_to_hash:
+        for offset in (0, (size - block_size) // 2, size - block_size):
+            file_to_hash.seek(max(offset, 0))
+            h.update(file_to_hash.read(block_size))
+
+    return h.hexdigest()
+
+
+class FingerprintIndex:
+    """Persistent index of files content-hashes.
+
+    The hashes are indexed by the file (device, inode, size, mtime), so a file
+    is hashed again only when it changes, or is replaced.
+
+    Files bigger than `sampled_threshold` bytes (if greater than 0) are hashed
+    using `file_sampled_hash`, instead of reading their whole content.
+
+    The index holds up to `MAX_ENTRIES`, the least recently used entries are
+    dropped first. It's saved in the given directory, shortly after new
+    entries are added, `flush_all` should be called before exiting, to save
+    the pending changes.
+    """
+
+    FILE_NAME = "fingerprints.json"
+    INDEX_VERSION = 1
+    MAX_ENTRIES = 20000
+    SAVE_DELAY = 2
+
+    sampled_threshold = 0
+
+    __Instances = {}
+    __InstancesLock = Lock()
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+        self.__lock = Lock()
+        self.__save_lock = Lock()
+        self.__save_timer = None
+        self.__entries = self.__read()
+
+    @classmethod
+    def get(cls, directory):
+        """Return the (shared) index for the given directory.
+
+        :rtype: FingerprintIndex
+        """
+        directory = path.abspath(directory)
+        with cls.__InstancesLock:
+            index = cls.__Instances.get(directory)
+            if index is None:
+                index = cls.__Instances[directory] = cls(directory)
+
+            return index
+
+    @classmethod
+    def flush_all(cls):
+        """Save the pending changes of all the indexes."""
+        with cls.__InstancesLock:
+            indexes = list(cls.__Instances.values())
+
+        for index in indexes:
+            index.flush()
+
+    @property
+    def file_path(self):
+        return path.join(self.directory, self.FILE_NAME)
+
+    def fingerprint(self, file_path, **hasher_kwargs):
+        """Return the content-hash of the given file.
+
+        :param file_path: the path of the file
+        :param **hasher_kwargs: will be passed to the hash function
+        """
+        stat = os.stat(file_path)
+        sampled = 0 < self.sampled_threshold < stat.st_size
+        key = "{}:{}:{}:{}:{}:{}".format(
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+            "sampled" if sampled else "full",
+            json.dumps(hasher_kwargs, sort_keys=True, default=repr),
+        )
+
+        with self.__lock:
+            fingerprint = self.__entries.pop(key, None)
+            if fingerprint is not None:
+                # Move the entry to the end, the most recently used
+                self.__entries[key] = fingerprint
+                self.hits += 1
+                return fingerprint
+
+        if sampled:
+            fingerprint = file_sampled_hash(file_path, **hasher_kwargs)
+        else:
+            fingerprint = file_hash(file_path, **hasher_kwargs)
+
+        with self.__lock:
+            self.misses += 1
+            self.__entries[key] = fingerprint
+
+            # Drop the least recently used entries
+            while len(self.__entries) > self.MAX_ENTRIES:
+                self.__entries.pop(next(iter(self.__entries)))
+
+            self.__schedule_save()
+
+        return fingerprint
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def flush(self):
+        """Save the index now, if a save is pending."""
+        with self.__lock:
+            timer = self.__save_timer
+
+        if timer is not None:
+            timer.cancel()
+            self.save()
+
+    def save(self):
+        with self.__save_lock:
+            self.__save()
+
+    def __save(self):
+        with self.__lock:
+            self.__save_timer = None
+            entries = self.__entries.copy()
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            temp_path = self.file_path + ".tmp"
+            with open(temp_path, "w") as file:
+                json.dump(
+                    {"version": self.INDEX_VERSION, "entries": entries}, file
+                )
+
+            os.replace(temp_path, self.file_path)
+        except OSError:
+            logger.warning(
+                f"Cannot save the fingerprint index: {self.file_path}",
+                exc_info=True,
+            )
+
+    def __schedule_save(self):
+        if self.__save_timer is None:
+            self.__save_timer = Timer(self.SAVE_DELAY, self.save)
+            self.__save_timer.daemon = True
+            self.__save_timer.start()
+
+    def __read(self):
+        try:
+            with open(self.file_path, "r") as file:
+                index = json.load(file)
+
+            if index.get("version") == self.INDEX_VERSION:
+                return index.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning(
+                f"Cannot read the fingerprint index: {self.file_path}",
+                exc_info=True,
+            )
+
+        return {}
@@ -16,10 +16,15 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 from abc import ABCMeta
+from itertools import count
+from weakref import WeakKeyDictionary, ref
 
 from lisp.core.properties import Property, InstanceProperty
 from lisp.core.signal import Signal
-from lisp.core.util import typename
+from lisp.core.util import dict_merge_diff, typename
+
+# Shared by all the objects, so that generations are never reused
+_generations = count(1)
 
 
 class HasPropertiesMeta(ABCMeta):
@@ -41,7 +46,7 @@ class HasPropertiesMeta(ABCMeta):
         cls = super().__new__(mcls, name, bases, namespace, **kwargs)
 
         # Compute the set of property names
-        cls._properties_ = {
+        properties = {
             name
             for name, value in namespace.items()
             if isinstance(value, Property)
@@ -50,7 +55,13 @@ class HasPropertiesMeta(ABCMeta):
         # Update the set from "proper" base classes
         for base in bases:
             if isinstance(base, HasPropertiesMeta):
-                cls._properties_.update(base._properties_)
+                properties.update(base._properties_)
+
+        # Property names are kept in a frozenset, that is replaced only when
+        # properties are added or removed, so it can be shared without copies
+        cls._properties_ = frozenset(properties)
+        # Cache for filtered names {filter: frozenset}
+        cls._filtered_properties_ = WeakKeyDictionary()
 
         return cls
 
@@ -67,12 +78,14 @@ class HasPropertiesMeta(ABCMeta):
             cls._del_property(name)
 
     def _add_property(cls, name):
-        cls._properties_.add(name)
+        cls._properties_ = cls._properties_.union((name,))
+        cls._filtered_properties_.clear()
         for subclass in cls.__subclasses__():
             subclass._add_property(name)
 
     def _del_property(cls, name):
-        cls._properties_.discard(name)
+        cls._properties_ = cls._properties_.difference((name,))
+        cls._filtered_properties_.clear()
         for subclass in cls.__subclasses__():
             subclass._del_property(name)
 
@@ -101,30 +114,53 @@ class HasProperties(metaclass=HasPropertiesMeta):
         self.property_changed = Signal()
         # Emitted after property change (self, name, value)
 
+        self.__generation = next(_generations)
+        # Updated on every change, see `generation()`
+        self.__clean_generation = 0
+        # The generation at the last `clear_dirty()` call
+        self.__parent = None
+        # Weak-reference to the object holding this one as a property value
+
     def properties_names(self, filter=None):
         """
         To work as intended `filter` must be a function that takes a set as a
         parameter and return a set with the property names filtered by
         some custom rule. The given set can be modified in-place.
+        The result of a filter is cached (per class), so it should only
+        depend on the given names.
 
         :param filter: a function to filter the returned properties, or None
-        :rtype: set
+        :rtype: frozenset
         :return: The object `Properties` names
         """
         if callable(filter):
-            return filter(self._properties_names())
+            return self._filtered_properties_names(filter)
         else:
             return self._properties_names()
 
     def _properties_names(self):
-        """Return a set of properties names, intended for internal usage.
+        """Return the properties names, intended for internal usage.
 
-        The returned set is a copy of the internal one, so it can be modified
-        in-place.
+        The returned set is shared, and can't be modified.
 
-        :rtype: set
+        :rtype: frozenset
         """
-        return self.__class__._properties_.copy()
+        return type(self)._properties_
+
+    def _filtered_properties_names(self, filter):
+        cls = type(self)
+        try:
+            return cls._filtered_properties_[filter]
+        except KeyError:
+            pass
+        except TypeError:
+            # The filter can't be weak-referenced
+            return frozenset(filter(set(cls._properties_)))
+
+        names = frozenset(filter(set(cls._properties_)))
+        cls._filtered_properties_[filter] = names
+
+        return names
 
     def properties_defaults(self, filter=None):
         """Instance properties defaults.
@@ -161,7 +197,7 @@ class HasProperties(metaclass=HasPropertiesMeta):
         if callable(filter):
             return {
                 name: getattr(cls, name).default
-                for name in filter(cls._properties_.copy())
+                for name in filter(set(cls._properties_))
             }
         else:
             return {
@@ -205,6 +241,43 @@ class HasProperties(metaclass=HasPropertiesMeta):
                 else:
                     setattr(self, name, value)
 
+    def changed_properties(self, properties):
+        """Compare the given dict with the current properties.
+
+        Only the (nested) properties that `update_properties` would change
+        are returned. Properties with a dynamic set of names (see
+        `HasInstanceProperties`) are compared, and returned, as a whole.
+
+        :param properties: The properties to compare
+        :type properties: dict
+        :return: The current and the new values of the changed properties
+        :rtype: tuple[dict, dict]
+        """
+        old = {}
+        new = {}
+
+        names = self.properties_names()
+        for name, value in properties.items():
+            if name not in names:
+                continue
+
+            current = getattr(self, name)
+            if isinstance(current, HasInstanceProperties):
+                current = current.properties()
+                if dict_merge_diff(current, value):
+                    old[name] = current
+                    new[name] = value
+            elif isinstance(current, HasProperties):
+                sub_old, sub_new = current.changed_properties(value)
+                if sub_new:
+                    old[name] = sub_old
+                    new[name] = sub_new
+            elif current != value:
+                old[name] = current
+                new[name] = value
+
+        return old, new
+
     def changed(self, name):
         """
         :param name: The property name
@@ -225,10 +298,49 @@ class HasProperties(metaclass=HasPropertiesMeta):
 
     def __setattr__(self, name, value):
         super().__setattr__(name, value)
-        if name in self.properties_names():
+        # Look up the class names directly, this runs for every attribute
+        if name in type(self)._properties_:
             self._emit_changed(name, value)
 
+    def generation(self):
+        """Return a number that increases every time a property changes.
+
+        Changes of nested HasProperties objects are included.
+        The same generation is never assigned twice, also between different
+        objects, so it can be used to detect changes without resetting it.
+        """
+        return self.__generation
+
+    def is_dirty(self):
+        """Return True if some property changed since `clear_dirty()`.
+
+        Changes of nested HasProperties objects are included.
+        """
+        return self.__generation > self.__clean_generation
+
+    def clear_dirty(self):
+        """Clear the "dirty" flag, of this and the nested objects."""
+        self.__clean_generation = self.__generation
+
+        for name in self._properties_names():
+            value = getattr(self, name)
+            if isinstance(value, HasProperties):
+                value.clear_dirty()
+
+    def _mark_dirty(self):
+        # Mark this object, and all the ones holding it, as dirty
+        generation = next(_generations)
+        obj = self
+        while obj is not None:
+            obj.__generation = generation
+            obj = obj.__parent() if obj.__parent is not None else None
+
     def _emit_changed(self, name, value):
+        if isinstance(value, HasProperties):
+            value.__parent = ref(self)
+
+        self._mark_dirty()
+
         self.property_changed.emit(self, name, value)
         try:
             self.__changed_signals[name].emit(value)
@@ -236,7 +348,7 @@ class HasProperties(metaclass=HasPropertiesMeta):
             pass
 
     def _property(self, name):
-        if name in self.__class__._properties_:
+        if name in type(self)._properties_:
             return getattr(self.__class__, name)
 
         # TODO: PropertyError ??
@@ -248,6 +360,7 @@ class HasProperties(metaclass=HasPropertiesMeta):
 class HasInstanceProperties(HasProperties):
     # Fallback __init__
     _i_properties_ = set()
+    _i_names_ = None
 
     def __init__(self):
         super().__init__()
@@ -255,7 +368,18 @@ class HasInstanceProperties(HasProperties):
         # Registry to keep track of instance-properties
 
     def _properties_names(self):
-        return super()._properties_names().union(self._i_properties_)
+        # Cache the union of class and instance properties names, until
+        # one of the two changes
+        names = self._i_names_
+        class_names = type(self)._properties_
+        if names is None or names[0] is not class_names:
+            names = (class_names, class_names.union(self._i_properties_))
+            object.__setattr__(self, "_i_names_", names)
+
+        return names[1]
+
+    def _filtered_properties_names(self, filter):
+        return frozenset(filter(set(self._properties_names())))
 
     def __getattribute__(self, name):
         attribute = super().__getattribute__(name)
@@ -268,6 +392,7 @@ class HasInstanceProperties(HasProperties):
         if isinstance(value, InstanceProperty):
             super().__setattr__(name, value)
             self._i_properties_.add(name)
+            object.__setattr__(self, "_i_names_", None)
         elif name in self._i_properties_:
             property = super().__getattribute__(name)
             property.__pset__(value)
@@ -277,7 +402,10 @@ class HasInstanceProperties(HasProperties):
 
     def __delattr__(self, name):
         super().__delattr__(name)
-        self._i_properties_.discard(name)
+        if name in self._i_properties_:
+            self._i_properties_.discard(name)
+            object.__setattr__(self, "_i_names_", None)
+            self._mark_dirty()
 
     def _property(self, name):
         if name in self._i_properties_:
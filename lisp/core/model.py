@@ -37,11 +37,20 @@ class Model(Sized, Iterable, Container):
     __iter__ must provide an iterator over the items
     __len__ must return the number of stored items
     __contains__ must return True/False if the given item is in/not in the model
+
+    Items can be added/removed in batches, the `items_added`/`items_removed`
+    signals are emitted once per batch (also for single items), after the
+    per-item `item_added`/`item_removed` signals. Models and views doing
+    significant work for each change should use the former.
     """
 
     def __init__(self):
         self.item_added = Signal()
         self.item_removed = Signal()
+        self.items_added = Signal()
+        # Emitted once after a batch of items is added (items)
+        self.items_removed = Signal()
+        # Emitted once after a batch of items is removed (items)
         self.model_reset = Signal()
 
     @abstractmethod
@@ -52,6 +61,23 @@ class Model(Sized, Iterable, Container):
     def remove(self, item):
         pass
 
+    def add_many(self, items):
+        """Add multiple items, the default implementation add them one by one.
+
+        :type items: collections.abc.Iterable
+        """
+        for item in items:
+            self.add(item)
+
+    def remove_many(self, items):
+        """Remove multiple items, the default implementation remove them
+        one by one.
+
+        :type items: collections.abc.Iterable
+        """
+        for item in items:
+            self.remove(item)
+
     @abstractmethod
     def reset(self):
         pass
@@ -27,11 +27,26 @@ class ModelAdapter(ProxyModel):
     def __init__(self, model):
         super().__init__(model)
         self.item_moved = Signal()
+        self.items_moved = Signal()
+        # Emitted after moving a batch of items (old_indexes, new_indexes)
 
     @abstractmethod
     def insert(self, item, index):
         pass
 
+    def insert_many(self, items, index):
+        """Insert multiple items, starting from the given index.
+
+        If index is negative the model will choose the best position.
+        The default implementation insert the items one by one.
+        """
+        if index >= 0:
+            for item_index, item in enumerate(items, index):
+                self.insert(item, item_index)
+        else:
+            for item in items:
+                self.insert(item, -1)
+
     @abstractmethod
     def item(self, index):
         pass
@@ -43,3 +58,10 @@ class ModelAdapter(ProxyModel):
     @abstractmethod
     def move(self, old_index, new_index):
         pass
+
+    @abstractmethod
+    def move_many(self, old_indexes, new_indexes):
+        """Move the items at `old_indexes` to the respective `new_indexes`.
+
+        The new indexes are the final positions of the items.
+        """
@@ -31,8 +31,8 @@ class ABCProxyModel(Model):
             )
 
         self._model = model
-        self._model.item_added.connect(self._item_added)
-        self._model.item_removed.connect(self._item_removed)
+        self._model.items_added.connect(self._items_added)
+        self._model.items_removed.connect(self._items_removed)
         self._model.model_reset.connect(self._model_reset)
 
     @property
@@ -51,6 +51,23 @@ class ABCProxyModel(Model):
     def _item_removed(self, item):
         pass
 
+    def _items_added(self, items):
+        """Called once for each batch of items added to the wrapped model.
+
+        The default implementation calls `_item_added` for each item,
+        override it to handle the whole batch at once.
+        """
+        for item in items:
+            self._item_added(item)
+
+    def _items_removed(self, items):
+        """Called once for each batch of items removed from the wrapped model.
+
+        The default implementation calls `_item_removed` for each item.
+        """
+        for item in items:
+            self._item_removed(item)
+
 
 class ProxyModel(ABCProxyModel):
     """Proxy that wrap another model to extend its functionality.
@@ -69,6 +86,12 @@ class ProxyModel(ABCProxyModel):
     def remove(self, item):
         self._model.remove(item)
 
+    def add_many(self, items):
+        self._model.add_many(items)
+
+    def remove_many(self, items):
+        self._model.remove_many(items)
+
     def reset(self):
         self._model.reset()
 
@@ -89,5 +112,11 @@ class ReadOnlyProxyModel(ProxyModel):
     def remove(self, item):
         raise ModelException("cannot remove items from a read-only model")
 
+    def add_many(self, items):
+        raise ModelException("cannot add items into a read-only model")
+
+    def remove_many(self, items):
+        raise ModelException("cannot remove items from a read-only model")
+
     def reset(self):
         raise ModelException("cannot reset read-only model")
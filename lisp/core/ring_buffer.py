@@ -0,0 +1,102 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections.abc import Sequence
+
+
+class RingBuffer(Sequence):
+    """Sequence with a fixed capacity, and O(1) access to any item.
+
+    When the buffer is full, appending an item discards the oldest one.
+    A capacity of 0 means no limit, the buffer grows as needed.
+
+    Unlike a `deque`, random access is O(1) also in the middle of the buffer,
+    which matters when used as the storage of Qt models.
+    """
+
+    def __init__(self, capacity=0):
+        self.__capacity = max(capacity, 0)
+        self.__items = []
+        self.__start = 0
+        self.__size = 0
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def append(self, item):
+        if not self.__capacity:
+            self.__items.append(item)
+        elif len(self.__items) < self.__capacity:
+            # The storage is allocated only when needed
+            self.__items.append(item)
+        else:
+            end = (self.__start + self.__size) % self.__capacity
+            self.__items[end] = item
+
+            if self.__size == self.__capacity:
+                self.__start = (self.__start + 1) % self.__capacity
+                return
+
+        self.__size += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def popleft(self, count=1):
+        """Discard the `count` oldest items."""
+        count = min(count, self.__size)
+        if count <= 0:
+            return
+
+        if not self.__capacity:
+            del self.__items[:count]
+        else:
+            for n in range(count):
+                # Release the references to the discarded items
+                self.__items[(self.__start + n) % self.__capacity] = None
+
+            self.__start = (self.__start + count) % self.__capacity
+
+        self.__size -= count
+
+    def clear(self):
+        self.__items = []
+        self.__start = 0
+        self.__size = 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[n] for n in range(*index.indices(self.__size))]
+
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError("RingBuffer index out of range")
+
+        if not self.__capacity:
+            return self.__items[index]
+
+        return self.__items[(self.__start + index) % self.__capacity]
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        for index in range(self.__size):
+            yield self[index]
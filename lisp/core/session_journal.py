@@ -0,0 +1,402 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+from uuid import uuid4
+
+from lisp.core.util import filter_live_properties
+
+logger = logging.getLogger(__name__)
+
+
+def properties_diff(old, new, path, target, operations):
+    """Append to `operations` the changes needed to turn `old` into `new`.
+
+    Nested dictionaries are compared recursively, so that only the changed
+    values are recorded.
+    """
+    for key, value in new.items():
+        old_value = old.get(key, old)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            properties_diff(old_value, value, path + [key], target, operations)
+        elif old_value is old or old_value != value:
+            operations.append(["set", target, path + [key], value])
+
+    for key in old.keys() - new.keys():
+        operations.append(["del", target, path + [key]])
+
+
+def apply_operations(session_dict, operations):
+    """Apply the given journal operations to a session dictionary."""
+    cues = {cue["id"]: cue for cue in session_dict.get("cues", ())}
+    session = session_dict.setdefault("session", {})
+
+    for operation in operations:
+        kind = operation[0]
+        if kind == "add":
+            cues[operation[1]["id"]] = operation[1]
+        elif kind == "remove":
+            cues.pop(operation[1], None)
+        elif kind in ("set", "del"):
+            target = session if operation[1] is None else cues.get(operation[1])
+            if target is None:
+                continue
+
+            *parents, key = operation[2]
+            for name in parents:
+                target = target.setdefault(name, {})
+                if not isinstance(target, dict):
+                    break
+            else:
+                if kind == "set":
+                    target[key] = operation[3]
+                else:
+                    target.pop(key, None)
+
+    # Cues are loaded one at a time, in order, so they must be sorted by
+    # their (possibly changed) index, cues without one are kept last
+    session_dict["cues"] = sorted(
+        cues.values(), key=lambda cue: cue.get("index", len(cues))
+    )
+
+
+class SessionJournal:
+    """Append-only log of the changes made to a session.
+
+    The journal is stored next to the session file, each line is a JSON
+    record, holding the property changes made by a single command:
+
+    * ``["set", cue_id, path, value]``, ``["del", cue_id, path]``: change
+      a (nested) property, `cue_id` is None for the session properties
+    * ``["add", properties]``, ``["remove", cue_id]``: add or remove a cue
+
+    Saving only appends a "saved" record, so it takes time proportional to
+    the changes, not to the session size. The records after the last
+    "saved" one are the unsaved changes, they're dropped when the session
+    is closed, but survive a crash, and can be recovered when loading.
+
+    Records are numbered, the session file stores the journal id and the
+    number of the last record included in it, so the journal can be
+    compacted (folded into the session file) at any time, without losing
+    records if the process is interrupted.
+    """
+
+    FILE_SUFFIX = ".journal"
+    VERSION = 1
+
+    def __init__(self, session_file, journal_id=None, seq=0):
+        self.session_file = session_file
+        self.id = journal_id or uuid4().hex
+        self.seq = seq
+        self.saved_seq = seq
+        self.base_seq = seq
+
+        self.unsaved = []
+        # Records (after the last "saved" one) found when loading
+
+        self.__records = []
+        # Records not yet compacted (seq, line)
+        self.__file = None
+        self.__saved_offset = 0
+        self.__loaded = False
+        self.__recovered = False
+
+        self.__session = None
+        self.__cue_model = None
+        self.__cues = {}
+        # cue -> (generation, properties) of the journaled cues
+        self.__session_state = (0, {})
+        self.__added = {}
+
+    @property
+    def file_path(self):
+        return self.session_file + self.FILE_SUFFIX
+
+    def meta(self, seq=None):
+        """Return the information to store in the session file.
+
+        :param seq: the last record included in the session file
+        """
+        return {"id": self.id, "seq": self.saved_seq if seq is None else seq}
+
+    def records_count(self):
+        """Number of records not yet compacted."""
+        return len(self.__records)
+
+    @classmethod
+    def load(cls, session_file, session_dict):
+        """Apply the saved journal records to the session dictionary.
+
+        Return None if the session is not journaled, the unsaved records
+        (if any) are not applied, they can be found in `unsaved`.
+
+        :rtype: SessionJournal | None
+        """
+        meta = session_dict.get("meta", {}).get("journal")
+        if not meta:
+            return None
+
+        journal = cls(session_file, meta["id"], meta["seq"])
+        journal.__loaded = True
+        try:
+            journal.__read(session_dict)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning(
+                f'Cannot read the session journal "{journal.file_path}"',
+                exc_info=True,
+            )
+
+        return journal
+
+    def recover(self, session_dict):
+        """Apply the unsaved records to the session dictionary.
+
+        The recovered changes are saved once the journal is attached.
+        """
+        operations = []
+        for record in self.unsaved:
+            operations.extend(record.get("ops", ()))
+
+        apply_operations(session_dict, operations)
+        self.unsaved.clear()
+        self.__recovered = True
+
+    def discard(self):
+        """Drop the unsaved records."""
+        self.unsaved.clear()
+        self.__records = [r for r in self.__records if r[0] <= self.saved_seq]
+
+    def attach(self, session):
+        """Start tracking the changes of the given session.
+
+        :type session: lisp.core.session.Session
+        """
+        self.__session = session
+        self.__cue_model = session.cue_model
+        self.__session_state = (
+            session.generation(),
+            self.__session_properties(),
+        )
+        self.__cues = {
+            cue: (
+                cue.generation(),
+                cue.properties(filter=filter_live_properties),
+            )
+            for cue in self.__cue_model
+        }
+
+        self.__cue_model.item_added.connect(self.__cue_added)
+        self.__cue_model.item_removed.connect(self.__cue_removed)
+
+        if self.__loaded:
+            # Re-write the journal, without the discarded records
+            self.rebase(self.base_seq)
+        if self.__recovered:
+            self.save()
+
+    def detach(self):
+        """Stop tracking the session, dropping the unsaved changes."""
+        if self.__cue_model is not None:
+            self.__cue_model.item_added.disconnect(self.__cue_added)
+            self.__cue_model.item_removed.disconnect(self.__cue_removed)
+
+        self.__session = None
+        self.__cue_model = None
+        self.__cues.clear()
+        self.__added.clear()
+
+        if self.__file is not None:
+            self.__file.truncate(self.__saved_offset)
+            self.__file.close()
+            self.__file = None
+
+    def commit(self):
+        """Append a record with the changes made since the last commit."""
+        if self.__session is None:
+            return
+
+        operations = []
+
+        # Only the objects with a different generation have been changed
+        generation = self.__session.generation()
+        if generation != self.__session_state[0]:
+            properties = self.__session_properties()
+            properties_diff(
+                self.__session_state[1], properties, [], None, operations
+            )
+            self.__session_state = (generation, properties)
+
+        for cue, (journaled, old_properties) in self.__cues.items():
+            generation = cue.generation()
+            if generation != journaled:
+                properties = cue.properties(filter=filter_live_properties)
+                properties_diff(
+                    old_properties, properties, [], cue.id, operations
+                )
+                self.__cues[cue] = (generation, properties)
+
+        for cue in self.__added.values():
+            properties = cue.properties(filter=filter_live_properties)
+            operations.append(["add", properties])
+            self.__cues[cue] = (cue.generation(), properties)
+        self.__added.clear()
+
+        if operations:
+            self.__append({"ops": operations})
+
+    def save(self):
+        """Mark the current changes as saved."""
+        self.commit()
+        self.saved_seq = self.__append({"saved": True})
+        self.__saved_offset = self.__file.tell() if self.__file else 0
+
+    def rebase(self, seq):
+        """Called when the session file has been written.
+
+        The records up to `seq` (included in the session file) are removed
+        from the journal, the file is re-written with the remaining ones.
+        """
+        self.base_seq = seq
+        self.__records = [r for r in self.__records if r[0] > seq]
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+        if self.__session is None:
+            # Detached, nothing to write anymore
+            return
+
+        temp_path = self.file_path + ".tmp"
+        try:
+            with open(temp_path, mode="wb") as file:
+                file.write(self.__header())
+                self.__saved_offset = file.tell()
+
+                for record_seq, line in self.__records:
+                    file.write(line)
+                    if record_seq <= self.saved_seq:
+                        self.__saved_offset = file.tell()
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, self.file_path)
+            self.__file = open(self.file_path, mode="ab")
+        except OSError:
+            logger.warning(
+                f'Cannot write the session journal "{self.file_path}"',
+                exc_info=True,
+            )
+
+    @classmethod
+    def delete(cls, session_file):
+        """Delete the journal of the given session file, if any."""
+        file_path = session_file + cls.FILE_SUFFIX
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning(
+                f'Cannot remove the session journal "{file_path}"',
+                exc_info=True,
+            )
+
+    def __session_properties(self):
+        properties = self.__session.properties()
+        properties.pop("session_file", None)
+        return properties
+
+    def __cue_added(self, cue):
+        self.__added[cue.id] = cue
+
+    def __cue_removed(self, cue):
+        if self.__added.pop(cue.id, None) is None:
+            self.__cues.pop(cue, None)
+            self.__append({"ops": [["remove", cue.id]]})
+
+    def __header(self):
+        header = {"journal": self.id, "version": self.VERSION}
+        return json.dumps(header).encode("utf-8") + b"\n"
+
+    def __append(self, record):
+        self.seq += 1
+        record["seq"] = self.seq
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        self.__records.append((self.seq, line))
+
+        # Before the session file is written there's no journal file,
+        # records are written once the journal is rebased
+        if self.__file is not None:
+            try:
+                self.__file.write(line)
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+            except OSError:
+                logger.warning(
+                    f'Cannot write the session journal "{self.file_path}"',
+                    exc_info=True,
+                )
+
+        return self.seq
+
+    def __read(self, session_dict):
+        operations = []
+
+        with open(self.file_path, mode="rb") as file:
+            header = json.loads(file.readline())
+            if (
+                header.get("journal") != self.id
+                or header.get("version") != self.VERSION
+            ):
+                logger.warning(
+                    f'Ignoring mismatching session journal "{self.file_path}"'
+                )
+                return
+
+            unsaved = []
+
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Incomplete record, written while crashing
+                    break
+
+                seq = record["seq"]
+                if seq <= self.base_seq:
+                    continue
+
+                self.seq = seq
+                self.__records.append((seq, line.rstrip(b"\n") + b"\n"))
+
+                if record.get("saved"):
+                    for unsaved_record in unsaved:
+                        operations.extend(unsaved_record.get("ops", ()))
+
+                    unsaved.clear()
+                    self.saved_seq = seq
+                else:
+                    unsaved.append(record)
+
+        apply_operations(session_dict, operations)
+        self.unsaved = unsaved
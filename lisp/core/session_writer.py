@@ -0,0 +1,198 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+from threading import Thread, Lock
+from weakref import WeakKeyDictionary
+
+from lisp.core.signal import Signal
+from lisp.core.util import filter_live_properties
+
+logger = logging.getLogger(__name__)
+
+PRETTY_OPTIONS = {"sort_keys": True, "indent": 4}
+MINIMAL_OPTIONS = {"separators": (",", ":")}
+
+
+class SessionSnapshot:
+    """The serialized content of a session, ready to be written.
+
+    Cues are stored as already encoded JSON fragments, the other sections
+    as plain dictionaries.
+    """
+
+    def __init__(self, meta, session, cues, minimal=False):
+        self.meta = meta
+        self.session = session
+        self.cues = cues
+        self.minimal = minimal
+
+    def chunks(self):
+        """Generate the encoded document, piece by piece.
+
+        The result is the same as encoding the whole session at once with
+        `json.dumps` (using the same options).
+        """
+        if self.minimal:
+            yield '{"meta":'
+            yield json.dumps(self.meta, **MINIMAL_OPTIONS)
+            yield ',"session":'
+            yield json.dumps(self.session, **MINIMAL_OPTIONS)
+            yield ',"cues":['
+            for index, cue in enumerate(self.cues):
+                if index:
+                    yield ","
+                yield cue
+            yield "]}"
+        else:
+            # Keys are sorted: "cues", "meta", "session"
+            yield '{\n    "cues": '
+            if self.cues:
+                yield "["
+                for index, cue in enumerate(self.cues):
+                    yield ",\n        " if index else "\n        "
+                    yield self.__indent(cue, 2)
+                yield "\n    ]"
+            else:
+                yield "[]"
+
+            yield ',\n    "meta": '
+            yield self.__indent(json.dumps(self.meta, **PRETTY_OPTIONS), 1)
+            yield ',\n    "session": '
+            yield self.__indent(json.dumps(self.session, **PRETTY_OPTIONS), 1)
+            yield "\n}"
+
+    @staticmethod
+    def __indent(fragment, level):
+        return fragment.replace("\n", "\n" + " " * (4 * level))
+
+
+class SessionWriter:
+    """Serialize and write sessions to file.
+
+    The encoded form of each cue is cached, and reused until the cue
+    properties change (see `HasProperties.is_dirty`), so that saving a big
+    session only re-encodes the modified cues.
+
+    The file is written by a background thread, to a temporary file which
+    replaces the destination only once completed, so a failure while
+    writing doesn't damage the previously saved session.
+    """
+
+    def __init__(self):
+        self.written = Signal()
+        # Emitted after a file is written (file_path, snapshot)
+        self.failed = Signal()
+        # Emitted if writing fails (file_path, snapshot)
+
+        self.__fragments = WeakKeyDictionary()
+        self.__thread = None
+        self.__lock = Lock()
+
+    def snapshot(self, meta, session, cues, minimal=False):
+        """Encode the session content, must be called from the main thread.
+
+        :param meta: the session metadata
+        :type meta: dict
+        :param session: the session properties
+        :type session: dict
+        :param cues: the session cues
+        :type cues: collections.abc.Iterable[lisp.cues.cue.Cue]
+        :param minimal: use a compact encoding instead of a readable one
+        :rtype: SessionSnapshot
+        """
+        return SessionSnapshot(
+            meta,
+            session,
+            [self.encode_cue(cue, minimal) for cue in cues],
+            minimal=minimal,
+        )
+
+    def encode_cue(self, cue, minimal=False):
+        """Return the encoded cue, re-encoding it only if changed."""
+        cached = self.__fragments.get(cue)
+        if cached is not None and cached[0] == minimal and not cue.is_dirty():
+            return cached[1]
+
+        # Cleared before reading the properties, so any change made while
+        # encoding is not lost
+        cue.clear_dirty()
+        fragment = json.dumps(
+            cue.properties(filter=filter_live_properties),
+            **(MINIMAL_OPTIONS if minimal else PRETTY_OPTIONS),
+        )
+
+        self.__fragments[cue] = (minimal, fragment)
+        return fragment
+
+    def invalidate(self):
+        """Drop all the cached cues."""
+        self.__fragments.clear()
+
+    def write(self, file_path, snapshot):
+        """Write the snapshot to the given file, in a background thread.
+
+        Writes are executed in order, one at the time.
+
+        :type file_path: str
+        :type snapshot: SessionSnapshot
+        """
+        with self.__lock:
+            previous = self.__thread
+            self.__thread = Thread(
+                target=self.__write,
+                args=(previous, file_path, snapshot),
+                name="SessionWriter",
+                daemon=True,
+            )
+            self.__thread.start()
+
+    def wait(self):
+        """Block until all the pending writes are completed."""
+        with self.__lock:
+            thread = self.__thread
+
+        if thread is not None:
+            thread.join()
+
+    def __write(self, previous, file_path, snapshot):
+        if previous is not None:
+            previous.join()
+
+        temp_path = file_path + ".tmp"
+        try:
+            with open(temp_path, mode="w", encoding="utf-8") as file:
+                for chunk in snapshot.chunks():
+                    file.write(chunk)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temp_path, file_path)
+        except Exception:
+            logger.exception(f'Cannot write the session to "{file_path}"')
+
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+            self.failed.emit(file_path, snapshot)
+        else:
+            self.written.emit(file_path, snapshot)
@@ -21,6 +21,7 @@ import traceback
 import weakref
 from enum import Enum
 from threading import RLock
+from time import perf_counter
 from types import MethodType, BuiltinMethodType
 
 from PyQt5.QtCore import QEvent, QObject
@@ -29,11 +30,39 @@ from PyQt5.QtWidgets import QApplication
 from lisp.core.decorators import async_function
 from lisp.core.util import weak_call_proxy
 
-__all__ = ["Signal", "Connection"]
+__all__ = ["Signal", "SignalStats", "Connection"]
 
 logger = logging.getLogger(__name__)
 
 
+# Cache of the slots arity {function: takes-no-arguments}, inspecting the
+# signature is slow, and the same functions are connected over and over
+_NoArgsFunctions = weakref.WeakKeyDictionary()
+_NoArgsMethods = weakref.WeakKeyDictionary()
+
+
+def slot_no_args(slot_callable):
+    """Return True if the given slot_callable takes no arguments."""
+    if isinstance(slot_callable, MethodType):
+        cache, key = _NoArgsMethods, slot_callable.__func__
+    else:
+        cache, key = _NoArgsFunctions, slot_callable
+
+    try:
+        return cache[key]
+    except (KeyError, TypeError):
+        pass
+
+    no_args = len(inspect.signature(slot_callable).parameters) == 0
+    try:
+        cache[key] = no_args
+    except TypeError:
+        # Not weak-referenceable
+        pass
+
+    return no_args
+
+
 def slot_id(slot_callable):
     """Return the id of the given slot_callable.
 
@@ -48,10 +77,55 @@ def slot_id(slot_callable):
         return id(slot_callable)
 
 
+class SignalStats:
+    """Emission statistics of a single signal.
+
+    Emissions and slot-call latency are only collected while the signal
+    instrumentation is enabled (see :meth:`Signal.set_instrumented`),
+    exceptions raised by slots are always counted.
+
+    For non-direct connections the latency is the time spent by the emitting
+    thread to dispatch the call, not the execution time of the slot.
+    """
+
+    __slots__ = ("emissions", "calls", "exceptions", "total_time", "max_time")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.emissions = 0
+        self.calls = 0
+        self.exceptions = 0
+        self.total_time = 0
+        self.max_time = 0
+
+    def mean_time(self):
+        """Mean slot-call latency, in seconds."""
+        if self.calls:
+            return self.total_time / self.calls
+
+        return 0
+
+    def _add_call(self, elapsed):
+        self.calls += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def __str__(self):
+        return (
+            f"emissions: {self.emissions}, calls: {self.calls}, "
+            f"exceptions: {self.exceptions}, "
+            f"mean: {self.mean_time() * 1000:.3f}ms, "
+            f"max: {self.max_time * 1000:.3f}ms"
+        )
+
+
 class Slot:
     """Synchronous slot."""
 
-    def __init__(self, slot_callable, callback=None):
+    def __init__(self, slot_callable, callback=None, stats=None):
         if isinstance(slot_callable, MethodType):
             self._reference = weakref.WeakMethod(slot_callable, self._expired)
         elif callable(slot_callable):
@@ -60,8 +134,9 @@ class Slot:
             raise TypeError("slot must be callable")
 
         self._callback = callback
+        self._stats = stats
         self._slot_id = slot_id(slot_callable)
-        self._no_args = len(inspect.signature(slot_callable).parameters) == 0
+        self._no_args = slot_no_args(slot_callable)
 
     def call(self, *args, **kwargs):
         """Call the callable object within the given parameters."""
@@ -72,6 +147,9 @@ class Slot:
                 else:
                     self._reference()(*args, **kwargs)
         except Exception as e:
+            if self._stats is not None:
+                self._stats.exceptions += 1
+
             logger.warning(str(e), exc_info=True)
 
     def is_alive(self):
@@ -88,7 +166,7 @@ class Slot:
 
 
 class AsyncSlot(Slot):
-    """Asynchronous slot, NOT queued, any call is performed in a new thread."""
+    """Asynchronous slot, any call is performed by a pooled worker thread."""
 
     @async_function
     def call(self, *args, **kwargs):
@@ -145,8 +223,8 @@ class Connection(Enum):
     QtDirect = QtSlot
     QtQueued = QtQueuedSlot
 
-    def new_slot(self, slot_callable, callback=None):
-        return self.value(slot_callable, callback)
+    def new_slot(self, slot_callable, callback=None, stats=None):
+        return self.value(slot_callable, callback, stats)
 
 
 class Signal:
@@ -156,6 +234,11 @@ class Signal:
     the connection can have different modes, any mode define the way a slot
     is called, those are defined in :class:`Connection`.
 
+    The connected slots are kept in an immutable snapshot, replaced on every
+    connect/disconnect, so that `emit` can iterate it without locking.
+    A slot disconnected while an emission is in progress might still receive
+    that (last) call.
+
     .. note::
         * Any slot can be connected only once to a specific signal,
           if reconnected, the previous connection is overridden.
@@ -171,9 +254,33 @@ class Signal:
         signal.connect(something_not_referenced)
     """
 
+    _instrumented = False
+
     def __init__(self):
         self.__slots = {}
+        self.__snapshot = ()
         self.__lock = RLock()
+        self.__stats = SignalStats()
+
+    @classmethod
+    def set_instrumented(cls, enabled):
+        """Enable/Disable the collection of emission statistics.
+
+        The setting is global, and affects all the signals.
+        """
+        cls._instrumented = bool(enabled)
+
+    @classmethod
+    def is_instrumented(cls):
+        return cls._instrumented
+
+    @property
+    def stats(self):
+        """The emission statistics of this signal.
+
+        :rtype: SignalStats
+        """
+        return self.__stats
 
     def connect(self, slot_callable, mode=Connection.Direct):
         """Connect the given slot, if not already connected.
@@ -190,13 +297,17 @@ class Signal:
             sid = slot_id(slot_callable)
             # If already connected do nothing
             if sid not in self.__slots:
+                slots = self.__slots.copy()
                 # Create a new Slot object, use a weakref for the callback
                 # to avoid cyclic references.
-                self.__slots[sid] = mode.new_slot(
+                slots[sid] = mode.new_slot(
                     slot_callable,
                     weak_call_proxy(weakref.WeakMethod(self.__remove_slot)),
+                    self.__stats,
                 )
 
+                self.__swap(slots)
+
     def disconnect(self, slot=None):
         """Disconnect the given slot, or all if no slot is specified.
 
@@ -206,17 +317,42 @@ class Signal:
             self.__remove_slot(slot_id(slot))
         else:
             with self.__lock:
-                self.__slots.clear()
+                self.__swap({})
 
     def emit(self, *args, **kwargs):
         """Emit the signal within the given arguments"""
-        with self.__lock:
-            for slot in self.__slots.values():
-                try:
-                    slot.call(*args, **kwargs)
-                except Exception:
-                    traceback.print_exc()
+        if self._instrumented:
+            self.__emit_instrumented(args, kwargs)
+            return
+
+        for slot in self.__snapshot:
+            try:
+                slot.call(*args, **kwargs)
+            except Exception:
+                traceback.print_exc()
+
+    def __emit_instrumented(self, args, kwargs):
+        self.__stats.emissions += 1
+
+        for slot in self.__snapshot:
+            start = perf_counter()
+            try:
+                slot.call(*args, **kwargs)
+            except Exception:
+                self.__stats.exceptions += 1
+                traceback.print_exc()
+            finally:
+                self.__stats._add_call(perf_counter() - start)
+
+    def __swap(self, slots):
+        # Must be called while holding the lock, the snapshot is replaced
+        # with a single (atomic) assignment
+        self.__slots = slots
+        self.__snapshot = tuple(slots.values())
 
     def __remove_slot(self, id_):
         with self.__lock:
-            self.__slots.pop(id_, None)
+            if id_ in self.__slots:
+                slots = self.__slots.copy()
+                del slots[id_]
+                self.__swap(slots)
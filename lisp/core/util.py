@@ -19,6 +19,7 @@ import functools
 import hashlib
 import re
 import socket
+import sys
 from collections.abc import Mapping, MutableMapping
 from enum import Enum
 from os import listdir
@@ -274,6 +275,30 @@ def file_hash(path, block_size=65536, **hasher_kwargs):
     return h.hexdigest()
 
 
+def deep_sizeof(obj, _seen=None):
+    """Estimate the memory used by an object, and the objects it contains.
+
+    Only the built-in containers (dict, list, tuple, set) are traversed,
+    objects referenced multiple times are counted once.
+    """
+    if _seen is None:
+        _seen = set()
+    elif id(obj) in _seen:
+        return 0
+
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, _seen) + deep_sizeof(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, _seen)
+
+    return size
+
+
 class EqEnum(Enum):
     """Value-comparable Enum.
 
@@ -0,0 +1,275 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+from threading import Condition, Lock, Thread, local
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPriority:
+    High = 0
+    Normal = 1
+    Low = 2
+
+
+class WorkerPoolStats:
+    """Statistics of a WorkerPool, times are in seconds."""
+
+    __slots__ = (
+        "submitted",
+        "completed",
+        "overflows",
+        "saturated",
+        "total_wait",
+        "max_wait",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.submitted = 0
+        self.completed = 0
+        self.overflows = 0
+        self.saturated = 0
+        self.total_wait = 0
+        self.max_wait = 0
+
+    def mean_wait(self):
+        if self.completed:
+            return self.total_wait / self.completed
+
+        return 0
+
+    def _add_wait(self, wait):
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    def __str__(self):
+        return (
+            f"submitted: {self.submitted}, completed: {self.completed}, "
+            f"overflows: {self.overflows}, saturated: {self.saturated}, "
+            f"mean wait: {self.mean_wait() * 1000:.3f}ms, "
+            f"max wait: {self.max_wait * 1000:.3f}ms"
+        )
+
+
+class _Task:
+    __slots__ = (
+        "fn",
+        "args",
+        "kwargs",
+        "priority",
+        "key",
+        "released",
+        "submitted",
+    )
+
+    def __init__(self, fn, args, kwargs, priority, key):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.released = False
+        self.submitted = monotonic()
+
+
+class WorkerPool:
+    """Bounded, priority-aware, pool of worker threads.
+
+    Tasks are executed by priority (see :class:`TaskPriority`), tasks with
+    the same priority are executed in submission order.
+
+    Tasks submitted with the same `key` are executed in submission order,
+    regardless of their priority, a keyed task is not handed to a worker
+    until the previous task with the same key has completed, or has
+    called `release_key` (e.g. before blocking, when the following tasks
+    can run concurrently).
+
+    Workers are created on demand, up to `max_workers`, and then kept alive.
+    Since tasks are allowed to block (e.g. waits and fades), when all the
+    workers are busy a temporary "overflow" worker is started right away,
+    up to `max_overflow`, overflow workers exit as soon as the queue is
+    empty. Once all the workers are busy, tasks wait in the queue, and are
+    dispatched by priority as soon as a worker is free.
+    """
+
+    def __init__(self, max_workers=16, max_overflow=32, name="WorkerPool"):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_overflow = max_overflow
+
+        self.__lock = Lock()
+        self.__work = Condition(self.__lock)
+
+        self.__queue = []
+        self.__keyed = {}
+        self.__counter = count()
+        self.__pending = 0
+        # The task executed by the current worker thread
+        self.__local = local()
+
+        self.__workers = 0
+        self.__idle = 0
+        self.__busy = 0
+
+        self.__stats = WorkerPoolStats()
+
+    @property
+    def stats(self):
+        """
+        :rtype: WorkerPoolStats
+        """
+        return self.__stats
+
+    def pending(self):
+        """Number of tasks waiting to be executed (queue depth)."""
+        return self.__pending
+
+    def workers(self):
+        """Number of workers currently alive."""
+        return self.__workers
+
+    def busy(self):
+        """Number of workers currently executing a task."""
+        return self.__busy
+
+    def submit(
+        self, fn, *args, priority=TaskPriority.Normal, key=None, **kwargs
+    ):
+        """Schedule `fn(*args, **kwargs)` to be executed by a worker.
+
+        :param priority: the task priority, see TaskPriority
+        :param key: tasks with the same key are never reordered, nor run
+                    concurrently (see `release_key`)
+        """
+        task = _Task(fn, args, kwargs, priority, key)
+
+        with self.__lock:
+            self.__stats.submitted += 1
+            self.__pending += 1
+
+            if key is not None:
+                waiting = self.__keyed.get(key)
+                if waiting is not None:
+                    # A task with the same key is already queued, or running
+                    waiting.append(task)
+                    return
+
+                self.__keyed[key] = deque()
+
+            self.__push(task)
+            self.__wakeup()
+
+    def release_key(self):
+        """Allow the next task with the key of the running one to start.
+
+        Must be called from a task of this pool, does nothing for tasks
+        without a key, or if already called.
+        """
+        task = getattr(self.__local, "task", None)
+        if task is not None:
+            with self.__lock:
+                self.__release(task)
+
+    def __release(self, task):
+        # Must be called while holding the lock
+        if task.key is None or task.released:
+            return
+
+        task.released = True
+        waiting = self.__keyed[task.key]
+        if waiting:
+            self.__push(waiting.popleft())
+            self.__wakeup()
+        else:
+            del self.__keyed[task.key]
+
+    def __wakeup(self):
+        # Must be called while holding the lock
+        if self.__idle > 0:
+            # Reserve an idle worker
+            self.__idle -= 1
+            self.__work.notify()
+        elif self.__workers < self.max_workers + self.max_overflow:
+            self.__start_worker(overflow=self.__workers >= self.max_workers)
+        else:
+            # The task is executed when a worker is free
+            self.__stats.saturated += 1
+
+    def __push(self, task):
+        heappush(self.__queue, (task.priority, next(self.__counter), task))
+
+    def __pop(self):
+        task = heappop(self.__queue)[2]
+        self.__pending -= 1
+
+        return task
+
+    def __start_worker(self, overflow=False):
+        self.__workers += 1
+        if overflow:
+            self.__stats.overflows += 1
+
+        Thread(
+            target=self.__worker,
+            args=(overflow,),
+            name=f"{self.name}-{'overflow' if overflow else self.__workers}",
+            daemon=True,
+        ).start()
+
+    def __worker(self, overflow):
+        self.__lock.acquire()
+        try:
+            while True:
+                while not self.__queue:
+                    if overflow:
+                        self.__workers -= 1
+                        return
+
+                    self.__idle += 1
+                    self.__work.wait()
+
+                task = self.__pop()
+                self.__busy += 1
+                wait = monotonic() - task.submitted
+
+                self.__local.task = task
+                self.__lock.release()
+                try:
+                    task.fn(*task.args, **task.kwargs)
+                except Exception:
+                    logger.exception(f"Exception in {self.name} task.")
+                finally:
+                    self.__local.task = None
+                    self.__lock.acquire()
+                    self.__release(task)
+                    self.__busy -= 1
+                    self.__stats.completed += 1
+                    self.__stats._add_wait(wait)
+        finally:
+            self.__lock.release()
+
+
+SharedWorkerPool = WorkerPool(name="SharedWorkerPool")
@@ -25,6 +25,15 @@ from lisp.core.properties import Property, WriteOnceProperty
 from lisp.core.rwait import RWait
 from lisp.core.signal import Signal
 from lisp.core.util import EqEnum, typename
+from lisp.core.worker_pool import SharedWorkerPool, TaskPriority
+
+
+def cue_key(cue, *args, **kwargs):
+    """Ordering key of the asynchronous cue actions, see `async_function`.
+
+    The cue `id` is used, unlike the object `id()`, it's never reused.
+    """
+    return cue.id
 
 
 class CueState:
@@ -63,6 +72,14 @@ class CueAction(EqEnum):
     LoopRelease = "LoopRelease"
 
 
+# The actions (values) that start a cue, e.g. to find the `target_cues`
+START_ACTIONS = (
+    CueAction.Default.value,
+    CueAction.Start.value,
+    CueAction.FadeInStart.value,
+)
+
+
 class CueNextAction(EqEnum):
     DoNothing = "DoNothing"
     TriggerAfterWait = "TriggerAfterWait"
@@ -260,7 +277,7 @@ class Cue(HasProperties):
             type_class, self.app.conf.get("cue.fadeActionType"), default
         )
 
-    @async_function
+    @async_function(key=cue_key)
     def start(self, fade=False):
         """Start the cue."""
 
@@ -280,8 +297,10 @@ class Cue(HasProperties):
                 CueState.IsStopped | CueState.PreWait_Pause
             ):
                 self._state = CueState.PreWait
-                # Start the wait, the lock is released during the wait and
+                # The other actions of this cue (e.g. stop) can run while
+                # waiting, the lock is released during the wait and
                 # re-acquired after
+                SharedWorkerPool.release_key()
                 if not self._prewait.wait(self.pre_wait, lock=self._st_lock):
                     # PreWait interrupted, check the state to be correct
                     if self._state & CueState.PreWait:
@@ -311,6 +330,7 @@ class Cue(HasProperties):
                 ):
                     self._state |= CueState.PostWait
 
+                    SharedWorkerPool.release_key()
                     if self._postwait.wait(self.post_wait, lock=self._st_lock):
                         # PostWait ended
                         self._state ^= CueState.PostWait
@@ -350,7 +370,7 @@ class Cue(HasProperties):
         """
         return False
 
-    @async_function
+    @async_function(priority=TaskPriority.High, key=cue_key)
     def stop(self, fade=False):
         """Stop the cue."""
 
@@ -406,7 +426,7 @@ class Cue(HasProperties):
         """
         return False
 
-    @async_function
+    @async_function(priority=TaskPriority.High, key=cue_key)
     def pause(self, fade=False):
         """Pause the cue."""
 
@@ -460,7 +480,7 @@ class Cue(HasProperties):
         """
         return False
 
-    @async_function
+    @async_function(priority=TaskPriority.High, key=cue_key)
     def interrupt(self, fade=False):
         """Interrupt the cue.
 
@@ -560,6 +580,16 @@ class Cue(HasProperties):
         """
         return 0
 
+    def target_cues(self):
+        """Return the cues that could be started when this cue is executed.
+
+        Used to get the cues ready before they are needed, e.g. the cues
+        this cue executes with one of the `START_ACTIONS`.
+
+        :rtype: typing.Iterable[Cue]
+        """
+        return ()
+
     def prewait_time(self):
         return self._prewait.current_time()
 
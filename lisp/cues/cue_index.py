@@ -0,0 +1,346 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+from bisect import bisect_left, insort
+from itertools import chain, count
+from threading import RLock
+
+from lisp.cues.cue import Cue, CueState
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# The single-bit flags composing a cue state
+_STATE_FLAGS = (
+    CueState.Error,
+    CueState.Stop,
+    CueState.Running,
+    CueState.Pause,
+    CueState.PreWait,
+    CueState.PostWait,
+    CueState.PreWait_Pause,
+    CueState.PostWait_Pause,
+)
+
+
+def search_tokens(text):
+    """Split the text in (case-insensitive) search tokens.
+
+    :rtype: tuple[str]
+    """
+    return tuple(_TOKEN_RE.findall(text.casefold()))
+
+
+class CueIndex:
+    """Secondary indexes over a set of cues, updated incrementally.
+
+    Cues are indexed by:
+        * class, to retrieve the cues of a given type (and subtypes)
+        * state flags, as reported by the cues status signals
+        * name tokens, to search the cues by name (token prefixes)
+
+    The indexes are updated on add/remove, and by the cues signals, so the
+    lookups never scan all the cues. Cues are returned in insertion order,
+    as when iterating the model, except for `search`.
+
+    The state is updated when one of the status signals (started, stopped,
+    paused, interrupted, error, end) is emitted, as for `RunningCueModel`,
+    so the pre/post-wait flags are reported only with those.
+    """
+
+    def __init__(self):
+        self.__lock = RLock()
+        self.__generation = 0
+
+        self.__cues = {}
+        # {cue_id: cue}
+        self.__counter = count()
+        self.__positions = {}
+        # {cue_id: insertion position}
+        self.__classes = {}
+        # {class: {cue_id: cue}}
+        self.__class_cache = {}
+        # {filter_class: (class, ...)}
+        self.__states = {}
+        # {cue_id: state}
+        self.__flags = {flag: {} for flag in _STATE_FLAGS}
+        # {state_flag: {cue_id: cue}}
+        self.__names = {}
+        # {cue_id: frozenset(token, ...)}
+        self.__tokens = {}
+        # {token: {cue_id, ...}}
+        self.__sorted_tokens = []
+        # The keys of `__tokens`, sorted, for prefix lookups
+
+    def generation(self):
+        """Return a number that changes when cues, names or indexes change."""
+        return self.__generation
+
+    def add(self, cue):
+        # Properties access is not free, read the id only once
+        cue_id = cue.id
+        with self.__lock:
+            self.__cues[cue_id] = cue
+            self.__positions[cue_id] = next(self.__counter)
+
+            bucket = self.__classes.get(type(cue))
+            if bucket is None:
+                bucket = self.__classes[type(cue)] = {}
+                self.__class_cache.clear()
+            bucket[cue_id] = cue
+
+            self.__set_state(cue_id, cue, cue.state)
+            self.__set_name(cue_id, cue.name)
+            self.__generation += 1
+
+        cue.property_changed.connect(self.__property_changed)
+        cue.started.connect(self.__state_changed)
+        cue.stopped.connect(self.__state_changed)
+        cue.paused.connect(self.__state_changed)
+        cue.interrupted.connect(self.__state_changed)
+        cue.error.connect(self.__state_changed)
+        cue.end.connect(self.__state_changed)
+
+    def remove(self, cue):
+        cue.property_changed.disconnect(self.__property_changed)
+        cue.started.disconnect(self.__state_changed)
+        cue.stopped.disconnect(self.__state_changed)
+        cue.paused.disconnect(self.__state_changed)
+        cue.interrupted.disconnect(self.__state_changed)
+        cue.error.disconnect(self.__state_changed)
+        cue.end.disconnect(self.__state_changed)
+
+        cue_id = cue.id
+        with self.__lock:
+            self.__cues.pop(cue_id, None)
+            self.__positions.pop(cue_id, None)
+
+            bucket = self.__classes.get(type(cue), {})
+            bucket.pop(cue_id, None)
+            if not bucket:
+                self.__classes.pop(type(cue), None)
+                self.__class_cache.clear()
+
+            self.__set_state(cue_id, cue, CueState.Invalid)
+            self.__states.pop(cue_id, None)
+            self.__set_name(cue_id, None)
+            self.__generation += 1
+
+    def clear(self):
+        for cue in tuple(self.__cues.values()):
+            self.remove(cue)
+
+    def filter(self, cue_class=Cue):
+        """Return the cues that are instances of the given class.
+
+        :rtype: list[Cue]
+        """
+        with self.__lock:
+            classes = self.__class_cache.get(cue_class)
+            if classes is None:
+                classes = self.__class_cache[cue_class] = tuple(
+                    cls for cls in self.__classes if issubclass(cls, cue_class)
+                )
+
+            if len(classes) == len(self.__classes):
+                return list(self.__cues.values())
+            if len(classes) == 1:
+                return list(self.__classes[classes[0]].values())
+
+            # Each bucket is in insertion order, but not their union
+            return self.__in_order(
+                chain.from_iterable(self.__classes[cls] for cls in classes)
+            )
+
+    def in_state(self, state):
+        """Return the cues with (at least) one of the given state flags.
+
+        :param state: a state, or a combination, e.g. `CueState.IsRunning`
+        :rtype: list[Cue]
+        """
+        with self.__lock:
+            cues = {}
+            for flag in _STATE_FLAGS:
+                if state & flag:
+                    cues.update(self.__flags[flag])
+
+            return self.__in_order(cues)
+
+    def search(self, query):
+        """Return the cues with a name matching all the query tokens.
+
+        Each query token must be a prefix of one of the name tokens,
+        an empty query matches all the cues.
+
+        :param query: the query tokens, see `search_tokens`
+        :type query: tuple[str]
+        :rtype: list[Cue]
+        """
+        with self.__lock:
+            if not query:
+                return list(self.__cues.values())
+
+            found = None
+            # Start from the longest prefix, it's likely the most selective
+            for prefix in sorted(set(query), key=len, reverse=True):
+                ids = self.__prefix_ids(prefix)
+                found = ids if found is None else found & ids
+                if not found:
+                    return []
+
+            return [self.__cues[cue_id] for cue_id in found]
+
+    def __in_order(self, ids):
+        # The cues with the given ids, in insertion order
+        cues = self.__cues
+        return [
+            cues[cue_id]
+            for cue_id in sorted(ids, key=self.__positions.__getitem__)
+        ]
+
+    def __prefix_ids(self, prefix):
+        ids = set()
+        tokens = self.__sorted_tokens
+        index = bisect_left(tokens, prefix)
+        while index < len(tokens) and tokens[index].startswith(prefix):
+            ids.update(self.__tokens[tokens[index]])
+            index += 1
+
+        return ids
+
+    def __set_state(self, cue_id, cue, state):
+        old_state = self.__states.get(cue_id, CueState.Invalid)
+        self.__states[cue_id] = state
+
+        changed = old_state ^ state
+        for flag in _STATE_FLAGS:
+            if changed & flag:
+                if state & flag:
+                    self.__flags[flag][cue_id] = cue
+                else:
+                    self.__flags[flag].pop(cue_id, None)
+
+    def __set_name(self, cue_id, name):
+        old_tokens = self.__names.pop(cue_id, frozenset())
+        new_tokens = frozenset(search_tokens(name) if name is not None else ())
+
+        for token in old_tokens - new_tokens:
+            ids = self.__tokens[token]
+            ids.discard(cue_id)
+            if not ids:
+                del self.__tokens[token]
+                del self.__sorted_tokens[
+                    bisect_left(self.__sorted_tokens, token)
+                ]
+
+        for token in new_tokens - old_tokens:
+            ids = self.__tokens.get(token)
+            if ids is None:
+                ids = self.__tokens[token] = set()
+                insort(self.__sorted_tokens, token)
+            ids.add(cue_id)
+
+        if name is not None:
+            self.__names[cue_id] = new_tokens
+
+    def __state_changed(self, cue):
+        cue_id = cue.id
+        with self.__lock:
+            if cue_id in self.__cues:
+                self.__set_state(cue_id, cue, cue.state)
+
+    def __property_changed(self, cue, name, value):
+        if name == "name":
+            cue_id = cue.id
+            with self.__lock:
+                if cue_id in self.__cues:
+                    self.__set_name(cue_id, value)
+                    self.__generation += 1
+        elif name == "index":
+            # The cue has been moved (e.g. by the layout model), the order
+            # of the previous search results is not valid anymore
+            with self.__lock:
+                self.__generation += 1
+
+
+class CueSearch:
+    """Incremental search of cues by name, to be updated as the user types.
+
+    When the new query only refines the previous one (e.g. a character is
+    appended), and the indexed cues are not changed (or moved), only the
+    changed tokens are looked up, and the previous results are filtered
+    (keeping the order).
+
+    Results are sorted by the cues index.
+    """
+
+    def __init__(self, index, cue_class=Cue):
+        """
+        :type index: CueIndex
+        """
+        self.__index = index
+        self.__cue_class = cue_class
+        self.__query = None
+        self.__generation = None
+        self.__results = []
+
+    def update(self, text):
+        """Search the cues matching the given text.
+
+        :rtype: list[Cue]
+        """
+        query = search_tokens(text)
+        if query == self.__query and self.__is_valid():
+            return list(self.__results)
+
+        if self.__refines(query) and self.__is_valid():
+            changed = query[len(self.__query) :] + tuple(
+                new for old, new in zip(self.__query, query) if new != old
+            )
+            found = set(self.__index.search(changed))
+            self.__results = [cue for cue in self.__results if cue in found]
+        else:
+            self.__generation = self.__index.generation()
+            self.__results = sorted(
+                (
+                    cue
+                    for cue in self.__index.search(query)
+                    if isinstance(cue, self.__cue_class)
+                ),
+                key=lambda cue: cue.index,
+            )
+
+        self.__query = query
+        return list(self.__results)
+
+    def results(self):
+        """Return the results of the last update.
+
+        :rtype: list[Cue]
+        """
+        return list(self.__results)
+
+    def __is_valid(self):
+        return self.__generation == self.__index.generation()
+
+    def __refines(self, query):
+        # Every cue matching the new query must match the previous one
+        # (an empty query matches everything, looking up the index is faster)
+        if not self.__query or len(query) < len(self.__query):
+            return False
+
+        return all(new.startswith(old) for old, new in zip(self.__query, query))
@@ -17,6 +17,7 @@
 
 from lisp.core.model import Model
 from lisp.cues.cue import Cue, CueAction
+from lisp.cues.cue_index import CueIndex, CueSearch
 
 
 class CueModel(Model):
@@ -24,33 +25,58 @@ class CueModel(Model):
 
     The model can be iterated to retrieve the cues, to get id-cue pairs
     use the items() function, to get only the id(s) use the keys() function.
+
+    Secondary indexes (by class, state and name) are kept up to date, to find
+    cues without scanning the whole model, see `filter`, `in_state` and
+    `search`.
     """
 
     def __init__(self):
         super().__init__()
         self.__cues = {}
+        self.__index = CueIndex()
 
     def add(self, cue):
-        if cue.id in self.__cues:
-            raise ValueError("the cue is already in the model")
+        self.add_many((cue,))
+
+    def add_many(self, cues):
+        cues = tuple(cues)
+        for cue in cues:
+            if cue.id in self.__cues:
+                raise ValueError("the cue is already in the model")
+
+        for cue in cues:
+            self.__cues[cue.id] = cue
+            self.__index.add(cue)
 
-        self.__cues[cue.id] = cue
-        self.item_added.emit(cue)
+        for cue in cues:
+            self.item_added.emit(cue)
+
+        self.items_added.emit(cues)
 
     def remove(self, cue):
         self.pop(cue.id)
 
+    def remove_many(self, cues):
+        cues = tuple(cues)
+        for cue in cues:
+            if cue.id not in self.__cues:
+                raise KeyError(cue.id)
+
+        for cue in cues:
+            self.__pop(cue.id)
+
+        for cue in cues:
+            self.item_removed.emit(cue)
+
+        self.items_removed.emit(cues)
+
     def pop(self, cue_id):
         """:rtype: Cue"""
-        cue = self.__cues.pop(cue_id)
-
-        # Try to interrupt/stop the cue
-        if CueAction.Interrupt in cue.CueActions:
-            cue.interrupt()
-        elif CueAction.Stop in cue.CueActions:
-            cue.stop()
+        cue = self.__pop(cue_id)
 
         self.item_removed.emit(cue)
+        self.items_removed.emit((cue,))
 
         return cue
 
@@ -71,13 +97,49 @@ class CueModel(Model):
 
     def reset(self):
         self.__cues.clear()
+        self.__index.clear()
         self.model_reset.emit()
 
     def filter(self, cue_class=Cue):
         """Return an iterator over cues that are instances of the given class"""
-        for cue in self.__cues.values():
-            if isinstance(cue, cue_class):
-                yield cue
+        return iter(self.__index.filter(cue_class))
+
+    def in_state(self, state):
+        """Return an iterator over cues with (one of) the given state flags.
+
+        :param state: a CueState value, or a combination, e.g. IsRunning
+        """
+        return iter(self.__index.in_state(state))
+
+    def search(self, text, cue_class=Cue):
+        """Return the cues with a name matching the given text, by index.
+
+        Each word in the text must be the prefix of a word in the cue name,
+        ignoring the case. To update the results as the user types use
+        `searcher()`.
+
+        :rtype: list[Cue]
+        """
+        return CueSearch(self.__index, cue_class).update(text)
+
+    def searcher(self, cue_class=Cue):
+        """Return an incremental search over the model cues.
+
+        :rtype: CueSearch
+        """
+        return CueSearch(self.__index, cue_class)
+
+    def __pop(self, cue_id):
+        cue = self.__cues.pop(cue_id)
+        self.__index.remove(cue)
+
+        # Try to interrupt/stop the cue
+        if CueAction.Interrupt in cue.CueActions:
+            cue.interrupt()
+        elif CueAction.Stop in cue.CueActions:
+            cue.stop()
+
+        return cue
 
     def __iter__(self):
         return self.__cues.values().__iter__()
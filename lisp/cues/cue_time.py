@@ -18,12 +18,39 @@
 from enum import IntEnum
 from weakref import WeakValueDictionary
 
-from lisp.core.clock import Clock_33
+from lisp.core.clock import Clock_33, MasterClock
 from lisp.core.decorators import locked_method
 from lisp.core.signal import Connection, Signal
 from lisp.cues.cue import CueState
 
 
+class _CurrentTimeCache:
+    """Query the cues current-time at most once per clock tick.
+
+    Different `CueTime` objects (e.g. with different clocks) for the same cue,
+    notified during the same `MasterClock` tick, will share a single query.
+    """
+
+    def __init__(self):
+        self._tick = -1
+        self._times = {}
+
+    def current_time(self, cue):
+        tick = MasterClock().ticks
+        if tick != self._tick:
+            self._tick = tick
+            self._times.clear()
+
+        time = self._times.get(cue.id)
+        if time is None:
+            time = self._times[cue.id] = cue.current_time()
+
+        return time
+
+
+_CueTimeCache = _CurrentTimeCache()
+
+
 class MetaCueTime(type):
     """Allow "caching" of CueTime(s) objects."""
 
@@ -43,7 +70,8 @@ class CueTime(metaclass=MetaCueTime):
     """Provide timing for a Cue.
 
     Once created the notify signal provide timing for the given cue.
-    The current time is queried using `Cue.current_time()`.
+    The current time is queried using `Cue.current_time()`, at most once
+    per clock tick for all the CueTime(s) of the same cue.
 
     .. note::
         The notify signal is emitted only when the cue is running.
@@ -86,7 +114,7 @@ class CueTime(metaclass=MetaCueTime):
     def __notify(self):
         """Notify the cue current-time"""
         if self._cue.state & (CueState.Running ^ CueState.Pause):
-            self.notify.emit(self._cue.current_time())
+            self.notify.emit(_CueTimeCache.current_time(self._cue))
 
     def start(self):
         self._clock.add_callback(self.__notify)
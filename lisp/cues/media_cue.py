@@ -22,7 +22,8 @@ from PyQt5.QtCore import QT_TRANSLATE_NOOP
 from lisp.core.decorators import async_function
 from lisp.core.fade_functions import FadeInType, FadeOutType
 from lisp.core.properties import Property
-from lisp.cues.cue import Cue, CueAction, CueState
+from lisp.core.worker_pool import SharedWorkerPool
+from lisp.cues.cue import Cue, CueAction, CueState, cue_key
 
 
 class MediaCue(Cue):
@@ -101,6 +102,7 @@ class MediaCue(Cue):
 
             if fade and self._state & CueState.Running and self._can_fade():
                 self._st_lock.release()
+                SharedWorkerPool.release_key()
                 ended = self.__fadeout(
                     self.fadeout_duration,
                     0,
@@ -122,6 +124,7 @@ class MediaCue(Cue):
 
             if fade and self._state & CueState.Running and self._can_fade():
                 self._st_lock.release()
+                SharedWorkerPool.release_key()
                 ended = self.__fadeout(
                     self.fadeout_duration,
                     0,
@@ -144,7 +147,7 @@ class MediaCue(Cue):
 
         self.media.stop()
 
-    @async_function
+    @async_function(key=cue_key)
     def fadein(self, duration, fade_type):
         if not self._st_lock.acquire(timeout=0.1):
             return
@@ -156,6 +159,7 @@ class MediaCue(Cue):
                 self.__volume.live_volume = self.__volume.volume
             else:
                 self._st_lock.release()
+                SharedWorkerPool.release_key()
                 self.__fadein(duration, self.__volume.volume, fade_type)
                 return
 
@@ -164,7 +168,7 @@ class MediaCue(Cue):
     def loop_release(self):
         self.media.loop_release()
 
-    @async_function
+    @async_function(key=cue_key)
     def fadeout(self, duration, fade_type):
         if not self._st_lock.acquire(timeout=0.1):
             return
@@ -176,6 +180,7 @@ class MediaCue(Cue):
                 self.__volume.live_volume = 0
             else:
                 self._st_lock.release()
+                SharedWorkerPool.release_key()
                 self.__fadeout(duration, 0, fade_type)
                 return
 
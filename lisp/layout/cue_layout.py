@@ -51,6 +51,7 @@ class CueLayout(HasProperties):
         self.all_executed = Signal()  # After execute_all is called
 
         self.key_pressed = Signal()  # After a key is pressed
+        self.standby_changed = Signal()  # After the standby cue changes
 
     @property
     def cue_model(self):
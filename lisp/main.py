@@ -16,12 +16,14 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import argparse
+import atexit
 import logging
 import os
 import signal
 import sys
 from functools import partial
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 from PyQt5.QtCore import QLocale, QLibraryInfo, QTimer
 from PyQt5.QtGui import QIcon
@@ -30,6 +32,7 @@ from PyQt5.QtWidgets import QApplication
 from lisp import app_dirs, DEFAULT_APP_CONFIG, USER_APP_CONFIG, plugins
 from lisp.application import Application
 from lisp.core.configuration import JSONFileConfiguration
+from lisp.core.fingerprint import FingerprintIndex
 from lisp.ui import themes
 from lisp.ui.icons import IconTheme
 from lisp.ui.ui_utils import install_translation, PyQtUnixSignalHandler
@@ -100,7 +103,14 @@ def main():
         backupCount=5,
     )
     file_handler.setFormatter(default_formatter)
-    root_logger.addHandler(file_handler)
+    # Write the file from a separate thread, so that logging doesn't block
+    # the caller on disk I/O
+    file_queue = SimpleQueue()
+    file_listener = QueueListener(file_queue, file_handler)
+    file_listener.start()
+    # On exit, wait for the queued records to be written
+    atexit.register(file_listener.stop)
+    root_logger.addHandler(QueueHandler(file_queue))
 
     # Load application configuration
     app_conf = JSONFileConfiguration(USER_APP_CONFIG, DEFAULT_APP_CONFIG)
@@ -171,6 +181,8 @@ def main():
         # Finalize all and exit
         plugins.finalize_plugins()
         lisp_app.finalize()
+        # Save the file hashes computed since the last (deferred) save
+        FingerprintIndex.flush_all()
 
     sys.exit(exit_code)
 
@@ -30,7 +30,7 @@ from PyQt5.QtWidgets import (
 
 from lisp.application import Application
 from lisp.core.properties import Property
-from lisp.cues.cue import Cue, CueAction
+from lisp.cues.cue import Cue, CueAction, START_ACTIONS
 from lisp.ui.cuelistdialog import CueSelectDialog
 from lisp.ui.qdelegates import CueActionDelegate, CueSelectionDelegate
 from lisp.ui.qmodels import CueClassRole, SimpleCueListModel
@@ -57,6 +57,13 @@ class CollectionCue(Cue):
 
         return False
 
+    def target_cues(self):
+        for target_id, action in self.targets:
+            if action in START_ACTIONS:
+                cue = self.app.cue_model.get(target_id)
+                if cue is not None and cue is not self:
+                    yield cue
+
 
 class CollectionCueSettings(SettingsPage):
     Name = QT_TRANSLATE_NOOP("SettingsPageName", "Edit Collection")
@@ -68,6 +75,7 @@ class CollectionCueSettings(SettingsPage):
         self.cueDialog = CueSelectDialog(
             cues=Application().cue_model,
             selection_mode=QAbstractItemView.ExtendedSelection,
+            search=Application().cue_model.searcher(),
         )
         self.collectionModel = CollectionModel()
 
@@ -28,7 +28,7 @@ from PyQt5.QtWidgets import (
 
 from lisp.application import Application
 from lisp.core.properties import Property
-from lisp.cues.cue import Cue, CueAction
+from lisp.cues.cue import Cue, CueAction, START_ACTIONS
 from lisp.ui.settings.cue_settings import CueSettingsRegistry
 from lisp.ui.settings.pages import SettingsPage
 from lisp.ui.ui_utils import translate
@@ -48,6 +48,19 @@ class IndexActionCue(Cue):
         self.name = translate("CueName", self.Name)
 
     def __start__(self, fade=False):
+        cue = self.__target()
+        if cue is not None:
+            cue.execute(CueAction(self.action))
+
+    def target_cues(self):
+        if self.action in START_ACTIONS:
+            cue = self.__target()
+            if cue is not None:
+                return (cue,)
+
+        return ()
+
+    def __target(self):
         if self.relative:
             index = self.index + self.target_index
         else:
@@ -56,7 +69,7 @@ class IndexActionCue(Cue):
         try:
             cue = self.app.layout.cue_at(index)
             if cue is not self:
-                cue.execute(CueAction(self.action))
+                return cue
         except IndexError:
             pass
 
@@ -66,7 +66,9 @@ class SeekCueSettings(SettingsPage):
         self.targetCueId = -1
 
         self.cueDialog = CueSelectDialog(
-            cues=Application().cue_model.filter(MediaCue), parent=self
+            cues=Application().cue_model.filter(MediaCue),
+            search=Application().cue_model.searcher(MediaCue),
+            parent=self,
         )
 
         self.cueGroup = QGroupBox(self)
@@ -137,7 +137,11 @@ class VolumeSettings(SettingsPage):
         self.cue_id = -1
 
         cues = Application().cue_model.filter(MediaCue)
-        self.cueDialog = CueSelectDialog(cues=cues, parent=self)
+        self.cueDialog = CueSelectDialog(
+            cues=cues,
+            search=Application().cue_model.searcher(MediaCue),
+            parent=self,
+        )
 
         self.cueGroup = QGroupBox(self)
         self.cueGroup.setLayout(QVBoxLayout())
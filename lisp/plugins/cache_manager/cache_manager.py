@@ -15,6 +15,7 @@ from PyQt5.QtWidgets import (
 )
 
 from lisp import DEFAULT_CACHE_DIR
+from lisp.core.fingerprint import FingerprintIndex
 from lisp.core.plugin import Plugin
 from lisp.core.signal import Signal, Connection
 from lisp.plugins import get_plugin
@@ -41,6 +42,23 @@ class CacheManager(Plugin):
         )
         Thread(target=self._check_cache_size).start()
 
+        self._update_sampled_threshold()
+        CacheManager.Config.changed.connect(self.__config_change)
+        CacheManager.Config.updated.connect(self.__config_update)
+
+    def __config_change(self, key, _):
+        if key == "sampledHashThreshold":
+            self._update_sampled_threshold()
+
+    def __config_update(self, diff):
+        for key, value in diff.items():
+            self.__config_change(key, value)
+
+    def _update_sampled_threshold(self):
+        FingerprintIndex.sampled_threshold = (
+            self.Config.get("sampledHashThreshold", 0) * 1_000_000
+        )
+
     def _check_cache_size(self):
         threshold = self.Config.get("sizeWarningThreshold", 0) * 1_000_000
         if threshold > 0:
@@ -69,6 +87,12 @@ class CacheManager(Plugin):
 
         return Path(cache_dir)
 
+    def fingerprint_index(self):
+        """
+        :rtype: FingerprintIndex
+        """
+        return FingerprintIndex.get(self.cache_root())
+
     def cache_size(self):
         """This could take some time if we have a lot of files."""
         return sum(
@@ -89,6 +113,8 @@ class CacheManager(Plugin):
                 elif entry.is_file():
                     os.remove(entry)
 
+        self.fingerprint_index().clear()
+
     def _remove_dir_content(self, path: Path):
         for entry in path.iterdir():
             if entry.is_file() and not entry.is_symlink():
@@ -117,6 +143,27 @@ class CacheManagerSettings(SettingsPage):
         self.warningGroup.layout().setStretch(0, 3)
         self.warningGroup.layout().setStretch(1, 1)
 
+        self.fingerprintGroup = QGroupBox(self)
+        self.fingerprintGroup.setLayout(QVBoxLayout())
+        self.layout().addWidget(self.fingerprintGroup)
+
+        self.sampledHashLayout = QHBoxLayout()
+        self.fingerprintGroup.layout().addLayout(self.sampledHashLayout)
+
+        self.sampledHashLabel = QLabel(self.fingerprintGroup)
+        self.sampledHashLayout.addWidget(self.sampledHashLabel)
+
+        self.sampledHashSpin = QSpinBox(self.fingerprintGroup)
+        self.sampledHashSpin.setRange(0, 100000)
+        self.sampledHashLayout.addWidget(self.sampledHashSpin)
+
+        self.sampledHashLayout.setStretch(0, 3)
+        self.sampledHashLayout.setStretch(1, 1)
+
+        self.fingerprintStatsLabel = QLabel(self.fingerprintGroup)
+        self.fingerprintStatsLabel.setAlignment(Qt.AlignCenter)
+        self.fingerprintGroup.layout().addWidget(self.fingerprintStatsLabel)
+
         self.cleanGroup = QGroupBox(self)
         self.cleanGroup.setLayout(QVBoxLayout())
         self.layout().addWidget(self.cleanGroup)
@@ -133,6 +180,7 @@ class CacheManagerSettings(SettingsPage):
 
         self.cacheManager = get_plugin("CacheManager")
         self.updateCacheSize()
+        self.updateFingerprintStats()
 
     def retranslateUi(self):
         self.warningGroup.setTitle(
@@ -142,6 +190,16 @@ class CacheManagerSettings(SettingsPage):
             translate("CacheManager", "Warning threshold in MB (0 = disabled)")
         )
 
+        self.fingerprintGroup.setTitle(
+            translate("CacheManager", "Files fingerprint")
+        )
+        self.sampledHashLabel.setText(
+            translate(
+                "CacheManager",
+                "Partially hash files bigger than (MB, 0 = disabled)",
+            )
+        )
+
         self.cleanGroup.setTitle(translate("CacheManager", "Cache cleanup"))
         self.cleanButton.setText(
             translate("CacheManager", "Delete the cache content")
@@ -149,15 +207,28 @@ class CacheManagerSettings(SettingsPage):
 
     def loadSettings(self, settings):
         self.warningThresholdSpin.setValue(settings.get("sizeWarningThreshold"))
+        self.sampledHashSpin.setValue(settings.get("sampledHashThreshold", 0))
 
     def getSettings(self):
-        return {"sizeWarningThreshold": self.warningThresholdSpin.value()}
+        return {
+            "sizeWarningThreshold": self.warningThresholdSpin.value(),
+            "sampledHashThreshold": self.sampledHashSpin.value(),
+        }
 
     def updateCacheSize(self):
         self.currentSizeLabel.setText(
             humanize.naturalsize(self.cacheManager.cache_size())
         )
 
+    def updateFingerprintStats(self):
+        index = self.cacheManager.fingerprint_index()
+        self.fingerprintStatsLabel.setText(
+            translate(
+                "CacheManager", "Index lookups: {} hits, {} misses"
+            ).format(index.hits, index.misses)
+        )
+
     def cleanCache(self):
         self.cacheManager.purge()
         self.updateCacheSize()
+        self.updateFingerprintStats()
@@ -35,6 +35,7 @@ from lisp.cues.cue_time import CueTime
 from lisp.cues.media_cue import MediaCue
 from lisp.plugins.cart_layout.page_widget import CartPageWidget
 from lisp.ui.icons import IconTheme
+from lisp.ui.meters import MeterService
 from lisp.ui.widgets import QClickLabel, QClickSlider, DBMeter
 
 
@@ -55,7 +56,6 @@ class CueWidget(QWidget):
         self._showDBMeter = False
         self._showVolume = False
 
-        self._dBMeterElement = None
         self._volumeElement = None
         self._fadeElement = None
 
@@ -178,16 +178,12 @@ class CueWidget(QWidget):
         if isinstance(self._cue, MediaCue):
             self._showDBMeter = visible
 
-            if self._dBMeterElement is not None:
-                self._dBMeterElement.level_ready.disconnect(self.dbMeter.plot)
-                self._dBMeterElement = None
+            MeterService().unwatch(self.dbMeter)
 
             if visible:
-                self._dBMeterElement = self._cue.media.element("DbMeter")
-                if self._dBMeterElement is not None:
-                    self._dBMeterElement.level_ready.connect(
-                        self.dbMeter.plot, Connection.QtQueued
-                    )
+                element = self._cue.media.element("DbMeter")
+                if element is not None:
+                    MeterService().watch(self.dbMeter, element)
 
                 self.hLayout.insertWidget(2, self.dbMeter, 1)
                 self.dbMeter.show()
@@ -77,7 +77,7 @@ class CartLayout(CueLayout):
         # TODO: move this logic in CartTabWidget ?
         self._cart_model.item_added.connect(self.__cue_added)
         self._cart_model.item_removed.connect(self.__cue_removed)
-        self._cart_model.item_moved.connect(self.__cue_moved)
+        self._cart_model.items_moved.connect(self.__cues_moved)
         self._cart_model.model_reset.connect(self.__model_reset)
 
         self._cart_view = CartTabWidget()
@@ -461,15 +461,16 @@ class CartLayout(CueLayout):
 
         widget.deleteLater()
 
-    def __cue_moved(self, old_index, new_index):
-        o_page, o_row, o_column = self.to_3d_index(old_index)
-        n_page, n_row, n_column = self.to_3d_index(new_index)
+    def __cues_moved(self, old_indexes, new_indexes):
+        # The moves can overlap, all the widgets are taken before placing them
+        widgets = []
+        for old_index in old_indexes:
+            page, row, column = self.to_3d_index(old_index)
+            widgets.append(self._page(page).takeWidget(row, column))
 
-        if o_page == n_page:
-            self._page(n_page).moveWidget(o_row, o_column, n_row, n_column)
-        else:
-            widget = self._page(o_page).takeWidget(o_row, o_column)
-            self._page(n_page).addWidget(widget, n_row, n_column)
+        for new_index, widget in zip(new_indexes, widgets):
+            page, row, column = self.to_3d_index(new_index)
+            self._page(page).addWidget(widget, row, column)
 
     def __model_reset(self):
         for page in self._cart_view.pages():
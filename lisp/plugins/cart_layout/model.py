@@ -48,19 +48,7 @@ class CueCartModel(ModelAdapter):
 
     def first_empty(self):
         """Return the first empty index, starting from the current page."""
-        offset = (self.__rows * self.__columns) * self.current_page
-        last_index = self.__cues.peekitem(-1)[0] if self.__cues else -1
-
-        if last_index > offset:
-            for n in range(offset, last_index):
-                if n not in self.__cues:  # O(1)
-                    return n
-
-            return last_index + 1
-        if last_index < offset:
-            return offset
-        else:
-            return offset + 1
+        return next(self.__empty_indexes())
 
     def item(self, index):
         index = self.flat(index)
@@ -77,6 +65,18 @@ class CueCartModel(ModelAdapter):
 
         self.add(item)
 
+    def insert_many(self, items, index):
+        items = tuple(items)
+        index = self.flat(index)
+
+        for item_index, item in enumerate(items, index):
+            if index >= 0 and item_index not in self.__cues:
+                item.index = item_index
+            else:
+                item.index = -1
+
+        self.add_many(items)
+
     def pop(self, index):
         index = self.flat(index)
         try:
@@ -88,15 +88,41 @@ class CueCartModel(ModelAdapter):
         return cue
 
     def move(self, old_index, new_index):
-        old_index = self.flat(old_index)
-        new_index = self.flat(new_index)
+        self.move_many((old_index,), (new_index,))
+
+    def move_many(self, old_indexes, new_indexes):
+        """Move multiple cues, at once.
 
-        if new_index not in self.__cues:
-            self.__cues[new_index] = self.__cues.pop(old_index)
-            self.__cues[new_index].index = new_index
+        As in the list model, the moves can overlap: a new index can be one
+        of the old indexes (e.g. to shift some cues by one), all the other
+        new indexes must be empty.
+
+        :raise ModelException: if a new index is used by a cue not moved,
+            or it is repeated
+        """
+        old_indexes = tuple(self.flat(index) for index in old_indexes)
+        new_indexes = tuple(self.flat(index) for index in new_indexes)
+        if old_indexes == new_indexes:
+            return
+
+        moving = set(old_indexes)
+        targets = set()
+        for new_index in new_indexes:
+            if new_index in targets or (
+                new_index in self.__cues and new_index not in moving
+            ):
+                raise ModelException(f"index already used {new_index}")
+
+            targets.add(new_index)
+
+        moved = [self.__cues.pop(index) for index in old_indexes]
+        for new_index, cue in zip(new_indexes, moved):
+            self.__cues[new_index] = cue
+            cue.index = new_index
+
+        for old_index, new_index in zip(old_indexes, new_indexes):
             self.item_moved.emit(old_index, new_index)
-        else:
-            raise ModelException(f"index already used {new_index}")
+        self.items_moved.emit(old_indexes, new_indexes)
 
     def page_edges(self, page):
         start = self.flat((page, 0, 0))
@@ -105,8 +131,9 @@ class CueCartModel(ModelAdapter):
 
     def remove_page(self, page, lshift=True):
         start, end = self.page_edges(page)
-        for index in self.__cues.irange(start, end):
-            self.remove(self.__cues[index])
+        self.remove_many(
+            [self.__cues[index] for index in self.__cues.irange(start, end)]
+        )
 
         if lshift:
             page_size = self.__rows * self.__columns
@@ -122,19 +149,48 @@ class CueCartModel(ModelAdapter):
             yield self.__cues[index]
 
     def _item_added(self, item):
-        if item.index == -1 or item.index in self.__cues:
-            item.index = self.first_empty()
+        self._items_added((item,))
 
-        self.__cues[item.index] = item
-        self.item_added.emit(item)
+    def _items_added(self, items):
+        # The empty indexes are searched once for the whole batch
+        empty_indexes = self.__empty_indexes()
+        for item in items:
+            if item.index == -1 or item.index in self.__cues:
+                item.index = next(empty_indexes)
+
+            self.__cues[item.index] = item
+
+        for item in items:
+            self.item_added.emit(item)
+        self.items_added.emit(items)
 
     def _item_removed(self, item):
-        self.__cues.pop(item.index)
-        self.item_removed.emit(item)
+        self._items_removed((item,))
+
+    def _items_removed(self, items):
+        for item in items:
+            self.__cues.pop(item.index)
+
+        for item in items:
+            self.item_removed.emit(item)
+        self.items_removed.emit(items)
 
     def _model_reset(self):
         self.__cues.clear()
         self.model_reset.emit()
 
+    def __empty_indexes(self):
+        """Generate the empty indexes, starting from the current page.
+
+        The model is checked lazily, so indexes used while iterating are
+        skipped.
+        """
+        index = (self.__rows * self.__columns) * self.current_page
+        while True:
+            if index not in self.__cues:  # O(1)
+                yield index
+
+            index += 1
+
     def __iter__(self):
         return iter(self.__cues.values())
@@ -20,7 +20,9 @@ from PyQt5.QtCore import QT_TRANSLATE_NOOP
 from lisp.backend.media_element import ElementType, MediaType
 from lisp.core.signal import Signal
 from lisp.plugins.gst_backend.gi_repository import Gst
+from lisp.plugins.gst_backend.gst_bus import GstBusRouter
 from lisp.plugins.gst_backend.gst_element import GstMediaElement
+from lisp.plugins.gst_backend.gst_state import gst_pipeline_state
 from lisp.plugins.gst_backend.gst_properties import GstProperty
 
 
@@ -39,7 +41,8 @@ class DbMeter(GstMediaElement):
 
         self.pipeline = pipeline
         self.level = Gst.ElementFactory.make("level", None)
-        self.level.set_property("post-messages", True)
+        # Levels are posted only while someone is watching, see `set_metering`
+        self.level.set_property("post-messages", False)
         self.level.set_property("interval", self.interval)
         self.level.set_property("peak-ttl", self.peak_ttl)
         self.level.set_property("peak-falloff", self.peak_falloff)
@@ -50,14 +53,26 @@ class DbMeter(GstMediaElement):
 
         self.level.link(self.audio_convert)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect("message::element", self.__on_message)
+        # Level messages are batched, only the most recent one is used
+        GstBusRouter.get(self.pipeline).register(
+            Gst.MessageType.ELEMENT,
+            self.__on_messages,
+            source=self.level,
+            batched=True,
+        )
 
     def dispose(self):
-        bus = self.pipeline.get_bus()
-        bus.remove_signal_watch()
-        bus.disconnect(self._handler)
+        GstBusRouter.get(self.pipeline).unregister(
+            Gst.MessageType.ELEMENT, self.__on_messages, source=self.level
+        )
+
+    def set_metering(self, enable):
+        """Enable/disable the `level_ready` notifications (disabled by default).
+
+        When disabled no message is posted, nor parsed, the levels are
+        still computed in the pipeline, but that's cheap in comparison.
+        """
+        self.level.set_property("post-messages", enable)
 
     def sink(self):
         return self.level
@@ -65,14 +80,13 @@ class DbMeter(GstMediaElement):
     def src(self):
         return self.audio_convert
 
-    def __on_message(self, bus, message):
-        if message.src == self.level:
-            state = self.level.get_state(Gst.MSECOND)[1]
-            if state == Gst.State.PLAYING or state == Gst.State.PAUSED:
-                structure = message.get_structure()
-                if structure is not None and structure.has_name("level"):
-                    self.level_ready.emit(
-                        structure.get_value("peak"),
-                        structure.get_value("rms"),
-                        structure.get_value("decay"),
-                    )
+    def __on_messages(self, messages):
+        state = gst_pipeline_state(self.pipeline)
+        if state == Gst.State.PLAYING or state == Gst.State.PAUSED:
+            structure = messages[-1].get_structure()
+            if structure is not None and structure.has_name("level"):
+                self.level_ready.emit(
+                    structure.get_value("peak"),
+                    structure.get_value("rms"),
+                    structure.get_value("decay"),
+                )
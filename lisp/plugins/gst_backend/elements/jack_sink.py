@@ -23,7 +23,9 @@ from PyQt5.QtCore import QT_TRANSLATE_NOOP
 from lisp.backend.media_element import ElementType, MediaType
 from lisp.core.properties import Property
 from lisp.plugins.gst_backend.gi_repository import Gst
+from lisp.plugins.gst_backend.gst_bus import GstBusRouter
 from lisp.plugins.gst_backend.gst_element import GstMediaElement
+from lisp.plugins.gst_backend.gst_state import gst_pipeline_state
 from lisp.ui.ui_utils import translate
 
 logger = logging.getLogger(__name__)
@@ -67,16 +69,22 @@ class JackSink(GstMediaElement):
         self.connections = self.default_connections(JackSink._ControlClient)
         self.changed("connections").connect(self.__prepare_connections)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect("message", self.__on_message)
+        GstBusRouter.get(self.pipeline).register(
+            Gst.MessageType.STATE_CHANGED,
+            self.__on_state_changed,
+            source=self.jack_sink,
+        )
 
     def sink(self):
         return self.audio_resample
 
     def dispose(self):
         try:
-            self.pipeline.get_bus().disconnect(self._handler)
+            GstBusRouter.get(self.pipeline).unregister(
+                Gst.MessageType.STATE_CHANGED,
+                self.__on_state_changed,
+                source=self.jack_sink,
+            )
             JackSink._clients.remove(self._client_id)
         finally:
             if not JackSink._clients:
@@ -103,10 +111,8 @@ class JackSink(GstMediaElement):
         return connections
 
     def __prepare_connections(self, value):
-        if (
-            self.pipeline.current_state == Gst.State.PLAYING
-            or self.pipeline.current_state == Gst.State.PAUSED
-        ):
+        state = gst_pipeline_state(self.pipeline)
+        if state == Gst.State.PLAYING or state == Gst.State.PAUSED:
             self.__jack_connect()
 
     @classmethod
@@ -153,12 +159,10 @@ class JackSink(GstMediaElement):
                 else:
                     break
 
-    def __on_message(self, bus, message):
-        if message.src == self.jack_sink:
-            if message.type == Gst.MessageType.STATE_CHANGED:
-                change = tuple(message.parse_state_changed())[0:2]
+    def __on_state_changed(self, message):
+        change = tuple(message.parse_state_changed())[0:2]
 
-                # The jack ports are available when the the jackaudiosink
-                # change from READY to PAUSED state
-                if change == (Gst.State.READY, Gst.State.PAUSED):
-                    self.__jack_connect()
+        # The jack ports are available when the the jackaudiosink
+        # change from READY to PAUSED state
+        if change == (Gst.State.READY, Gst.State.PAUSED):
+            self.__jack_connect()
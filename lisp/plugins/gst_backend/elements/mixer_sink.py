@@ -0,0 +1,77 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from PyQt5.QtCore import QT_TRANSLATE_NOOP
+
+from lisp.backend.media_element import ElementType, MediaType
+from lisp.plugins.gst_backend import GstBackend
+from lisp.plugins.gst_backend.gi_repository import Gst
+from lisp.plugins.gst_backend.gst_element import GstMediaElement
+from lisp.plugins.gst_backend.gst_mixer import GstMixer
+
+
+class MixerSink(GstMediaElement):
+    """Send the audio to the shared mixing engine (see `GstMixer`).
+
+    The media is linked to the mixer output only while running, the output
+    sink is set in the backend configuration ("mixerOutput").
+    """
+
+    ElementType = ElementType.Output
+    MediaType = MediaType.Audio
+    Name = QT_TRANSLATE_NOOP("MediaElementName", "Mixer Out")
+
+    def __init__(self, pipeline):
+        super().__init__(pipeline)
+
+        self.__output = None
+        self.__branch = None
+        self.__channel = GstMixer().new_channel()
+
+        self.audio_convert = Gst.ElementFactory.make("audioconvert", None)
+        self.audio_resample = Gst.ElementFactory.make("audioresample", None)
+        self.inter_sink = Gst.ElementFactory.make("interaudiosink", "sink")
+        self.inter_sink.set_property("channel", self.__channel)
+
+        self.pipeline.add(self.audio_convert)
+        self.pipeline.add(self.audio_resample)
+        self.pipeline.add(self.inter_sink)
+
+        self.audio_convert.link(self.audio_resample)
+        self.audio_resample.link(self.inter_sink)
+
+    def sink(self):
+        return self.audio_convert
+
+    def play(self):
+        if self.__branch is None:
+            self.__output, self.__branch = GstMixer().attach(
+                GstBackend.Config.get("mixerOutput", "autoaudiosink"),
+                self.__channel,
+            )
+
+            # Use the output clock, to avoid drifting from the mixer
+            self.pipeline.use_clock(self.__output.clock())
+
+    def stop(self):
+        if self.__branch is not None:
+            GstMixer().detach(self.__output, self.__branch)
+            self.__output = None
+            self.__branch = None
+
+    def dispose(self):
+        self.stop()
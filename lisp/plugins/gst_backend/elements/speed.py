@@ -20,7 +20,9 @@ from PyQt5.QtCore import QT_TRANSLATE_NOOP
 from lisp.backend.media_element import ElementType, MediaType
 from lisp.core.properties import Property
 from lisp.plugins.gst_backend.gi_repository import Gst
+from lisp.plugins.gst_backend.gst_bus import GstBusRouter
 from lisp.plugins.gst_backend.gst_element import GstMediaElement
+from lisp.plugins.gst_backend.gst_state import gst_pipeline_state
 
 
 class Speed(GstMediaElement):
@@ -42,9 +44,11 @@ class Speed(GstMediaElement):
 
         self.scale_tempo.link(self.audio_convert)
 
-        bus = self.pipeline.get_bus()
-        bus.add_signal_watch()
-        self._handler = bus.connect("message", self.__on_message)
+        GstBusRouter.get(self.pipeline).register(
+            Gst.MessageType.STATE_CHANGED,
+            self.__on_state_changed,
+            source=self.scale_tempo,
+        )
 
         self._old_speed = self.speed
         self.changed("speed").connect(self.__prepare_speed)
@@ -53,7 +57,7 @@ class Speed(GstMediaElement):
         if self._old_speed != value:
             self._old_speed = value
 
-            if self.pipeline.current_state == Gst.State.PLAYING:
+            if gst_pipeline_state(self.pipeline) == Gst.State.PLAYING:
                 self.__change_speed()
 
     def sink(self):
@@ -63,16 +67,14 @@ class Speed(GstMediaElement):
         return self.audio_convert
 
     def dispose(self):
-        bus = self.pipeline.get_bus()
-        bus.remove_signal_watch()
-        bus.disconnect(self._handler)
-
-    def __on_message(self, bus, message):
-        if (
-            message.type == Gst.MessageType.STATE_CHANGED
-            and message.src == self.scale_tempo
-            and message.parse_state_changed()[1] == Gst.State.PLAYING
-        ):
+        GstBusRouter.get(self.pipeline).unregister(
+            Gst.MessageType.STATE_CHANGED,
+            self.__on_state_changed,
+            source=self.scale_tempo,
+        )
+
+    def __on_state_changed(self, message):
+        if message.parse_state_changed()[1] == Gst.State.PLAYING:
             self.__change_speed()
 
     def __change_speed(self):
@@ -15,19 +15,17 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from PyQt5.QtCore import QT_TRANSLATE_NOOP
 
 from lisp.backend.media_element import MediaType
-from lisp.core.decorators import async_in_pool
 from lisp.core.properties import Property
 from lisp.core.session_uri import SessionURI
 from lisp.plugins.gst_backend.gi_repository import Gst
 from lisp.plugins.gst_backend.gst_element import GstSrcElement
 from lisp.plugins.gst_backend.gst_properties import GstProperty, GstURIProperty
-from lisp.plugins.gst_backend.gst_utils import gst_uri_duration
+from lisp.plugins.gst_backend.gst_probe import GstProbeService
 
 
 class UriInput(GstSrcElement):
@@ -79,8 +77,13 @@ class UriInput(GstSrcElement):
 
         # If the file changed, or the duration is invalid
         if old_mtime != self._mtime or self.duration < 0:
-            self.__duration()
+            GstProbeService().probe(uri).add_done_callback(self.__probed)
 
-    @async_in_pool(pool=ThreadPoolExecutor(1))
-    def __duration(self):
-        self.duration = gst_uri_duration(self.input_uri())
+    def __probed(self, future):
+        if future.cancelled():
+            return
+
+        probe = future.result()
+        # Ignore the results for a previous uri
+        if probe is not None and probe.uri.uri == self.input_uri().uri:
+            self.duration = probe.duration
@@ -0,0 +1,335 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import sys
+from array import array
+from math import sqrt
+
+from lisp.backend.analysis_cache import AnalysisCache
+from lisp.backend import audio_utils
+from lisp.backend.audio_utils import peak_rms
+from lisp.core.signal import Signal
+from .gi_repository import Gst, GLib
+from .gst_utils import GstError
+
+logger = logging.getLogger(__name__)
+
+
+class GstAnalyzer:
+    """Base class for the analyzers run by `GstAnalysis`.
+
+    If `branch()` returns a pipeline description, it's linked to the decoded
+    audio, the description must end with a sink element.
+    Analyzers without a branch can compute their results from the ones
+    of the previous analyzers.
+    """
+
+    def __init__(self, analysis):
+        self.analysis = analysis
+
+    def branch(self):
+        return ""
+
+    def setup(self, pipeline):
+        """Called once the pipeline has been created."""
+
+    def message(self, message):
+        """Called for every message posted on the pipeline bus."""
+
+    def finish(self, results):
+        """Called when the file has been processed, update `results`."""
+
+
+class EnvelopeAnalyzer(GstAnalyzer):
+    """Peak/RMS envelope, used for the waveform.
+
+    While audioop is available (python < 3.13) the audio is decoded as
+    16bit integers, which audioop reduces much faster. Otherwise it's
+    decoded as 32bit floats, so that the peak of "hot" files is measured
+    without clipping, `floating` can be set to override the default.
+    """
+
+    BRANCH = (
+        "audioconvert ! audio/x-raw, format={format} "
+        "! audiobuffersplit output-buffer-duration={sample_length} "
+        "! appsink name=envelope_sink emit-signals=true sync=false"
+    )
+
+    floating = audio_utils.audioop is None
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self._peaks = array("i")
+        self._rms = array("i")
+        # Highest peak of each channel
+        self._channels_peak = []
+
+    def branch(self):
+        waveform = self.analysis.waveform
+        return self.BRANCH.format(
+            # Samples are processed in native byte-order
+            format=("F32" if self.floating else "S16")
+            + ("LE" if sys.byteorder == "little" else "BE"),
+            sample_length=f"{int(waveform.duration)}/{waveform.samples * 1000}",
+        )
+
+    def setup(self, pipeline):
+        app_sink = pipeline.get_by_name("envelope_sink")
+        app_sink.connect("new-sample", self._on_new_sample, app_sink)
+
+    def finish(self, results):
+        self.analysis.envelope = (self._peaks, self._rms)
+        if self._channels_peak:
+            results["channels_peak"] = self._channels_peak
+
+    def _on_new_sample(self, sink, _):
+        """Called by GStreamer every time we have a new sample ready."""
+        sample = sink.emit("pull-sample")
+        buffer = sample.get_buffer()
+        if buffer is None:
+            return Gst.FlowReturn.OK
+
+        channels = sample.get_caps().get_structure(0).get_value("channels")
+
+        # Access the buffer memory directly, without copying it
+        mapped, map_info = buffer.map(Gst.MapFlags.READ)
+        if not mapped:
+            return Gst.FlowReturn.OK
+
+        try:
+            peaks, rms = peak_rms(
+                map_info.data, channels=channels, floating=self.floating
+            )
+        finally:
+            buffer.unmap(map_info)
+
+        if len(self._channels_peak) < channels:
+            self._channels_peak = peaks
+        else:
+            self._channels_peak = list(map(max, self._channels_peak, peaks))
+
+        max_value = self.analysis.waveform.MAX_SAMPLE_VALUE
+        # The envelope is for all the channels together
+        self._peaks.append(min(round(max(peaks) * max_value), max_value))
+        self._rms.append(
+            min(
+                round(sqrt(sum(r * r for r in rms) / channels) * max_value),
+                max_value,
+            )
+        )
+
+        return Gst.FlowReturn.OK
+
+
+class LoudnessAnalyzer(GstAnalyzer):
+    """ReplayGain track gain and sample peak."""
+
+    REFERENCE_LEVEL = 89
+
+    def __init__(self, analysis):
+        super().__init__(analysis)
+        self._gain = None
+        self._peak = None
+
+    def branch(self):
+        return (
+            f"audioconvert ! rganalysis reference-level={self.REFERENCE_LEVEL}"
+            " ! fakesink sync=false"
+        )
+
+    def message(self, message):
+        if message.type == Gst.MessageType.TAG:
+            tags = message.parse_tag()
+            gain = tags.get_double(Gst.TAG_TRACK_GAIN)
+            peak = tags.get_double(Gst.TAG_TRACK_PEAK)
+
+            if gain[0] and peak[0]:
+                self._gain = gain[1]
+                self._peak = peak[1]
+
+    def finish(self, results):
+        if self._gain is not None:
+            results["track_gain"] = self._gain
+            results["reference_level"] = self.REFERENCE_LEVEL
+            results["peak"] = self._peak
+
+
+class SilenceAnalyzer(GstAnalyzer):
+    """Silence at the head and tail of the file, from the envelope."""
+
+    THRESHOLD_DB = -60
+
+    def finish(self, results):
+        if self.analysis.envelope is None:
+            return
+
+        peaks = self.analysis.envelope[0]
+        threshold = self.analysis.waveform.MAX_SAMPLE_VALUE * 10 ** (
+            self.THRESHOLD_DB / 20
+        )
+        sounding = [i for i, peak in enumerate(peaks) if peak > threshold]
+
+        if sounding:
+            sample_duration = self.analysis.waveform.duration / len(peaks)
+            results["head_silence"] = round(sounding[0] * sample_duration)
+            results["tail_silence"] = round(
+                (len(peaks) - sounding[-1] - 1) * sample_duration
+            )
+        else:
+            results["head_silence"] = self.analysis.waveform.duration
+            results["tail_silence"] = self.analysis.waveform.duration
+
+
+class GstAnalysis:
+    """Analyze a media file, with all the registered analyzers at once.
+
+    The file is decoded only once, the decoded audio is split (tee) to all
+    the analyzers. When done the waveform is filled (and cached) with the
+    envelope data, and the other results are stored in the `AnalysisCache`.
+    """
+
+    PIPELINE_TEMPLATE = 'uridecodebin uri="{uri}" ! audioconvert ! tee name=tee'
+    BRANCH_TEMPLATE = " tee. ! queue ! {branch}"
+
+    Analyzers = [EnvelopeAnalyzer, LoudnessAnalyzer, SilenceAnalyzer]
+
+    def __init__(self, waveform):
+        """
+        :type waveform: lisp.backend.waveform.Waveform
+        """
+        self.waveform = waveform
+        self.envelope = None
+        self.results = {}
+
+        self.finished = Signal()
+        self.failed = Signal()
+
+        self._pipeline = None
+        self._bus_id = None
+        self._analyzers = [analyzer(self) for analyzer in self.Analyzers]
+
+    @classmethod
+    def register_analyzer(cls, analyzer):
+        """Add an analyzer, results will be available from the next analysis.
+
+        :type analyzer: type[GstAnalyzer]
+        """
+        if analyzer not in cls.Analyzers:
+            cls.Analyzers.append(analyzer)
+
+    @staticmethod
+    def cached_results(waveform):
+        """Return the stored results for the waveform file, if any.
+
+        :rtype: dict
+        """
+        return AnalysisCache(waveform.cache_root).load(waveform.fingerprint())
+
+    def start(self):
+        """Start the analysis.
+
+        Return False if the analysis could not be started.
+        """
+        description = self.PIPELINE_TEMPLATE.format(uri=self.waveform.uri.uri)
+        for analyzer in self._analyzers:
+            branch = analyzer.branch()
+            if branch:
+                description += self.BRANCH_TEMPLATE.format(branch=branch)
+
+        try:
+            self._pipeline = Gst.parse_launch(description)
+        except GLib.GError:
+            logger.warning(
+                f'Cannot analyze "{self.waveform.uri.unquoted_uri}"',
+                exc_info=True,
+            )
+            return False
+
+        for analyzer in self._analyzers:
+            analyzer.setup(self._pipeline)
+
+        # Watch the event bus
+        bus = self._pipeline.get_bus()
+        bus.add_signal_watch()
+        self._bus_id = bus.connect("message", self._on_bus_message)
+
+        # Start the pipeline
+        self._pipeline.set_state(Gst.State.PLAYING)
+
+        return True
+
+    def stop(self):
+        if self._pipeline is not None:
+            # Stop the pipeline
+            self._pipeline.set_state(Gst.State.NULL)
+
+            if self._bus_id is not None:
+                # Disconnect from the bus
+                bus = self._pipeline.get_bus()
+                bus.remove_signal_watch()
+                bus.disconnect(self._bus_id)
+
+        self._bus_id = None
+        self._pipeline = None
+
+    def _on_bus_message(self, bus, message):
+        for analyzer in self._analyzers:
+            analyzer.message(message)
+
+        if message.type == Gst.MessageType.EOS:
+            self._eos()
+        elif message.type == Gst.MessageType.ERROR:
+            error, debug = message.parse_error()
+            logger.warning(
+                f'Cannot analyze "{self.waveform.uri.unquoted_uri}": '
+                f"{error.message}",
+                exc_info=GstError(debug),
+            )
+
+            self.stop()
+            self.failed.emit()
+
+    def _eos(self):
+        """Called when the file has been processed."""
+        self.stop()
+
+        for analyzer in self._analyzers:
+            try:
+                analyzer.finish(self.results)
+            except Exception:
+                logger.exception(
+                    f"Analyzer {type(analyzer).__name__} failed for "
+                    f'"{self.waveform.uri.unquoted_uri}"'
+                )
+
+        try:
+            if self.envelope is not None:
+                self.waveform._set_samples(*self.envelope)
+                # Does nothing if caching is disabled
+                self.waveform._to_cache()
+
+            AnalysisCache(self.waveform.cache_root).store(
+                self.waveform.fingerprint(refresh=False), self.results
+            )
+        except Exception:
+            logger.warning(
+                f'Cannot store the analysis of "{self.waveform.uri.unquoted_uri}"',
+                exc_info=True,
+            )
+
+        self.finished.emit()
@@ -16,16 +16,19 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import os.path
+from concurrent.futures import CancelledError
 
 from PyQt5.QtCore import Qt, QT_TRANSLATE_NOOP
 from PyQt5.QtGui import QCursor
-from PyQt5.QtWidgets import QFileDialog, QApplication
+from PyQt5.QtWidgets import QFileDialog, QApplication, QAction
 
 from lisp import backend
 from lisp.backend.backend import Backend as BaseBackend
+from lisp.backend.waveform_service import WaveformService, WaveformPriority
 from lisp.command.layout import LayoutAutoInsertCuesCommand
 from lisp.core.decorators import memoize
 from lisp.core.plugin import Plugin
+from lisp.core.session_uri import SessionURI
 from lisp.cues.media_cue import MediaCue
 from lisp.plugins.gst_backend import config, elements, settings
 from lisp.plugins.gst_backend.gi_repository import Gst
@@ -34,17 +37,17 @@ from lisp.plugins.gst_backend.gst_media_cue import (
     UriAudioCueFactory,
 )
 from lisp.plugins.gst_backend.gst_media_settings import GstMediaSettings
+from lisp.plugins.gst_backend.gst_mixer import GstMixer
+from lisp.plugins.gst_backend.gst_pipeline_pool import GstPipelinePool
+from lisp.plugins.gst_backend.gst_probe import GstProbeService, ProbePriority
+from lisp.plugins.gst_backend.gst_preroll import GstPrerollManager
 from lisp.plugins.gst_backend.gst_settings import GstSettings
-from lisp.plugins.gst_backend.gst_utils import (
-    gst_parse_tags_list,
-    gst_uri_metadata,
-    gst_mime_types,
-    gst_uri_duration,
-)
+from lisp.plugins.gst_backend.gst_utils import gst_mime_types
 from lisp.plugins.gst_backend.gst_waveform import GstWaveform
 from lisp.ui.settings.app_configuration import AppConfigurationDialog
 from lisp.ui.settings.cue_settings import CueSettingsRegistry
 from lisp.ui.ui_utils import translate, qfile_filters
+from lisp.ui.widgets.waveform import WaveformProgressDialog
 
 
 class GstBackend(Plugin, BaseBackend):
@@ -81,21 +84,101 @@ class GstBackend(Plugin, BaseBackend):
             shortcut="CTRL+M",
         )
 
+        # Add Tools menu entry
+        self.prerenderAction = QAction(self.app.window)
+        self.prerenderAction.setText(
+            translate("GstBackend", "Pre-render all waveforms")
+        )
+        self.prerenderAction.triggered.connect(self._prerender_waveforms)
+        self.app.window.menuTools.addAction(self.prerenderAction)
+
+        # Keep the upcoming cues ready to start
+        self.preroll_manager = GstPrerollManager(
+            app, GstBackend.Config.get("prerollCues", 2)
+        )
+
+        # Waveforms generation, and media probing
+        self._update_waveform_workers()
+        self._update_probe_workers()
+        GstProbeService().cache_dir = self.app.conf.get("cache.position", "")
+        self._update_idle_pipelines()
+        GstBackend.Config.changed.connect(self.__config_change)
+        GstBackend.Config.updated.connect(self.__config_update)
+
+        self.app.session_created.connect(self.__session_created)
+        self.app.session_loaded.connect(self.__session_loaded)
+        self.app.session_before_finalize.connect(self.__session_finalize)
+
         # Load elements and their settings-widgets
         elements.load()
         settings.load()
 
         backend.set_backend(self)
 
+    def finalize(self):
+        super().finalize()
+        WaveformService().cancel_all()
+        GstProbeService().cancel_all()
+        GstMixer().dispose()
+
+    def __config_change(self, key, _):
+        if key == "waveformWorkers":
+            self._update_waveform_workers()
+        elif key == "probeWorkers":
+            self._update_probe_workers()
+        elif key == "maxIdlePipelines":
+            self._update_idle_pipelines()
+        elif key == "prerollCues":
+            self.preroll_manager.count = GstBackend.Config.get("prerollCues", 2)
+            self.preroll_manager.update()
+
+    def __config_update(self, diff):
+        for key, value in diff.items():
+            self.__config_change(key, value)
+
+    def __session_created(self, session):
+        session.layout.standby_changed.connect(self.__standby_changed)
+
+    def __standby_changed(self):
+        self.preroll_manager.update()
+
+    def __session_loaded(self, _):
+        if GstBackend.Config.get("waveformPregenerate", False):
+            self.prerender_waveforms()
+
+    def __session_finalize(self, _):
+        WaveformService().cancel_all()
+        self.preroll_manager.clear()
+
+    def _update_waveform_workers(self):
+        WaveformService().workers = GstBackend.Config.get("waveformWorkers", 2)
+
+    def _update_probe_workers(self):
+        GstProbeService().workers = GstBackend.Config.get("probeWorkers", 2)
+
+    def _update_idle_pipelines(self):
+        GstPipelinePool().max_idle = GstBackend.Config.get(
+            "maxIdlePipelines", 16
+        )
+
     def uri_duration(self, uri):
-        return gst_uri_duration(uri)
+        probe = self._probe_uri(uri)
+        return probe.duration if probe is not None else 0
 
     def uri_tags(self, uri):
-        tags = gst_uri_metadata(uri).get_tags()
-        if tags is not None:
-            return gst_parse_tags_list(tags)
+        probe = self._probe_uri(uri)
+        return probe.tags if probe is not None else {}
 
-        return {}
+    @staticmethod
+    def _probe_uri(uri):
+        """Probe the given media, waiting for the result.
+
+        :rtype: lisp.plugins.gst_backend.gst_probe.GstMediaProbe | None
+        """
+        try:
+            return GstProbeService().probe(uri, ProbePriority.High).result()
+        except CancelledError:
+            return None
 
     @memoize
     def supported_extensions(self):
@@ -118,6 +201,30 @@ class GstBackend(Plugin, BaseBackend):
             cache_dir=self.app.conf.get("cache.position", ""),
         )
 
+    def prerender_waveforms(self):
+        """Generate (and cache) the waveforms of all the media cues.
+
+        Waveforms are generated in background, with the lowest priority.
+
+        :rtype: lisp.backend.waveform_service.WaveformBatch
+        """
+        # One waveform for each file
+        waveforms = {}
+        for cue in self.app.cue_model.filter(MediaCue):
+            uri = cue.media.input_uri()
+            if uri is not None and uri.uri not in waveforms:
+                waveforms[uri.uri] = self.media_waveform(cue.media)
+
+        return WaveformService().prerender(
+            waveforms.values(), WaveformPriority.Background
+        )
+
+    def _prerender_waveforms(self):
+        batch = self.prerender_waveforms()
+        if not batch.is_finished():
+            progress = WaveformProgressDialog(batch, parent=self.app.window)
+            progress.show()
+
     def _add_uri_audio_cue(self):
         """Add audio MediaCue(s) form user-selected files"""
         # Get the last visited directory, or use the session-file location
@@ -160,6 +267,12 @@ class GstBackend(Plugin, BaseBackend):
         # Create media cues, and add them to the Application cue_model
         factory = UriAudioCueFactory(GstBackend.Config["pipeline"])
 
+        # Start probing the files before creating the cues (and pipelines),
+        # the cues will receive the results (e.g. durations) when ready
+        GstProbeService().probe_many(
+            (SessionURI(file) for file in files), ProbePriority.Normal
+        )
+
         cues = []
         for file in files:
             cue = factory(self.app, uri=file)
@@ -0,0 +1,137 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+
+from lisp.plugins.gst_backend.gi_repository import GLib
+
+
+class GstBusRouter:
+    """Dispatch the messages of a pipeline bus to the interested callbacks.
+
+    A single bus watch (and handler) is used for the whole pipeline,
+    callbacks are registered for a message type, and optionally for a
+    specific source element, each message is routed with a dictionary
+    lookup, instead of being filtered by every handler.
+
+    Batched callbacks receive a list of messages, collected until the main
+    loop is idle, so that a burst of (high-rate) messages, e.g. when the
+    application is busy, is handled in a single call.
+
+    Callbacks are called in the main loop.
+    """
+
+    __Routers = {}
+    __RoutersLock = Lock()
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+        self.__routes = {}
+        # (message_type, source) -> [(callback, batched), ...]
+        self.__batches = {}
+        # callback -> [message, ...]
+        self.__flush_source = None
+
+        bus = self.pipeline.get_bus()
+        bus.add_signal_watch()
+        self.__handler = bus.connect("message", self.__on_message)
+
+    @classmethod
+    def get(cls, pipeline):
+        """Return the router of the given pipeline, creating it if needed.
+
+        :rtype: GstBusRouter
+        """
+        with cls.__RoutersLock:
+            router = cls.__Routers.get(pipeline.get_name())
+            if router is None:
+                router = cls.__Routers[pipeline.get_name()] = cls(pipeline)
+
+            return router
+
+    def register(self, message_type, callback, source=None, batched=False):
+        """Route the messages of the given type to `callback`.
+
+        :param message_type: the type of the messages
+        :type message_type: Gst.MessageType
+        :param callback: called with the message, or the list of messages
+                         when batched, the callback is strongly referenced
+        :param source: route only the messages posted by this element
+        :type source: Gst.Object | None
+        :param batched: deliver the messages in batches
+        """
+        route = self.__routes.setdefault((message_type, source), [])
+        route.append((callback, batched))
+
+    def unregister(self, message_type, callback, source=None):
+        key = (message_type, source)
+        route = self.__routes.get(key, ())
+        for entry in route:
+            if entry[0] == callback:
+                route.remove(entry)
+                self.__batches.pop(callback, None)
+                break
+
+        if not route:
+            self.__routes.pop(key, None)
+
+    def dispose(self):
+        bus = self.pipeline.get_bus()
+        bus.remove_signal_watch()
+        bus.disconnect(self.__handler)
+
+        if self.__flush_source is not None:
+            GLib.source_remove(self.__flush_source)
+            self.__flush_source = None
+
+        self.__routes.clear()
+        self.__batches.clear()
+
+        with GstBusRouter.__RoutersLock:
+            GstBusRouter.__Routers.pop(self.pipeline.get_name(), None)
+
+    def __on_message(self, bus, message):
+        if message.src is not None:
+            self.__dispatch(
+                self.__routes.get((message.type, message.src)), message
+            )
+
+        self.__dispatch(self.__routes.get((message.type, None)), message)
+
+    def __dispatch(self, route, message):
+        if route is None:
+            return
+
+        for callback, batched in tuple(route):
+            if batched:
+                self.__batches.setdefault(callback, []).append(message)
+                if self.__flush_source is None:
+                    self.__flush_source = GLib.idle_add(self.__flush)
+            else:
+                callback(message)
+
+    def __flush(self):
+        self.__flush_source = None
+
+        batches = self.__batches
+        self.__batches = {}
+        for callback, messages in batches.items():
+            callback(messages)
+
+        # Remove the idle source
+        return False
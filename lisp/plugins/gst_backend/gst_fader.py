@@ -23,6 +23,18 @@ from lisp.core.fader import BaseFader
 
 
 class GstFader(BaseFader):
+    """Perform fades using the GStreamer controller subsystem.
+
+    The fade curve is sampled into a set of control points, their density is
+    chosen from the fade duration, GStreamer interpolates between them while
+    processing the audio, so no work is needed on the python side.
+    """
+
+    # Control points per second of fade
+    PointsPerSecond = 50
+    MinPoints = 16
+    MaxPoints = 1000
+
     def __init__(self, target, attribute: str):
         super().__init__(target, attribute)
         self._start_time = -1
@@ -40,8 +52,11 @@ class GstFader(BaseFader):
             return True
 
         functor = fade_type.value
-        steps = 100
-        steps_duration = (duration * 1000) / steps
+        steps = min(
+            max(int(duration * self.PointsPerSecond), self.MinPoints),
+            self.MaxPoints,
+        )
+        steps_duration = (duration * 1000) / (steps - 1)
         control_points = {}
 
         for step in range(steps):
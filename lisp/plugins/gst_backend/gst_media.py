@@ -17,13 +17,19 @@
 
 import logging
 import weakref
+from threading import RLock
+from time import perf_counter
 
 from lisp.backend.media import Media, MediaState
 from lisp.core.properties import Property
 from lisp.core.util import weak_call_proxy
 from lisp.plugins.gst_backend import elements as gst_elements
 from lisp.plugins.gst_backend.gi_repository import Gst
+from lisp.plugins.gst_backend.gst_bus import GstBusRouter
 from lisp.plugins.gst_backend.gst_element import GstMediaElements
+from lisp.plugins.gst_backend.gst_pipeline_pool import GstPipelinePool
+from lisp.plugins.gst_backend.gst_preroll import StartLatency
+from lisp.plugins.gst_backend.gst_state import GstStateTracker
 from lisp.plugins.gst_backend.gst_utils import GstError
 from lisp.ui.ui_utils import translate
 
@@ -37,22 +43,43 @@ GST_TO_MEDIA_STATE = {
     Gst.State.PLAYING: MediaState.Playing,
 }
 
+PIPELINE_MESSAGES = (
+    Gst.MessageType.SEGMENT_DONE,
+    Gst.MessageType.EOS,
+    Gst.MessageType.ASYNC_DONE,
+    Gst.MessageType.CLOCK_LOST,
+)
 
-def media_finalizer(pipeline, message_handler, media_elements):
-    # Allow pipeline resources to be released
-    pipeline.set_state(Gst.State.NULL)
 
-    # Disconnect message handler
-    bus = pipeline.get_bus()
-    bus.remove_signal_watch()
-    bus.disconnect(message_handler)
+def media_finalizer(state_tracker, bus_router, media_elements):
+    # Allow pipeline resources to be released
+    state_tracker.set_state(Gst.State.NULL)
 
     # Dispose all the elements
     media_elements.clear()
 
+    # Disconnect the bus handlers
+    bus_router.dispose()
+    state_tracker.dispose()
+
 
 class GstMedia(Media):
-    """Media implementation based on the GStreamer framework."""
+    """Media implementation based on the GStreamer framework.
+
+    The pipeline is created in the NULL state, so that it doesn't hold any
+    resource until needed, it's moved to READY when the media is armed,
+    or played. Idle pipelines are released by the `GstPipelinePool`.
+
+    A media can also be pre-rolled (PAUSED at the start position, with the
+    sinks holding the first buffers), so that starting the playback only
+    requires the PAUSED->PLAYING transition. Pre-rolled media are stopped,
+    and are not sought, as any other stopped media.
+
+    `preroll`, `unpreroll`, `play`, `pause` and `stop` can be called from
+    different threads (e.g. the pre-roll of the upcoming cues, while a cue
+    is started), they are serialized, so that a media is never moved back
+    to READY by `unpreroll` while it's being played.
+    """
 
     pipe = Property(default=())
     elements = Property(default=GstMediaElements.class_defaults())
@@ -61,10 +88,19 @@ class GstMedia(Media):
         super().__init__()
         self.elements = GstMediaElements()
 
+        self.__lock = RLock()
         self.__pipeline = None
+        self.__state_tracker = None
         self.__finalizer = None
         self.__loop = 0  # current number of loops left to do
         self.__current_pipe = None  # A copy of the pipe property
+        self.__rebuild = False  # If the pipeline must be re-created
+        self.__prerolled = False  # If paused by `preroll()`
+        self.__preroll_seek = False  # If the pre-roll seek is pending
+        self.__preroll_generation = 0  # The generation at pre-roll
+
+        self.start_latency = 0
+        """Time (ms) taken by the last `play()` call to start the playback."""
 
         self.changed("loop").connect(self.__on_loops_changed)
         self.changed("pipe").connect(self.__on_pipe_changed)
@@ -75,7 +111,19 @@ class GstMedia(Media):
             return MediaState.Null
 
         return GST_TO_MEDIA_STATE.get(
-            self.__pipeline.get_state(Gst.MSECOND)[1], MediaState.Null
+            self.__state_tracker.state, MediaState.Null
+        )
+
+    def query_state(self):
+        """Query the pipeline for its state, instead of using the cached one.
+
+        Only needed if the pipeline state has been changed externally.
+        """
+        if self.__pipeline is None:
+            return MediaState.Null
+
+        return GST_TO_MEDIA_STATE.get(
+            self.__state_tracker.query(), MediaState.Null
         )
 
     def current_time(self):
@@ -85,57 +133,141 @@ class GstMedia(Media):
 
         return 0
 
-    def play(self):
-        if self.state == MediaState.Null:
+    def arm(self):
+        if self.__pipeline is None or self.__rebuild:
             self.__init_pipeline()
 
-        if self.state == MediaState.Ready or self.state == MediaState.Paused:
-            self.on_play.emit(self)
+        if self.state == MediaState.Null:
+            self.__pipeline.set_state(Gst.State.READY)
+            self.__pipeline.get_state(Gst.SECOND)
+
+        GstPipelinePool().used(self)
+
+    def release(self):
+        """Release the pipeline resources, if the media is not running."""
+        if self.__pipeline is not None and self.state == MediaState.Ready:
+            self.__state_tracker.set_state(Gst.State.NULL)
+
+        GstPipelinePool().released(self)
+
+    def preroll(self):
+        """Pause the pipeline at the start position, ready to be played.
+
+        Does nothing if the media is already running.
+        """
+        with self.__lock:
+            if self.state == MediaState.Null:
+                self.arm()
 
-            for element in self.elements:
-                element.play()
+            if self.state == MediaState.Ready:
+                self.__prerolled = True
+                self.__preroll_seek = True
+                self.__preroll_generation = self.generation()
 
-            if self.state != MediaState.Paused:
+                # Asynchronous, the seek is done once PAUSED (see __on_message)
                 self.__pipeline.set_state(Gst.State.PAUSED)
+
+    def unpreroll(self):
+        """Bring a pre-rolled media back to READY, releasing its buffers."""
+        with self.__lock:
+            if self.__prerolled:
+                self.__reset_preroll()
+
+                # The pipeline might be still moving to PAUSED
+                self.__pipeline.set_state(Gst.State.READY)
                 self.__pipeline.get_state(Gst.SECOND)
-                self.__seek(self.start_time)
-            else:
-                self.__seek(self.current_time())
 
-            self.__pipeline.set_state(Gst.State.PLAYING)
-            self.__pipeline.get_state(Gst.SECOND)
+                GstPipelinePool().used(self)
+
+    def is_prerolled(self):
+        return self.__prerolled
 
-            self.played.emit(self)
+    def play(self):
+        started = perf_counter()
+
+        with self.__lock:
+            if self.state == MediaState.Null:
+                self.arm()
+
+            if (
+                self.state == MediaState.Ready
+                or self.state == MediaState.Paused
+            ):
+                # Buffers are valid only if nothing changed since the pre-roll
+                prerolled = (
+                    self.__prerolled
+                    and not self.__preroll_seek
+                    and self.__preroll_generation == self.generation()
+                )
+                preroll_pending = self.__prerolled and not prerolled
+                self.__reset_preroll()
+
+                self.on_play.emit(self)
+
+                for element in self.elements:
+                    element.play()
+
+                if self.state != MediaState.Paused:
+                    self.__pipeline.set_state(Gst.State.PAUSED)
+                    self.__pipeline.get_state(Gst.SECOND)
+                    self.__seek(self.start_time)
+                elif preroll_pending:
+                    self.__seek(self.start_time)
+                elif not prerolled:
+                    self.__seek(self.current_time())
+
+                self.__pipeline.set_state(Gst.State.PLAYING)
+                self.__pipeline.get_state(Gst.SECOND)
+
+                self.start_latency = (perf_counter() - started) * 1000
+                StartLatency().record(self.start_latency, prerolled)
+
+                self.played.emit(self)
 
     def pause(self):
-        if self.state == MediaState.Playing:
-            self.on_pause.emit(self)
+        with self.__lock:
+            if self.state == MediaState.Playing:
+                self.on_pause.emit(self)
 
-            for element in self.elements:
-                element.pause()
+                for element in self.elements:
+                    element.pause()
 
-            self.__pipeline.set_state(Gst.State.PAUSED)
-            self.__pipeline.get_state(Gst.SECOND)
+                self.__pipeline.set_state(Gst.State.PAUSED)
+                self.__pipeline.get_state(Gst.SECOND)
 
-            # Flush the pipeline
-            self.__seek(self.current_time())
+                # Flush the pipeline
+                self.__seek(self.current_time())
 
-            self.paused.emit(self)
+                self.paused.emit(self)
 
     def stop(self):
-        if self.state == MediaState.Playing or self.state == MediaState.Paused:
-            self.on_stop.emit(self)
+        with self.__lock:
+            self.__reset_preroll()
 
-            for element in self.elements:
-                element.stop()
+            if (
+                self.state == MediaState.Playing
+                or self.state == MediaState.Paused
+            ):
+                self.on_stop.emit(self)
 
-            self.__pipeline.set_state(Gst.State.READY)
-            self.__pipeline.get_state(Gst.SECOND)
-            self.__reset_media()
+                for element in self.elements:
+                    element.stop()
+
+                self.__pipeline.set_state(Gst.State.READY)
+                self.__pipeline.get_state(Gst.SECOND)
+                self.__reset_media()
 
-            self.stopped.emit(self)
+                # The pipeline is now idle
+                GstPipelinePool().used(self)
+
+                self.stopped.emit(self)
 
     def seek(self, position):
+        if self.__prerolled:
+            # Paused only to be ready, the media is actually stopped, and
+            # it must start from `start_time` as when not pre-rolled
+            return
+
         if self.__seek(position):
             self.sought.emit(self, position)
 
@@ -152,7 +284,9 @@ class GstMedia(Media):
             pass
 
     def update_properties(self, properties):
-        # In order to update the other properties we need the pipeline first
+        # In order to update the other properties we need the pipeline first,
+        # the given dict is not modified, it might be re-used (e.g. redo)
+        properties = properties.copy()
         pipe = properties.pop("pipe", ())
         if pipe:
             self.pipe = pipe
@@ -162,6 +296,10 @@ class GstMedia(Media):
     def __reset_media(self):
         self.__loop = self.loop
 
+    def __reset_preroll(self):
+        self.__prerolled = False
+        self.__preroll_seek = False
+
     def __segment_stop_position(self):
         if 0 < self.stop_time < self.duration:
             return self.stop_time
@@ -228,15 +366,20 @@ class GstMedia(Media):
         if self.__finalizer is not None:
             # Set pipeline to NULL, finalize bus-handler and elements
             self.__finalizer()
+            GstPipelinePool().released(self)
+
+        self.__rebuild = False
 
         self.__pipeline = Gst.Pipeline()
-        # Add a callback to watch for pipeline bus-messages
-        bus = self.__pipeline.get_bus()
-        bus.add_signal_watch()
-        # Use a weakref or GStreamer will hold a reference of the callback
-        handler = bus.connect(
-            "message", weak_call_proxy(weakref.WeakMethod(self.__on_message))
-        )
+        # Keep track of the pipeline state, so that we don't need to query it
+        self.__state_tracker = GstStateTracker(self.__pipeline)
+        # Route the pipeline bus-messages we are interested in
+        bus_router = GstBusRouter.get(self.__pipeline)
+        # Use a weakref or the router will hold a reference of the callback
+        on_message = weak_call_proxy(weakref.WeakMethod(self.__on_message))
+        for message_type in PIPELINE_MESSAGES:
+            bus_router.register(message_type, on_message, self.__pipeline)
+        bus_router.register(Gst.MessageType.ERROR, on_message)
 
         # Create all the new elements
         all_elements = gst_elements.all_elements()
@@ -267,16 +410,17 @@ class GstMedia(Media):
         # Create a new finalizer object to free the pipeline when the media
         # is dereferenced
         self.__finalizer = weakref.finalize(
-            self, media_finalizer, self.__pipeline, handler, self.elements
+            self,
+            media_finalizer,
+            self.__state_tracker,
+            bus_router,
+            self.elements,
         )
 
-        # Set the pipeline to READY
-        self.__pipeline.set_state(Gst.State.READY)
-        self.__pipeline.get_state(Gst.SECOND)
-
+        # The pipeline is left in the NULL state, until needed
         self.elements_changed.emit(self)
 
-    def __on_message(self, bus, message):
+    def __on_message(self, message):
         if message.src == self.__pipeline:
             if message.type == Gst.MessageType.SEGMENT_DONE:
                 if self.__loop != 0:
@@ -297,8 +441,18 @@ class GstMedia(Media):
                     element.eos()
 
                 self.__reset_media()
+                GstPipelinePool().used(self)
+
                 self.eos.emit(self)
 
+            elif message.type == Gst.MessageType.ASYNC_DONE:
+                with self.__lock:
+                    if self.__preroll_seek:
+                        # Now PAUSED, move to the start position, the sinks
+                        # are filled again with the buffers from there
+                        self.__preroll_seek = False
+                        self.__seek(self.start_time)
+
             elif message.type == Gst.MessageType.CLOCK_LOST:
                 self.__pipeline.set_state(Gst.State.PAUSED)
                 self.__pipeline.set_state(Gst.State.PLAYING)
@@ -309,10 +463,12 @@ class GstMedia(Media):
                 f"GStreamer: {error.message}", exc_info=GstError(debug)
             )
 
-            # Set the pipeline to NULL
-            self.__pipeline.set_state(Gst.State.NULL)
-            self.__pipeline.get_state(Gst.SECOND)
+            # Set the pipeline to NULL, and re-create it when needed
+            self.__state_tracker.set_state(Gst.State.NULL)
+            self.__rebuild = True
             self.__reset_media()
+            self.__reset_preroll()
+            GstPipelinePool().released(self)
 
             self.error.emit(self)
 
@@ -0,0 +1,176 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from itertools import count
+from threading import RLock
+
+from lisp.core.singleton import Singleton
+from lisp.plugins.gst_backend.gi_repository import Gst
+
+logger = logging.getLogger(__name__)
+
+MIXER_SINKS = ("autoaudiosink", "pulsesink", "alsasink", "jackaudiosink")
+
+
+class GstMixerBranch:
+    """An input of a mixer output, receiving the audio of a single media."""
+
+    def __init__(self, channel, elements, pad):
+        self.channel = channel
+        self.elements = elements
+        self.pad = pad
+
+
+class GstMixerOutput:
+    """A persistent pipeline, mixing its inputs into a single audio sink.
+
+    ``audiotestsrc (silence) ! audiomixer ! audioconvert ! audioresample !
+    <sink>``, inputs are ``interaudiosrc ! audioconvert`` branches, linked
+    to the mixer while the media are running.
+
+    The silent source keeps the (live) mixer running, so that the device
+    stream stays open when no input is attached.
+    """
+
+    def __init__(self, sink_name):
+        self.sink_name = sink_name
+
+        self.pipeline = Gst.Pipeline()
+        self.__silence = Gst.ElementFactory.make("audiotestsrc", None)
+        self.__silence.set_property("wave", "silence")
+        self.__silence.set_property("is-live", True)
+        self.__mixer = Gst.ElementFactory.make("audiomixer", None)
+        self.__convert = Gst.ElementFactory.make("audioconvert", None)
+        self.__resample = Gst.ElementFactory.make("audioresample", None)
+        self.__sink = Gst.ElementFactory.make(sink_name, None)
+
+        if self.__sink is None:
+            raise RuntimeError(f'Cannot create the "{sink_name}" element')
+
+        for element in (
+            self.__silence,
+            self.__mixer,
+            self.__convert,
+            self.__resample,
+            self.__sink,
+        ):
+            self.pipeline.add(element)
+
+        self.__silence.link(self.__mixer)
+        self.__mixer.link(self.__convert)
+        self.__convert.link(self.__resample)
+        self.__resample.link(self.__sink)
+
+        self.pipeline.set_state(Gst.State.PLAYING)
+        self.pipeline.get_state(Gst.SECOND)
+
+    def clock(self):
+        return self.pipeline.get_clock()
+
+    def attach(self, channel):
+        """Add an input, reading the audio from the given inter-channel.
+
+        :rtype: GstMixerBranch
+        """
+        source = Gst.ElementFactory.make("interaudiosrc", None)
+        source.set_property("channel", channel)
+        convert = Gst.ElementFactory.make("audioconvert", None)
+
+        self.pipeline.add(source)
+        self.pipeline.add(convert)
+        source.link(convert)
+
+        pad = self.__mixer.get_request_pad("sink_%u")
+        convert.get_static_pad("src").link(pad)
+
+        convert.sync_state_with_parent()
+        source.sync_state_with_parent()
+
+        return GstMixerBranch(channel, (source, convert), pad)
+
+    def detach(self, branch):
+        """Remove an input, added by `attach`.
+
+        :type branch: GstMixerBranch
+        """
+        for element in branch.elements:
+            element.set_state(Gst.State.NULL)
+
+        branch.elements[-1].get_static_pad("src").unlink(branch.pad)
+        self.__mixer.release_request_pad(branch.pad)
+
+        for element in branch.elements:
+            self.pipeline.remove(element)
+
+    def dispose(self):
+        self.pipeline.set_state(Gst.State.NULL)
+
+
+class GstMixer(metaclass=Singleton):
+    """Mixing engine, shared by the media using the "Mixer Out" element.
+
+    Media only render their audio into an inter-pipeline channel, only the
+    output pipelines (one for each sink type) hold an audio device stream
+    (or a JACK client). Starting a media only links a new mixer input.
+    """
+
+    def __init__(self):
+        self.__lock = RLock()
+        self.__outputs = {}
+        self.__channels = count()
+
+    def new_channel(self):
+        """Return a new, unique, inter-pipeline channel name."""
+        return f"lisp-mixer-{next(self.__channels)}"
+
+    def output(self, sink_name):
+        """Return the output using the given sink, creating it if needed.
+
+        :rtype: GstMixerOutput
+        """
+        if sink_name not in MIXER_SINKS:
+            sink_name = MIXER_SINKS[0]
+
+        with self.__lock:
+            output = self.__outputs.get(sink_name)
+            if output is None:
+                output = self.__outputs[sink_name] = GstMixerOutput(sink_name)
+                logger.debug(f'Started the "{sink_name}" mixer output')
+
+            return output
+
+    def attach(self, sink_name, channel):
+        """Link the channel to the output using the given sink.
+
+        :rtype: (GstMixerOutput, GstMixerBranch)
+        """
+        with self.__lock:
+            output = self.output(sink_name)
+            return output, output.attach(channel)
+
+    def detach(self, output, branch):
+        with self.__lock:
+            output.detach(branch)
+
+    def dispose(self):
+        """Stop all the outputs."""
+        with self.__lock:
+            for output in self.__outputs.values():
+                output.dispose()
+
+            self.__outputs.clear()
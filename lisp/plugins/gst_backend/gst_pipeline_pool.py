@@ -0,0 +1,91 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from threading import RLock
+from weakref import ref
+
+from lisp.backend.media import MediaState
+from lisp.core.singleton import Singleton
+
+
+class GstPipelinePool(metaclass=Singleton):
+    """Limit the number of idle pipelines holding their resources.
+
+    A pipeline holds its resources (e.g. open files, audio-device connections)
+    from the READY state onward. Media register here every time they use
+    their pipeline, when more than `max_idle` pipelines are idle (READY) the
+    least recently used ones are released (set to NULL).
+
+    Playing and paused pipelines are never released.
+    """
+
+    def __init__(self, max_idle=16):
+        self.max_idle = max_idle
+
+        self.__lock = RLock()
+        self.__media = OrderedDict()
+
+    def used(self, media):
+        """Mark the media pipeline as the most recently used one.
+
+        :type media: lisp.plugins.gst_backend.gst_media.GstMedia
+        """
+        key = id(media)
+
+        with self.__lock:
+            if key in self.__media:
+                self.__media.move_to_end(key)
+            else:
+                self.__media[key] = ref(media, self.__collected(key))
+
+        self.__evict()
+
+    def released(self, media):
+        """Remove the media, once its pipeline resources are released."""
+        with self.__lock:
+            self.__media.pop(id(media), None)
+
+    def resident(self):
+        """Number of pipelines holding their resources."""
+        return len(self.__media)
+
+    def release_all(self):
+        """Release all the idle pipelines."""
+        self.__evict(0)
+
+    def __evict(self, max_idle=None):
+        if max_idle is None:
+            max_idle = self.max_idle
+
+        with self.__lock:
+            idle = []
+            for media_ref in self.__media.values():
+                media = media_ref()
+                if media is not None and media.state == MediaState.Ready:
+                    idle.append(media)
+
+        # Least recently used first
+        for media in idle[: max(len(idle) - max_idle, 0)]:
+            media.release()
+
+    def __collected(self, key):
+        def callback(_):
+            with self.__lock:
+                self.__media.pop(key, None)
+
+        return callback
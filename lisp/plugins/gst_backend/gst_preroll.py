@@ -0,0 +1,184 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from threading import Lock
+
+from lisp.core.singleton import Singleton
+from lisp.core.worker_pool import SharedWorkerPool, TaskPriority
+from lisp.cues.media_cue import MediaCue
+
+logger = logging.getLogger(__name__)
+
+
+class StartLatency(metaclass=Singleton):
+    """Statistics of the time taken by media to start the playback.
+
+    The latency is measured from the `play()` call (e.g. when the cue is
+    started) until `get_state` returns with the pipeline PLAYING, the time
+    the sinks take to render the first buffers is not included.
+    Pre-rolled and "cold" starts are kept separated.
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__stats = {True: [0, 0.0, 0.0], False: [0, 0.0, 0.0]}
+
+    def record(self, latency, prerolled):
+        """
+        :param latency: the start latency in milliseconds
+        :param prerolled: if the media was pre-rolled
+        """
+        with self.__lock:
+            stats = self.__stats[prerolled]
+            stats[0] += 1
+            stats[1] += latency
+            stats[2] = max(stats[2], latency)
+
+        logger.debug(
+            f"Media started in {latency:.1f}ms"
+            + (" (pre-rolled)" if prerolled else "")
+        )
+
+    def summary(self, prerolled):
+        """Return (count, average, maximum) of the recorded latencies."""
+        with self.__lock:
+            count, total, maximum = self.__stats[prerolled]
+
+        return count, total / count if count else 0, maximum
+
+    def reset(self):
+        with self.__lock:
+            for stats in self.__stats.values():
+                stats[:] = [0, 0.0, 0.0]
+
+
+class GstPrerollManager:
+    """Keep the media of the upcoming cues pre-rolled.
+
+    The `count` cues starting from the standby one, and the cues they can
+    start (see `Cue.target_cues`), are kept PAUSED at their start position,
+    so that they start without delay. When the standby cue changes, the
+    media not needed anymore are brought back to READY.
+
+    With `count` set to 0 the standby media is only armed.
+
+    State changes can block (up to a second each), so they are done by a
+    worker of the `SharedWorkerPool`, one update at the time, when the
+    standby cue changes while updating, only the latest media are used.
+    """
+
+    def __init__(self, app, count=2):
+        """
+        :type app: lisp.application.Application
+        """
+        self.app = app
+        self.count = count
+
+        self.__lock = Lock()
+        self.__update_lock = Lock()
+        self.__media = []
+        self.__upcoming = None
+        # The media to pre-roll, None if there is no pending update
+        self.__scheduled = False
+
+    def update(self):
+        """Pre-roll the upcoming cues, call when the standby cue changes.
+
+        Returns immediately, the media are pre-rolled asynchronously.
+        """
+        # The layout must be accessed from the main thread
+        upcoming = self.__upcoming_media()
+
+        with self.__lock:
+            self.__upcoming = upcoming
+            if self.__scheduled:
+                return
+
+            self.__scheduled = True
+
+        SharedWorkerPool.submit(self.__run, priority=TaskPriority.Low)
+
+    def clear(self):
+        """Bring all the pre-rolled media back to READY.
+
+        Unlike `update`, this is synchronous, to be used before the media
+        are disposed (e.g. when the session is finalized).
+        """
+        with self.__update_lock:
+            with self.__lock:
+                self.__upcoming = None
+
+            for media in self.__media:
+                media.unpreroll()
+
+            self.__media = []
+
+    def __run(self):
+        while True:
+            with self.__update_lock:
+                with self.__lock:
+                    upcoming = self.__upcoming
+                    self.__upcoming = None
+
+                    if upcoming is None:
+                        self.__scheduled = False
+                        return
+
+                try:
+                    self.__update(upcoming)
+                except Exception:
+                    logger.exception("Cannot pre-roll the upcoming media.")
+
+    def __update(self, upcoming):
+        for media in self.__media:
+            if media not in upcoming:
+                media.unpreroll()
+
+        if self.count > 0:
+            for media in upcoming:
+                media.preroll()
+
+            self.__media = upcoming
+        else:
+            if upcoming:
+                upcoming[0].arm()
+
+            self.__media = []
+
+    def __upcoming_media(self):
+        layout = self.app.layout
+        index = layout.standby_index()
+        if index < 0:
+            return []
+
+        cues = []
+        for offset in range(max(self.count, 1)):
+            try:
+                cues.append(layout.cue_at(index + offset))
+            except IndexError:
+                break
+
+        for cue in list(cues):
+            cues.extend(cue.target_cues())
+
+        upcoming = []
+        for cue in cues:
+            if isinstance(cue, MediaCue) and cue.media not in upcoming:
+                upcoming.append(cue.media)
+
+        return upcoming
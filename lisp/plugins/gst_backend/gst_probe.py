@@ -0,0 +1,411 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from concurrent.futures import Future
+from heapq import heappush, heappop
+from itertools import count
+from threading import RLock
+
+from lisp import DEFAULT_CACHE_DIR
+from lisp.backend.analysis_cache import AnalysisCache
+from lisp.backend.audio_utils import audio_file_duration
+from lisp.backend.waveform import Waveform
+from lisp.core.singleton import Singleton
+from lisp.core.worker_pool import SharedWorkerPool, TaskPriority
+from lisp.plugins.gst_backend.gi_repository import Gst, GstPbutils
+from lisp.plugins.gst_backend.gst_utils import gst_parse_tags_list
+
+logger = logging.getLogger(__name__)
+
+# Short names of the GstAudioChannelPosition values, by bit position
+CHANNEL_POSITIONS = (
+    "FL",
+    "FR",
+    "FC",
+    "LFE",
+    "RL",
+    "RR",
+    "FLC",
+    "FRC",
+    "RC",
+    "LFE2",
+    "SL",
+    "SR",
+    "TFL",
+    "TFR",
+    "TFC",
+    "TC",
+    "TRL",
+    "TRR",
+    "TSL",
+    "TSR",
+    "TRC",
+    "BFC",
+    "BFL",
+    "BFR",
+    "WL",
+    "WR",
+    "SUL",
+    "SUR",
+)
+
+
+def channel_layout(channels, mask=0):
+    """Describe the channel layout, e.g. "FL FR", "mono" or "stereo"."""
+    if mask:
+        return " ".join(
+            name
+            for bit, name in enumerate(CHANNEL_POSITIONS)
+            if mask & (1 << bit)
+        )
+
+    if channels == 1:
+        return "mono"
+    if channels == 2:
+        return "stereo"
+
+    return ""
+
+
+def tag_value(value):
+    """Convert a tag value to a basic (JSON serializable) type.
+
+    Values without a meaningful text representation return None.
+    """
+    if isinstance(value, (bool, int, float, str)):
+        return value
+
+    to_iso8601 = getattr(value, "to_iso8601_string", None)
+    if to_iso8601 is not None:
+        # Gst.DateTime
+        return to_iso8601()
+
+    text = str(value)
+    if text != object.__str__(value):
+        return text
+
+
+class GstMediaProbe:
+    """Information about a media file, as discovered by GStreamer.
+
+    * `duration`: in milliseconds
+    * `tags`: {name: value}, values are converted to basic types
+    * `streams`: a dictionary for each stream, all of them with a "type"
+       (e.g. "audio", "video", "container") and the stream "caps",
+       audio streams provide "channels", "channel_mask", "channel_layout",
+       "sample_rate", "depth" and "bitrate", video streams "width",
+       "height" and "framerate"
+    """
+
+    VERSION = 1
+
+    def __init__(self, uri, duration=0, tags=None, streams=()):
+        """
+        :type uri: SessionURI
+        """
+        self.uri = uri
+        self.duration = duration
+        self.tags = tags if tags is not None else {}
+        self.streams = list(streams)
+
+    def audio_streams(self):
+        return [stream for stream in self.streams if stream["type"] == "audio"]
+
+    def video_streams(self):
+        return [stream for stream in self.streams if stream["type"] == "video"]
+
+    @classmethod
+    def from_info(cls, uri, info):
+        """
+        :type uri: SessionURI
+        :type info: GstPbutils.DiscovererInfo
+        """
+        duration = info.get_duration() // Gst.MSECOND
+        if duration <= 0 and uri.is_local:
+            duration = audio_file_duration(uri.absolute_path)
+
+        tags = {}
+        gst_tags = info.get_tags()
+        if gst_tags is not None:
+            for name, value in gst_parse_tags_list(gst_tags).items():
+                value = tag_value(value)
+                if value is not None:
+                    tags[name] = value
+
+        streams = []
+        for stream in info.get_stream_list():
+            caps = stream.get_caps()
+            entry = {
+                "type": stream.get_stream_type_nick(),
+                "caps": caps.to_string() if caps is not None else "",
+            }
+
+            if isinstance(stream, GstPbutils.DiscovererAudioInfo):
+                channels = stream.get_channels()
+                # Available since GStreamer 1.14
+                get_mask = getattr(stream, "get_channel_mask", None)
+                mask = get_mask() if get_mask is not None else 0
+
+                entry.update(
+                    channels=channels,
+                    channel_mask=mask,
+                    channel_layout=channel_layout(channels, mask),
+                    sample_rate=stream.get_sample_rate(),
+                    depth=stream.get_depth(),
+                    bitrate=stream.get_bitrate(),
+                )
+            elif isinstance(stream, GstPbutils.DiscovererVideoInfo):
+                denom = stream.get_framerate_denom()
+                entry.update(
+                    width=stream.get_width(),
+                    height=stream.get_height(),
+                    framerate=(
+                        stream.get_framerate_num() / denom if denom else 0
+                    ),
+                )
+
+            streams.append(entry)
+
+        return cls(uri, max(duration, 0), tags, streams)
+
+    @classmethod
+    def from_dict(cls, uri, data):
+        """Return the probe stored with `to_dict`, None if not valid."""
+        if data.get("version") == cls.VERSION:
+            return cls(
+                uri,
+                data.get("duration", 0),
+                data.get("tags", {}),
+                data.get("streams", ()),
+            )
+
+    def to_dict(self):
+        # The uri is not stored, the same content can be in multiple files
+        return {
+            "version": self.VERSION,
+            "duration": self.duration,
+            "tags": self.tags,
+            "streams": self.streams,
+        }
+
+
+class ProbePriority:
+    # Someone is waiting for the result (e.g. a dialog)
+    High = 0
+    Normal = 1
+    Background = 2
+
+
+class _Job:
+    __slots__ = ("uri", "priority", "future", "started")
+
+    def __init__(self, uri, priority):
+        self.uri = uri
+        self.priority = priority
+        self.future = Future()
+        self.started = False
+
+
+class GstProbeService(metaclass=Singleton):
+    """Probe media files in background, caching the results.
+
+    Requests are processed by priority (see :class:`ProbePriority`), and
+    at most `workers` files are probed at the same time, the GStreamer
+    discoverers are reused among requests.
+
+    The results of local files are stored in the `AnalysisCache`, keyed
+    by the file content-hash, so a file is discovered again only when
+    its content changes (not when moved, or copied).
+
+    Requests for the same file (by URI) are merged.
+    """
+
+    def __init__(self, workers=2, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+        self.__workers = max(1, workers)
+        self.__lock = RLock()
+        self.__counter = count()
+
+        self.__queue = []
+        self.__jobs = {}
+        self.__running = 0
+        self.__discoverers = []
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    @workers.setter
+    def workers(self, workers):
+        with self.__lock:
+            self.__workers = max(1, workers)
+
+        self.__schedule()
+
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @cache_dir.setter
+    def cache_dir(self, cache_dir):
+        self.__cache_dir = cache_dir if cache_dir else DEFAULT_CACHE_DIR
+
+    def probe(self, uri, priority=ProbePriority.Normal):
+        """Request the information of the given media.
+
+        The result of the returned future is a `GstMediaProbe`, or None if
+        the media cannot be probed, callbacks are called in a worker thread.
+        Requesting again an already scheduled media only raises its priority,
+        when higher.
+
+        :type uri: SessionURI
+        :param priority: the request priority, see ProbePriority
+        :rtype: concurrent.futures.Future
+        """
+        key = uri.uri
+
+        with self.__lock:
+            job = self.__jobs.get(key)
+            if job is None:
+                job = self.__jobs[key] = _Job(uri, priority)
+                self.__push(job)
+            elif priority < job.priority and not job.started:
+                job.priority = priority
+                # The old queue entry will be discarded
+                self.__push(job)
+
+        self.__schedule()
+        return job.future
+
+    def probe_many(self, uris, priority=ProbePriority.Background):
+        """Request the information of many media.
+
+        :rtype: list[concurrent.futures.Future]
+        """
+        return [self.probe(uri, priority) for uri in uris]
+
+    def cancel_all(self):
+        """Cancel all the requests not yet started."""
+        with self.__lock:
+            jobs = [job for job in self.__jobs.values() if not job.started]
+            for job in jobs:
+                self.__jobs.pop(job.uri.uri)
+
+            self.__queue.clear()
+
+        for job in jobs:
+            job.future.cancel()
+
+    def pending(self):
+        """Number of files waiting to be probed."""
+        with self.__lock:
+            return len(self.__jobs) - self.__running
+
+    def __push(self, job):
+        heappush(self.__queue, (job.priority, next(self.__counter), job))
+
+    def __schedule(self):
+        with self.__lock:
+            while self.__queue and self.__running < self.__workers:
+                priority, _, job = heappop(self.__queue)
+                if (
+                    job.started
+                    or priority != job.priority
+                    or self.__jobs.get(job.uri.uri) is not job
+                ):
+                    # Stale entry
+                    continue
+
+                job.started = True
+                self.__running += 1
+
+                SharedWorkerPool.submit(
+                    self.__run,
+                    job,
+                    priority=(
+                        TaskPriority.High
+                        if priority == ProbePriority.High
+                        else TaskPriority.Low
+                    ),
+                )
+
+    def __run(self, job):
+        probe = None
+        try:
+            if job.future.set_running_or_notify_cancel():
+                probe = self.__probe(job.uri)
+        except Exception:
+            logger.warning(f"Cannot probe media: {job.uri.uri}", exc_info=True)
+        finally:
+            with self.__lock:
+                self.__running -= 1
+                self.__jobs.pop(job.uri.uri, None)
+
+            self.__schedule()
+
+        if job.future.running():
+            job.future.set_result(probe)
+
+    def __probe(self, uri):
+        fingerprint = ""
+        cache = AnalysisCache(self.__cache_dir)
+
+        if uri.is_local:
+            try:
+                fingerprint = Waveform.file_fingerprint(
+                    self.__cache_dir, uri.absolute_path
+                )
+            except OSError:
+                # e.g. a missing file, the discoverer will report it
+                pass
+
+        if fingerprint:
+            probe = GstMediaProbe.from_dict(
+                uri, cache.load(fingerprint).get("probe", {})
+            )
+            if probe is not None:
+                self.hits += 1
+                return probe
+
+        self.misses += 1
+
+        info = self.__discover(uri)
+        if info is not None:
+            probe = GstMediaProbe.from_info(uri, info)
+            cache.store(fingerprint, {"probe": probe.to_dict()})
+            return probe
+
+    def __discover(self, uri):
+        with self.__lock:
+            discoverer = (
+                self.__discoverers.pop() if self.__discoverers else None
+            )
+
+        if discoverer is None:
+            discoverer = GstPbutils.Discoverer()
+
+        try:
+            return discoverer.discover_uri(uri.uri)
+        except Exception:
+            logger.debug(f"Cannot discover media: {uri.uri}", exc_info=True)
+        finally:
+            with self.__lock:
+                self.__discoverers.append(discoverer)
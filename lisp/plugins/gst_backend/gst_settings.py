@@ -16,9 +16,19 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 from PyQt5.QtCore import Qt, QT_TRANSLATE_NOOP
-from PyQt5.QtWidgets import QVBoxLayout, QGroupBox, QLabel
+from PyQt5.QtWidgets import (
+    QVBoxLayout,
+    QGroupBox,
+    QLabel,
+    QGridLayout,
+    QSpinBox,
+    QCheckBox,
+    QComboBox,
+)
 
+from lisp.plugins.gst_backend.gst_mixer import MIXER_SINKS
 from lisp.plugins.gst_backend.gst_pipe_edit import GstPipeEdit
+from lisp.plugins.gst_backend.gst_preroll import StartLatency
 from lisp.ui.settings.pages import SettingsPage
 from lisp.ui.ui_utils import translate
 
@@ -26,6 +36,13 @@ from lisp.ui.ui_utils import translate
 class GstSettings(SettingsPage):
     Name = QT_TRANSLATE_NOOP("SettingsPageName", "GStreamer")
 
+    MixerSinksNames = {
+        "autoaudiosink": QT_TRANSLATE_NOOP("GstSettings", "System default"),
+        "pulsesink": QT_TRANSLATE_NOOP("GstSettings", "PulseAudio"),
+        "alsasink": QT_TRANSLATE_NOOP("GstSettings", "ALSA"),
+        "jackaudiosink": QT_TRANSLATE_NOOP("GstSettings", "JACK"),
+    }
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.setLayout(QVBoxLayout())
@@ -48,6 +65,65 @@ class GstSettings(SettingsPage):
         self.pipeEdit = GstPipeEdit("", app_mode=True)
         self.pipeGroup.layout().addWidget(self.pipeEdit)
 
+        self.resourcesGroup = QGroupBox(self)
+        self.resourcesGroup.setLayout(QGridLayout())
+        self.layout().addWidget(self.resourcesGroup)
+
+        self.idlePipelinesLabel = QLabel(self.resourcesGroup)
+        self.resourcesGroup.layout().addWidget(self.idlePipelinesLabel, 0, 0)
+
+        self.idlePipelinesSpin = QSpinBox(self.resourcesGroup)
+        self.idlePipelinesSpin.setRange(0, 1000)
+        self.resourcesGroup.layout().addWidget(self.idlePipelinesSpin, 0, 1)
+
+        self.prerollLabel = QLabel(self.resourcesGroup)
+        self.resourcesGroup.layout().addWidget(self.prerollLabel, 1, 0)
+
+        self.prerollSpin = QSpinBox(self.resourcesGroup)
+        self.prerollSpin.setRange(0, 32)
+        self.resourcesGroup.layout().addWidget(self.prerollSpin, 1, 1)
+
+        self.mixerOutputLabel = QLabel(self.resourcesGroup)
+        self.resourcesGroup.layout().addWidget(self.mixerOutputLabel, 2, 0)
+
+        self.mixerOutputCombo = QComboBox(self.resourcesGroup)
+        for sink_name in MIXER_SINKS:
+            self.mixerOutputCombo.addItem("", sink_name)
+        self.resourcesGroup.layout().addWidget(self.mixerOutputCombo, 2, 1)
+
+        self.probeWorkersLabel = QLabel(self.resourcesGroup)
+        self.resourcesGroup.layout().addWidget(self.probeWorkersLabel, 3, 0)
+
+        self.probeWorkersSpin = QSpinBox(self.resourcesGroup)
+        self.probeWorkersSpin.setRange(1, 16)
+        self.resourcesGroup.layout().addWidget(self.probeWorkersSpin, 3, 1)
+
+        self.latencyLabel = QLabel(self.resourcesGroup)
+        self.latencyLabel.setAlignment(Qt.AlignCenter)
+        self.resourcesGroup.layout().addWidget(self.latencyLabel, 4, 0, 1, 2)
+
+        self.resourcesGroup.layout().setColumnStretch(0, 3)
+        self.resourcesGroup.layout().setColumnStretch(1, 1)
+
+        self.waveformGroup = QGroupBox(self)
+        self.waveformGroup.setLayout(QGridLayout())
+        self.layout().addWidget(self.waveformGroup)
+
+        self.waveformWorkersLabel = QLabel(self.waveformGroup)
+        self.waveformGroup.layout().addWidget(self.waveformWorkersLabel, 0, 0)
+
+        self.waveformWorkersSpin = QSpinBox(self.waveformGroup)
+        self.waveformWorkersSpin.setRange(1, 16)
+        self.waveformGroup.layout().addWidget(self.waveformWorkersSpin, 0, 1)
+
+        self.waveformPregenerateCheck = QCheckBox(self.waveformGroup)
+        self.waveformGroup.layout().addWidget(
+            self.waveformPregenerateCheck, 1, 0, 1, 2
+        )
+
+        self.waveformGroup.layout().setColumnStretch(0, 3)
+        self.waveformGroup.layout().setColumnStretch(1, 1)
+
         self.retranslateUi()
 
     def retranslateUi(self):
@@ -56,8 +132,77 @@ class GstSettings(SettingsPage):
             translate("GstSettings", "Applied only to new cues.")
         )
 
+        self.resourcesGroup.setTitle(translate("GstSettings", "Resources"))
+        self.idlePipelinesLabel.setText(
+            translate("GstSettings", "Idle media kept ready for playback")
+        )
+        self.prerollLabel.setText(
+            translate("GstSettings", "Upcoming cues to pre-load (0 = disabled)")
+        )
+        self.mixerOutputLabel.setText(
+            translate("GstSettings", 'Output of the "Mixer Out" element')
+        )
+        for index, sink_name in enumerate(MIXER_SINKS):
+            self.mixerOutputCombo.setItemText(
+                index, translate("GstSettings", self.MixerSinksNames[sink_name])
+            )
+        self.probeWorkersLabel.setText(
+            translate("GstSettings", "Media files to inspect at the same time")
+        )
+        self.updateLatencyStats()
+
+        self.waveformGroup.setTitle(translate("GstSettings", "Waveforms"))
+        self.waveformWorkersLabel.setText(
+            translate("GstSettings", "Files to process at the same time")
+        )
+        self.waveformPregenerateCheck.setText(
+            translate("GstSettings", "Generate all waveforms on session load")
+        )
+
+    def updateLatencyStats(self):
+        prerolled = StartLatency().summary(True)
+        cold = StartLatency().summary(False)
+
+        self.latencyLabel.setText(
+            translate(
+                "GstSettings",
+                "Start latency, pre-loaded: {:.1f}ms avg, {:.1f}ms max ({}) - "
+                "not pre-loaded: {:.1f}ms avg, {:.1f}ms max ({})",
+            ).format(
+                prerolled[1],
+                prerolled[2],
+                prerolled[0],
+                cold[1],
+                cold[2],
+                cold[0],
+            )
+        )
+
     def loadSettings(self, settings):
         self.pipeEdit.set_pipe(settings["pipeline"])
+        self.idlePipelinesSpin.setValue(settings.get("maxIdlePipelines", 16))
+        self.prerollSpin.setValue(settings.get("prerollCues", 2))
+        self.mixerOutputCombo.setCurrentIndex(
+            max(
+                self.mixerOutputCombo.findData(
+                    settings.get("mixerOutput", "autoaudiosink")
+                ),
+                0,
+            )
+        )
+        self.probeWorkersSpin.setValue(settings.get("probeWorkers", 2))
+        self.waveformWorkersSpin.setValue(settings.get("waveformWorkers", 2))
+        self.waveformPregenerateCheck.setChecked(
+            settings.get("waveformPregenerate", False)
+        )
 
     def getSettings(self):
-        return {"pipeline": list(self.pipeEdit.get_pipe())}
+        return {
+            "pipeline": list(self.pipeEdit.get_pipe()),
+            "maxIdlePipelines": self.idlePipelinesSpin.value(),
+            "prerollCues": self.prerollSpin.value(),
+            "mixerOutput": self.mixerOutputCombo.currentData(),
+            "probeWorkers": self.probeWorkersSpin.value(),
+            "waveformWorkers": self.waveformWorkersSpin.value(),
+            "waveformPregenerate": self.waveformPregenerateCheck.isChecked(),
+        }
@@ -0,0 +1,107 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+
+from lisp.plugins.gst_backend.gi_repository import Gst
+
+
+class GstStateTracker:
+    """Cache the state of a pipeline, without querying it.
+
+    The state is updated from the pipeline STATE_CHANGED messages, handled
+    synchronously (in the thread posting them), so that it's never behind
+    the actual state, as it could be using the (asynchronous) bus watch.
+
+    The pipeline bus is set flushing in the NULL state, so the messages for
+    the changes to NULL are lost, `set_state` must be used for those.
+    """
+
+    __Trackers = {}
+    __TrackersLock = Lock()
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+
+        self.__lock = Lock()
+        self.__state = Gst.State.NULL
+
+        bus = self.pipeline.get_bus()
+        bus.enable_sync_message_emission()
+        self.__handler = bus.connect(
+            "sync-message::state-changed", self.__on_state_changed
+        )
+
+        with GstStateTracker.__TrackersLock:
+            GstStateTracker.__Trackers[pipeline.get_name()] = self
+
+    @classmethod
+    def get(cls, pipeline):
+        """Return the tracker of the given pipeline, if any.
+
+        :rtype: GstStateTracker | None
+        """
+        with cls.__TrackersLock:
+            return cls.__Trackers.get(pipeline.get_name())
+
+    @property
+    def state(self):
+        with self.__lock:
+            return self.__state
+
+    def set_state(self, state):
+        """Change the pipeline state, same as `Gst.Element.set_state`."""
+        result = self.pipeline.set_state(state)
+        if state == Gst.State.NULL:
+            with self.__lock:
+                self.__state = Gst.State.NULL
+
+        return result
+
+    def query(self, timeout=Gst.MSECOND):
+        """Query the pipeline state, synchronously, and update the cache."""
+        state = self.pipeline.get_state(timeout)[1]
+        with self.__lock:
+            self.__state = state
+
+        return state
+
+    def dispose(self):
+        bus = self.pipeline.get_bus()
+        bus.disconnect(self.__handler)
+        bus.disable_sync_message_emission()
+
+        with GstStateTracker.__TrackersLock:
+            GstStateTracker.__Trackers.pop(self.pipeline.get_name(), None)
+
+    def __on_state_changed(self, bus, message):
+        if message.src == self.pipeline:
+            state = message.parse_state_changed()[1]
+            with self.__lock:
+                self.__state = state
+
+
+def gst_pipeline_state(pipeline):
+    """Return the state of the pipeline, cached if possible.
+
+    :type pipeline: Gst.Pipeline
+    """
+    tracker = GstStateTracker.get(pipeline)
+    if tracker is not None:
+        return tracker.state
+
+    return pipeline.get_state(Gst.MSECOND)[1]
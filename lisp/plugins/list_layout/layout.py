@@ -19,11 +19,14 @@ from PyQt5.QtCore import Qt, QT_TRANSLATE_NOOP, QTimer
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import QAction
 
+from lisp.backend import get_backend
+from lisp.backend.waveform_service import WaveformService, WaveformPriority
 from lisp.command.model import ModelInsertItemsCommand
 from lisp.core.configuration import DummyConfiguration
 from lisp.core.properties import ProxyProperty
 from lisp.core.signal import Connection
 from lisp.cues.cue import Cue, CueAction, CueNextAction
+from lisp.cues.media_cue import MediaCue
 from lisp.layout.cue_layout import CueLayout
 from lisp.layout.cue_menu import (
     SimpleMenuAction,
@@ -69,6 +72,7 @@ class ListLayout(CueLayout):
         self._running_model = RunningCueModel(self.cue_model)
         self._go_timer = QTimer()
         self._go_timer.setSingleShot(True)
+        self._standby_waveform = None
 
         self._view = ListLayoutView(
             self._list_model, self._running_model, self.Config
@@ -88,9 +92,10 @@ class ListLayout(CueLayout):
             self.interrupt_all
         )
         # Cue list
-        self._view.listView.itemDoubleClicked.connect(self._double_clicked)
+        self._view.listView.doubleClicked.connect(self._double_clicked)
         self._view.listView.contextMenuInvoked.connect(self._context_invoked)
         self._view.listView.keyPressed.connect(self._key_pressed)
+        self._view.listView.standbyIndexChanged.connect(self.__standby_changed)
 
         # Layout menu
         layout_menu = self.app.window.menuLayout
@@ -241,10 +246,8 @@ class ListLayout(CueLayout):
         return self._list_model.item(index)
 
     def selected_cues(self, cue_type=Cue):
-        for item in self._view.listView.selectedItems():
-            yield self._list_model.item(
-                self._view.listView.indexOfTopLevelItem(item)
-            )
+        for row in self._view.listView.selectedRows():
+            yield self._list_model.item(row)
 
     def finalize(self):
         # Clean layout menu
@@ -256,20 +259,25 @@ class ListLayout(CueLayout):
 
     def select_all(self, cue_type=Cue):
         if self.selection_mode:
-            for index in range(self._view.listView.topLevelItemCount()):
-                if isinstance(self._list_model.item(index), cue_type):
-                    self._view.listView.topLevelItem(index).setSelected(True)
+            self._view.listView.setRowsSelected(
+                index
+                for index, cue in enumerate(self._list_model)
+                if isinstance(cue, cue_type)
+            )
 
     def deselect_all(self, cue_type=Cue):
-        for index in range(self._view.listView.topLevelItemCount()):
-            if isinstance(self._list_model.item(index), cue_type):
-                self._view.listView.topLevelItem(index).setSelected(False)
+        self._view.listView.setRowsSelected(
+            (
+                index
+                for index, cue in enumerate(self._list_model)
+                if isinstance(cue, cue_type)
+            ),
+            False,
+        )
 
     def invert_selection(self):
         if self.selection_mode:
-            for index in range(self._view.listView.topLevelItemCount()):
-                item = self._view.listView.topLevelItem(index)
-                item.setSelected(not item.isSelected())
+            self._view.listView.invertSelection()
 
     def _key_pressed(self, event):
         event.ignore()
@@ -360,7 +368,7 @@ class ListLayout(CueLayout):
 
             standby = self.standby_index()
             if standby >= 0:
-                self._view.listView.topLevelItem(standby).setSelected(True)
+                self._view.listView.setRowsSelected((standby,))
         else:
             self.deselect_all()
             self._view.listView.setSelectionMode(CueListView.NoSelection)
@@ -388,7 +396,7 @@ class ListLayout(CueLayout):
 
     def _context_invoked(self, event):
         # This is called in response to CueListView context-events
-        if self._view.listView.itemAt(event.pos()) is not None:
+        if self._view.listView.indexAt(event.pos()).isValid():
             cues = list(self.selected_cues())
             if not cues:
                 context_index = self._view.listView.indexAt(event.pos())
@@ -423,6 +431,25 @@ class ListLayout(CueLayout):
             self._go_timer.setInterval(ListLayout.Config.get("goDelay"))
             self._go_timer.start()
 
+    def __standby_changed(self, *_):
+        # Prepare the waveform of the standby cue, before it's started
+        if self._standby_waveform is not None:
+            WaveformService().cancel(self._standby_waveform)
+            self._standby_waveform = None
+
+        cue = self.standby_cue()
+        if (
+            ListLayout.Config.get("show.waveformSlider", False)
+            and isinstance(cue, MediaCue)
+            and cue.media.input_uri() is not None
+        ):
+            self._standby_waveform = get_backend().media_waveform(cue.media)
+            WaveformService().request(
+                self._standby_waveform, WaveformPriority.Standby
+            )
+
+        self.standby_changed.emit()
+
     def __cue_added(self, cue):
         cue.next.connect(self.__cue_next, Connection.QtQueued)
 
@@ -0,0 +1,367 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from PyQt5.QtCore import QRect, Qt, QSize
+from PyQt5.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontDatabase,
+    QFontMetrics,
+    QPainter,
+    QPainterPath,
+    QPalette,
+    QPen,
+)
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+from lisp.core.util import strtime
+from lisp.cues.cue import CueNextAction, CueState
+from lisp.ui.icons import IconTheme
+
+# Role used to retrieve the cue of a row
+CueRole = Qt.UserRole + 1
+
+AFTER_END_ACTIONS = (
+    CueNextAction.TriggerAfterEnd.value,
+    CueNextAction.SelectAfterEnd.value,
+)
+AFTER_WAIT_ACTIONS = (
+    CueNextAction.TriggerAfterWait.value,
+    CueNextAction.SelectAfterWait.value,
+)
+
+
+class CueItemDelegate(QStyledItemDelegate):
+    """Base delegate for the cues list.
+
+    Paint the row background, highlighting the standby (current) cue,
+    no widget is created for the rows, so only the visible ones are painted.
+    """
+
+    ROW_HEIGHT = 26
+    TEXT_MARGIN = 8
+
+    STANDBY_BG = QBrush(QColor(250, 220, 0, 100))
+
+    def __init__(self, view):
+        """
+        :type view: lisp.plugins.list_layout.list_view.CueListView
+        """
+        super().__init__(view)
+        self.view = view
+        self.__metrics = {}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+
+        if index.row() == self.view.standbyIndex():
+            option.backgroundBrush = self.STANDBY_BG
+            # The cue text color is used only for the other rows
+            option.palette.setBrush(
+                QPalette.Text, self.view.palette().brush(QPalette.Text)
+            )
+
+    def sizeHint(self, option, index):
+        # Called for every visible cell on each layout, avoid the (much
+        # slower) style-based implementation
+        metrics = self.fontMetrics(self.cellFont(option, index))
+        return QSize(
+            self.contentWidth(metrics, index),
+            max(metrics.height() + self.TEXT_MARGIN, self.ROW_HEIGHT),
+        )
+
+    def cellFont(self, option, index):
+        font = index.data(Qt.FontRole)
+        return font if font is not None else option.font
+
+    def contentWidth(self, metrics, index):
+        text = index.data(Qt.DisplayRole)
+        if text:
+            return (
+                metrics.size(Qt.TextSingleLine, text).width() + self.TEXT_MARGIN
+            )
+
+        return 0
+
+    def fontMetrics(self, font):
+        """Return the (cached) metrics of the given font."""
+        metrics = self.__metrics.get(font.key())
+        if metrics is None:
+            metrics = self.__metrics[font.key()] = QFontMetrics(font)
+
+        return metrics
+
+    def paintBackground(self, painter, option, index):
+        """Paint background and selection, without text or decoration.
+
+        :return: the style option, initialized for the given index
+        """
+        option = type(option)(option)
+        self.initStyleOption(option, index)
+        option.text = ""
+
+        style = option.widget.style() if option.widget else self.view.style()
+        style.drawControl(
+            QStyle.CE_ItemViewItem, option, painter, option.widget
+        )
+
+        return option
+
+
+class IndexDelegate(CueItemDelegate):
+    def contentWidth(self, metrics, index):
+        # Provide some spacing, depending on the current font
+        return (
+            super().contentWidth(metrics, index)
+            + metrics.size(Qt.TextSingleLine, "00").width()
+        )
+
+
+class NameDelegate(CueItemDelegate):
+    pass
+
+
+class CueStatusDelegate(CueItemDelegate):
+    MARGIN = 6
+
+    def paint(self, painter, option, index):
+        self.paintBackground(painter, option, index)
+
+        cue = index.data(CueRole)
+        rect = option.rect
+        indicator_height = rect.height()
+        indicator_width = indicator_height // 2
+        status_size = indicator_height - self.MARGIN * 2
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.translate(rect.topLeft())
+
+        if index.row() == self.view.standbyIndex():
+            # Draw something like this
+            # |‾\
+            # |  \
+            # |  /
+            # |_/
+            path = QPainterPath()
+            path.moveTo(0, 1)
+            path.lineTo(0, indicator_height - 1)
+            path.lineTo(indicator_width // 3, indicator_height - 1)
+            path.lineTo(indicator_width, indicator_width)
+            path.lineTo(indicator_width // 3, 1)
+            path.lineTo(0, 1)
+
+            painter.setPen(QPen(QBrush(QColor(0, 0, 0)), 2))
+            painter.setBrush(QBrush(QColor(250, 220, 0)))
+            painter.drawPath(path)
+
+        icon = self.stateIcon(cue.state)
+        if icon is not None:
+            painter.drawPixmap(
+                QRect(
+                    indicator_width + self.MARGIN,
+                    self.MARGIN,
+                    status_size,
+                    status_size,
+                ),
+                icon.pixmap(status_size),
+            )
+
+        painter.restore()
+
+    @staticmethod
+    def stateIcon(state):
+        if state & CueState.Running:
+            return IconTheme.get("led-running")
+        elif state & CueState.Pause:
+            return IconTheme.get("led-pause")
+        elif state & CueState.Error:
+            return IconTheme.get("led-error")
+
+
+class NextActionDelegate(CueItemDelegate):
+    SIZE = 16
+
+    def paint(self, painter, option, index):
+        self.paintBackground(painter, option, index)
+
+        next_action = index.data(CueRole).next_action
+        if next_action in AFTER_END_ACTIONS + AFTER_WAIT_ACTIONS:
+            if next_action in (
+                CueNextAction.TriggerAfterWait.value,
+                CueNextAction.TriggerAfterEnd.value,
+            ):
+                icon = IconTheme.get("cue-trigger-next")
+            else:
+                icon = IconTheme.get("cue-select-next")
+
+            rect = QRect(0, 0, self.SIZE, self.SIZE)
+            rect.moveCenter(option.rect.center())
+            painter.drawPixmap(rect, icon.pixmap(self.SIZE))
+
+
+class TimeDelegate(CueItemDelegate):
+    """Paint a time as a progress-bar, with the text in the middle.
+
+    Subclasses provide the values with `timeInfo`.
+    """
+
+    BORDERS = {
+        "running": QColor(0, 255, 0),
+        "pause": QColor(255, 170, 0),
+        "error": QColor(255, 0, 0),
+    }
+    CHUNKS = {
+        "running": QColor(0, 162, 34),
+        "pause": QColor(255, 136, 0),
+        "error": QColor(204, 0, 0),
+    }
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        self.accurateTime = True
+        self.showZeroDuration = False
+
+    def timeInfo(self, cue):
+        """Return the values to display.
+
+        :return: (current-time, duration, style), the time is None when
+                 the cue is not running/paused, times are in milliseconds
+        """
+        raise NotImplementedError
+
+    def cellFont(self, option, index):
+        return self.timeFont(index)
+
+    def contentWidth(self, metrics, index):
+        return (
+            metrics.size(Qt.TextSingleLine, "00:00:00.00").width()
+            + self.TEXT_MARGIN
+        )
+
+    def timeFont(self, index):
+        """The fixed-width font, with the size of the cue font (if any)."""
+        cueFont = index.data(Qt.FontRole)
+        if cueFont is None:
+            return self.font
+
+        font = QFont(self.font)
+        font.setPointSizeF(cueFont.pointSizeF())
+        return font
+
+    def paint(self, painter, option, index):
+        option = self.paintBackground(painter, option, index)
+
+        time, duration, style = self.timeInfo(index.data(CueRole))
+        showDuration = duration > 0 or self.showZeroDuration
+        rect = option.rect.adjusted(1, 1, -2, -2)
+
+        painter.save()
+
+        if time is not None and duration > 0:
+            chunk = QRect(rect)
+            chunk.setWidth(int(rect.width() * min(time / duration, 1)))
+            painter.fillRect(chunk, self.CHUNKS.get(style, Qt.transparent))
+
+        border = self.BORDERS.get(style)
+        if border is not None:
+            painter.setPen(border)
+            painter.drawRect(rect)
+
+        if time is not None or showDuration:
+            group = QPalette.Active if duration > 0 else QPalette.Disabled
+            painter.setPen(option.palette.color(group, QPalette.Text))
+            painter.setFont(self.timeFont(index))
+            painter.drawText(
+                rect,
+                Qt.AlignCenter,
+                strtime(
+                    time if time is not None else duration,
+                    accurate=self.accurateTime,
+                ),
+            )
+
+        painter.restore()
+
+    @staticmethod
+    def styleOf(state, running, paused):
+        if state & running:
+            return "running"
+        if state & paused:
+            return "pause"
+        if state & CueState.Error:
+            return "error"
+
+        return "stop"
+
+
+class CueTimeDelegate(TimeDelegate):
+    def timeInfo(self, cue):
+        state = cue.state
+        style = self.styleOf(state, CueState.Running, CueState.Pause)
+        if style in ("running", "pause") and cue.duration > 0:
+            return cue.current_time(), cue.duration, style
+
+        return None, cue.duration, style
+
+
+class PreWaitDelegate(TimeDelegate):
+    def __init__(self, view):
+        super().__init__(view)
+        self.showZeroDuration = True
+
+    def timeInfo(self, cue):
+        style = self.styleOf(
+            cue.state, CueState.PreWait, CueState.PreWait_Pause
+        )
+        # The wait time is in seconds, we need milliseconds
+        duration = cue.pre_wait * 1000
+        if style in ("running", "pause"):
+            return int(cue.prewait_time() * 100) * 10, duration, style
+
+        return None, duration, "stop"
+
+
+class PostWaitDelegate(TimeDelegate):
+    def __init__(self, view):
+        super().__init__(view)
+        self.showZeroDuration = True
+
+    def timeInfo(self, cue):
+        state = cue.state
+        if cue.next_action in AFTER_END_ACTIONS:
+            # Follow the cue time
+            style = self.styleOf(state, CueState.Running, CueState.Pause)
+            if style == "error":
+                style = "stop"
+            elif style in ("running", "pause") and cue.duration > 0:
+                return cue.current_time(), cue.duration, style
+
+            return None, cue.duration, style
+
+        duration = cue.post_wait
+        if cue.next_action in AFTER_WAIT_ACTIONS:
+            # The wait time is in seconds, we need milliseconds
+            duration *= 1000
+
+        style = self.styleOf(state, CueState.PostWait, CueState.PostWait_Pause)
+        if style in ("running", "pause"):
+            return int(cue.postwait_time() * 100) * 10, duration, style
+
+        return None, duration, "stop"
@@ -18,98 +18,389 @@
 from PyQt5.QtCore import (
     pyqtSignal,
     Qt,
+    QAbstractTableModel,
+    QByteArray,
     QDataStream,
     QIODevice,
+    QMimeData,
+    QModelIndex,
+    QPoint,
+    QRect,
     QT_TRANSLATE_NOOP,
     QTimer,
+    QItemSelection,
+    QItemSelectionModel,
 )
-from PyQt5.QtGui import QKeyEvent, QContextMenuEvent, QBrush, QColor
-from PyQt5.QtWidgets import QTreeWidget, QHeaderView, QTreeWidgetItem
+from PyQt5.QtGui import (
+    QKeyEvent,
+    QContextMenuEvent,
+    QBrush,
+    QColor,
+    QFont,
+    QRegion,
+)
+from PyQt5.QtWidgets import QTreeView, QHeaderView
 
 from lisp.application import Application
 from lisp.backend import get_backend
 from lisp.command.model import ModelMoveItemsCommand, ModelInsertItemsCommand
-from lisp.core.util import subdict
-from lisp.plugins.list_layout.list_widgets import (
-    CueStatusIcons,
-    NameWidget,
-    PreWaitWidget,
-    CueTimeWidget,
-    NextActionIcon,
-    PostWaitWidget,
-    IndexWidget,
+from lisp.core.signal import Connection
+from lisp.cues.cue import CueNextAction, CueState
+from lisp.plugins.list_layout.list_delegates import (
+    CueRole,
+    CueStatusDelegate,
+    NameDelegate,
+    PreWaitDelegate,
+    CueTimeDelegate,
+    NextActionDelegate,
+    PostWaitDelegate,
+    IndexDelegate,
 )
-from lisp.ui.ui_utils import translate, css_to_dict, dict_to_css
+from lisp.ui.ui_utils import translate, css_to_dict
+from lisp.ui.widgets.cue_next_actions import tr_next_action
 
 
 class ListColumn:
-    def __init__(self, name, widget, resize=None, width=None, visible=True):
+    def __init__(
+        self,
+        name,
+        delegate,
+        resize=None,
+        width=None,
+        visible=True,
+        text=None,
+        alignment=None,
+        tooltip=None,
+        timed=False,
+    ):
+        """
+        :param delegate: the delegate class painting the column
+        :param text: called with the cue, return the column text
+        :param tooltip: called with the cue, return the column tooltip
+        :param timed: the column content changes over time (when running)
+        """
         self.baseName = name
-        self.widget = widget
+        self.delegate = delegate
         self.resize = resize
         self.width = width
         self.visible = visible
+        self.text = text
+        self.alignment = alignment
+        self.tooltip = tooltip
+        self.timed = timed
 
     @property
     def name(self):
         return translate("ListLayoutHeader", self.baseName)
 
 
-class CueTreeWidgetItem(QTreeWidgetItem):
-    def __init__(self, cue, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+def _runs(indexes):
+    """Group the indexes in (first, last) runs of consecutive values."""
+    runs = []
+    for index in sorted(indexes):
+        if runs and runs[-1][1] == index - 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+
+    return runs
+
+
+class CueListItemModel(QAbstractTableModel):
+    """Expose a `CueListModel` to Qt views, one row for each cue.
+
+    Rows are kept in a separate list, so that the changes (already applied
+    in the list model) are notified to Qt in the expected way, each batch of
+    changes is notified in contiguous ranges.
+    """
+
+    MimeType = "application/x-lisp-cue-rows"
+
+    # Emitted when a cue state may be changed, from the cue thread
+    cuesStateChanged = pyqtSignal()
+
+    # The cue signals emitted when leaving a non-running state (stopped,
+    # paused or in error), the other changes are tracked while running
+    STATE_SIGNALS = (
+        "started",
+        "stopped",
+        "interrupted",
+        "error",
+        "prewait_start",
+        "prewait_stopped",
+        "postwait_start",
+        "postwait_stopped",
+    )
+
+    # Properties affecting the painted rows
+    DISPLAY_PROPERTIES = {
+        "name",
+        "stylesheet",
+        "duration",
+        "pre_wait",
+        "post_wait",
+        "next_action",
+    }
+
+    def __init__(self, listModel, columns, parent=None):
+        """
+        :type listModel: lisp.plugins.list_layout.models.CueListModel
+        :type columns: list[ListColumn]
+        """
+        super().__init__(parent)
+        self.columns = columns
+
+        self.__rows = []
+        self.__styles = {}
+
+        self._model = listModel
+        self._model.items_added.connect(self.__cuesAdded)
+        self._model.items_moved.connect(self.__cuesMoved)
+        self._model.items_removed.connect(self.__cuesRemoved)
+        self._model.model_reset.connect(self.__modelReset)
+
+        self.__cuesAdded(tuple(listModel))
+
+    def cue(self, row):
+        return self.__rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.__rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section].name
+
+    def flags(self, index):
+        if not index.isValid():
+            # Allow drops only between the rows
+            return Qt.ItemIsDropEnabled
+
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        cue = self.__rows[index.row()]
+        column = self.columns[index.column()]
+
+        if role == CueRole:
+            return cue
+        elif role == Qt.DisplayRole:
+            if column.text is not None:
+                return column.text(cue)
+        elif role == Qt.TextAlignmentRole:
+            return column.alignment
+        elif role == Qt.ToolTipRole:
+            if column.tooltip is not None:
+                return column.tooltip(cue)
+        elif role == Qt.BackgroundRole:
+            return self.__style(cue)[0]
+        elif role == Qt.ForegroundRole:
+            return self.__style(cue)[1]
+        elif role == Qt.FontRole:
+            return self.__style(cue)[2]
+
+    def mimeTypes(self):
+        return [CueListItemModel.MimeType]
+
+    def mimeData(self, indexes):
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        for row in sorted({index.row() for index in indexes}):
+            stream.writeInt(row)
+
+        mimeData = QMimeData()
+        mimeData.setData(CueListItemModel.MimeType, data)
+        return mimeData
+
+    def supportedDropActions(self):
+        return Qt.MoveAction | Qt.CopyAction
+
+    def __style(self, cue):
+        style = self.__styles.get(cue)
+        if style is None:
+            css = css_to_dict(cue.stylesheet)
+            background = foreground = font = None
+
+            if "background" in css:
+                color = QColor(css["background"])
+                color.setAlpha(150)
+                background = QBrush(color)
+            if "color" in css:
+                foreground = QBrush(QColor(css["color"]))
+            if "font-size" in css:
+                font = QFont()
+                size = css["font-size"]
+                try:
+                    if size.endswith("px"):
+                        font.setPixelSize(int(size[:-2]))
+                    else:
+                        font.setPointSize(int(size.rstrip("pt")))
+                except ValueError:
+                    font = None
+
+            style = self.__styles[cue] = (background, foreground, font)
+
+        return style
+
+    def __cuePropertyChanged(self, cue, name, _):
+        if name in CueListItemModel.DISPLAY_PROPERTIES:
+            if name == "stylesheet":
+                self.__styles.pop(cue, None)
+
+            # Delivered asynchronously, the cue may be moved or removed
+            row = cue.index
+            if 0 <= row < len(self.__rows) and self.__rows[row] is cue:
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, len(self.columns) - 1)
+                )
+
+    def __cueStateChanged(self, *_):
+        self.cuesStateChanged.emit()
+
+    def __disconnectCue(self, cue):
+        cue.property_changed.disconnect(self.__cuePropertyChanged)
+        for name in CueListItemModel.STATE_SIGNALS:
+            getattr(cue, name).disconnect(self.__cueStateChanged)
+
+    def __cuesAdded(self, cues):
+        # The cues are already in their final position, inserting them in
+        # ascending order each one lands on its index
+        cues = sorted(cues, key=lambda cue: cue.index)
+        byIndex = {cue.index: cue for cue in cues}
+        for first, last in _runs(byIndex):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.__rows[first:first] = [
+                byIndex[index] for index in range(first, last + 1)
+            ]
+            self.endInsertRows()
+
+        for cue in cues:
+            cue.property_changed.connect(
+                self.__cuePropertyChanged, Connection.QtQueued
+            )
+            # Direct connections are cheaper, the qt-signal is queued
+            for name in CueListItemModel.STATE_SIGNALS:
+                getattr(cue, name).connect(self.__cueStateChanged)
+
+    def __cuesMoved(self, oldIndexes, newIndexes):
+        self.layoutAboutToBeChanged.emit()
+
+        persistent = self.persistentIndexList()
+        persistentCues = [self.__rows[index.row()] for index in persistent]
+
+        self.__rows = list(self._model)
+        rows = {cue: row for row, cue in enumerate(self.__rows)}
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.index(rows[cue], index.column())
+                for cue, index in zip(persistentCues, persistent)
+            ],
+        )
+
+        self.layoutChanged.emit()
 
-        self.cue = cue
-        self.current = False
+    def __cuesRemoved(self, cues):
+        # The removed cues keep their (old) index, remove from the last one
+        for first, last in reversed(_runs(cue.index for cue in cues)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.__rows[first : last + 1]
+            self.endRemoveRows()
 
+        for cue in cues:
+            self.__disconnectCue(cue)
+            self.__styles.pop(cue, None)
 
-# TODO: use a custom Model/View
-class CueListView(QTreeWidget):
+    def __modelReset(self):
+        self.beginResetModel()
+
+        for cue in self.__rows:
+            self.__disconnectCue(cue)
+        self.__rows.clear()
+        self.__styles.clear()
+
+        self.endResetModel()
+
+
+class CueListView(QTreeView):
     keyPressed = pyqtSignal(QKeyEvent)
     contextMenuInvoked = pyqtSignal(QContextMenuEvent)
+    standbyIndexChanged = pyqtSignal(int)
+
+    # Interval of the time columns refresh (ms)
+    REFRESH_INTERVAL = 33
+    # The states for which the "timed" columns change
+    TIMED_STATES = CueState.Running | CueState.PreWait | CueState.PostWait
 
     # TODO: add ability to show/hide
     # TODO: implement columns (cue-type / target / etc..)
     COLUMNS = [
-        ListColumn("", CueStatusIcons, QHeaderView.Fixed, width=45),
-        ListColumn("#", IndexWidget, QHeaderView.ResizeToContents),
+        ListColumn("", CueStatusDelegate, QHeaderView.Fixed, width=45),
+        ListColumn(
+            "#",
+            IndexDelegate,
+            QHeaderView.ResizeToContents,
+            text=lambda cue: str(cue.index + 1),
+            alignment=Qt.AlignCenter,
+        ),
         ListColumn(
             QT_TRANSLATE_NOOP("ListLayoutHeader", "Cue"),
-            NameWidget,
+            NameDelegate,
             QHeaderView.Stretch,
+            text=lambda cue: cue.name,
         ),
         ListColumn(
-            QT_TRANSLATE_NOOP("ListLayoutHeader", "Pre wait"), PreWaitWidget
+            QT_TRANSLATE_NOOP("ListLayoutHeader", "Pre wait"),
+            PreWaitDelegate,
+            timed=True,
         ),
         ListColumn(
-            QT_TRANSLATE_NOOP("ListLayoutHeader", "Action"), CueTimeWidget
+            QT_TRANSLATE_NOOP("ListLayoutHeader", "Action"),
+            CueTimeDelegate,
+            timed=True,
         ),
         ListColumn(
-            QT_TRANSLATE_NOOP("ListLayoutHeader", "Post wait"), PostWaitWidget
+            QT_TRANSLATE_NOOP("ListLayoutHeader", "Post wait"),
+            PostWaitDelegate,
+            timed=True,
+        ),
+        ListColumn(
+            "",
+            NextActionDelegate,
+            QHeaderView.Fixed,
+            width=18,
+            tooltip=lambda cue: tr_next_action(CueNextAction(cue.next_action)),
         ),
-        ListColumn("", NextActionIcon, QHeaderView.Fixed, width=18),
     ]
 
-    ITEM_DEFAULT_BG = QBrush(Qt.transparent)
-    ITEM_CURRENT_BG = QBrush(QColor(250, 220, 0, 100))
-
     def __init__(self, listModel, parent=None):
         """
         :type listModel: lisp.plugins.list_layout.models.CueListModel
         """
         super().__init__(parent)
-        self.__itemMoving = False
         self.__scrollRangeGuard = False
+        self.__visibleStates = {}
 
-        # Watch for model changes
         self._model = listModel
-        self._model.item_added.connect(self.__cueAdded)
-        self._model.item_moved.connect(self.__cueMoved)
-        self._model.item_removed.connect(self.__cueRemoved)
-        self._model.model_reset.connect(self.__modelReset)
+        self._itemModel = CueListItemModel(
+            listModel, CueListView.COLUMNS, parent=self
+        )
+        self.setModel(self._itemModel)
+
+        # Delegates are not owned by the view, keep a reference
+        self._delegates = []
+        for i, column in enumerate(CueListView.COLUMNS):
+            delegate = column.delegate(self)
+            self._delegates.append(delegate)
+            self.setItemDelegateForColumn(i, delegate)
 
         # Setup the columns headers
-        self.setHeaderLabels((c.name for c in CueListView.COLUMNS))
         for i, column in enumerate(CueListView.COLUMNS):
             if column.resize is not None:
                 self.header().setSectionResizeMode(i, column.resize)
@@ -123,14 +414,34 @@ class CueListView(QTreeWidget):
 
         # Set some visual options
         self.setIndentation(0)
+        self.setRootIsDecorated(False)
         self.setAlternatingRowColors(True)
         self.setVerticalScrollMode(self.ScrollPerItem)
 
         # This allows to have some spare space at the end of the scroll-area
         self.verticalScrollBar().rangeChanged.connect(self.__updateScrollRange)
-        self.currentItemChanged.connect(
-            self.__currentItemChanged, Qt.QueuedConnection
+        self.standbyIndexChanged.connect(
+            self.__standbyIndexChanged, Qt.QueuedConnection
+        )
+
+        # Resize the headers (at most) once per event-loop iteration
+        self.__headersTimer = QTimer(self)
+        self.__headersTimer.setSingleShot(True)
+        self.__headersTimer.setInterval(1)
+        self.__headersTimer.timeout.connect(self.updateHeadersSizes)
+        self._itemModel.dataChanged.connect(self.__cuesDataChanged)
+
+        # A single timer refreshes the visible rows of running cues, it runs
+        # only while needed, it's (re)started when the state of some cue
+        # changes, or other rows are shown, and it's stopped when no visible
+        # cue is running
+        self.__refreshTimer = QTimer(self)
+        self.__refreshTimer.setInterval(CueListView.REFRESH_INTERVAL)
+        self.__refreshTimer.timeout.connect(self.__refreshVisibleRows)
+        self._itemModel.cuesStateChanged.connect(
+            self.__startRefresh, Qt.QueuedConnection
         )
+        self.verticalScrollBar().valueChanged.connect(self.__startRefresh)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -147,12 +458,7 @@ class CueListView(QTreeWidget):
             get_backend().add_cue_from_urls(event.mimeData().urls())
         else:
             # Otherwise copy/move existing cue.
-
-            # Decode mimedata information about the drag&drop event, since only
-            # internal movement are allowed we assume the data format is correct
-            data = event.mimeData().data(
-                "application/x-qabstractitemmodeldatalist"
-            )
+            data = event.mimeData().data(CueListItemModel.MimeType)
             stream = QDataStream(data, QIODevice.ReadOnly)
 
             # Get the starting-item row
@@ -162,17 +468,7 @@ class CueListView(QTreeWidget):
 
             rows = []
             while not stream.atEnd():
-                row = stream.readInt()
-                # Skip column and data
-                stream.readInt()
-                for _ in range(stream.readInt()):
-                    stream.readInt()
-                    stream.readQVariant()
-
-                if rows and row == rows[-1]:
-                    continue
-
-                rows.append(row)
+                rows.append(stream.readInt())
 
             if event.proposedAction() == Qt.MoveAction:
                 Application().commands_stack.do(
@@ -204,20 +500,88 @@ class CueListView(QTreeWidget):
     def mousePressEvent(self, event):
         if (
             not event.buttons() & Qt.RightButton
-            or not self.selectionMode() == QTreeWidget.NoSelection
+            or not self.selectionMode() == QTreeView.NoSelection
         ):
             super().mousePressEvent(event)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.updateHeadersSizes()
+        self.__startRefresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.__startRefresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.__refreshTimer.stop()
+
+    def currentChanged(self, current, previous):
+        super().currentChanged(current, previous)
+
+        # The whole row style depends on the standby (current) row
+        self.__updateRow(previous.row())
+        self.__updateRow(current.row())
+
+        self.standbyIndexChanged.emit(current.row())
+
+    def rowsInserted(self, parent, start, end):
+        super().rowsInserted(parent, start, end)
+
+        if self._itemModel.rowCount() == end - start + 1:
+            # If the view was empty, set the first item as current
+            self.setCurrentIndex(self._itemModel.index(start, 0))
+        else:
+            # Scroll to the last item added
+            self.scrollTo(self._itemModel.index(end, 0))
+
+        # Ensure that the focus is set
+        self.setFocus()
 
     def standbyIndex(self):
-        return self.indexOfTopLevelItem(self.currentItem())
+        return self.currentIndex().row()
 
     def setStandbyIndex(self, newIndex):
-        if 0 <= newIndex < self.topLevelItemCount():
-            self.setCurrentItem(self.topLevelItem(newIndex))
+        if 0 <= newIndex < self._itemModel.rowCount():
+            self.setCurrentIndex(self._itemModel.index(newIndex, 0))
+
+    def selectedRows(self):
+        """Return the selected rows, in ascending order."""
+        return sorted(
+            index.row() for index in self.selectionModel().selectedRows()
+        )
+
+    def setRowsSelected(self, rows, selected=True):
+        selection = QItemSelection()
+        lastColumn = self._itemModel.columnCount() - 1
+        for first, last in _runs(rows):
+            selection.select(
+                self._itemModel.index(first, 0),
+                self._itemModel.index(last, lastColumn),
+            )
+
+        command = (
+            QItemSelectionModel.Select
+            if selected
+            else QItemSelectionModel.Deselect
+        )
+        self.selectionModel().select(
+            selection, command | QItemSelectionModel.Rows
+        )
+
+    def invertSelection(self):
+        rows = self._itemModel.rowCount()
+        if rows:
+            self.selectionModel().select(
+                QItemSelection(
+                    self._itemModel.index(0, 0),
+                    self._itemModel.index(
+                        rows - 1, self._itemModel.columnCount() - 1
+                    ),
+                ),
+                QItemSelectionModel.Toggle | QItemSelectionModel.Rows,
+            )
 
     def updateHeadersSizes(self):
         """Some hack to have "stretchable" columns with a minimum size
@@ -239,88 +603,85 @@ class CueListView(QTreeWidget):
                 header.setSectionResizeMode(i, QHeaderView.Fixed)
                 header.resizeSection(i, max(contentWidth, stretchWidth))
 
-    def __currentItemChanged(self, current, previous):
-        if previous is not None:
-            previous.current = False
-            self.__updateItemStyle(previous)
+    def __cuesDataChanged(self, *_):
+        # e.g. a cue name changed
+        self.__headersTimer.start()
 
-        if current is not None:
-            current.current = True
-            self.__updateItemStyle(current)
+    def __standbyIndexChanged(self, row):
+        if 0 <= row < self._itemModel.rowCount():
+            index = self._itemModel.index(row, 0)
 
-            if self.selectionMode() == QTreeWidget.NoSelection:
+            if self.selectionMode() == QTreeView.NoSelection:
                 # Ensure the current item is in the middle of the viewport.
                 # This is skipped in "selection-mode" otherwise it creates
                 # confusion during drang&drop operations
-                self.scrollToItem(current, QTreeWidget.PositionAtCenter)
-            elif not self.selectedIndexes():
-                current.setSelected(True)
-
-    def __updateItemStyle(self, item):
-        if item.treeWidget() is not None:
-            css = css_to_dict(item.cue.stylesheet)
-            brush = QBrush()
-
-            if item.current:
-                widget_css = subdict(css, ("font-size",))
-                brush = CueListView.ITEM_CURRENT_BG
-            else:
-                widget_css = subdict(css, ("color", "font-size"))
-                css_bg = css.get("background")
-                if css_bg is not None:
-                    color = QColor(css_bg)
-                    color.setAlpha(150)
-                    brush = QBrush(color)
-
-            for column in range(self.columnCount()):
-                self.itemWidget(item, column).setStyleSheet(
-                    dict_to_css(widget_css)
-                )
-                item.setBackground(column, brush)
-
-    def __cuePropChanged(self, cue, property_name, _):
-        if property_name == "stylesheet":
-            self.__updateItemStyle(self.topLevelItem(cue.index))
-        if property_name == "name":
-            QTimer.singleShot(1, self.updateHeadersSizes)
-
-    def __cueAdded(self, cue):
-        item = CueTreeWidgetItem(cue)
-        item.setFlags(item.flags() & ~Qt.ItemIsDropEnabled)
-        cue.property_changed.connect(self.__cuePropChanged)
-
-        self.insertTopLevelItem(cue.index, item)
-        self.__setupItemWidgets(item)
-        self.__updateItemStyle(item)
-
-        if self.topLevelItemCount() == 1:
-            # If it's the only item in the view, set it as current
-            self.setCurrentItem(item)
-        else:
-            # Scroll to the last item added
-            self.scrollToItem(item)
+                self.scrollTo(index, QTreeView.PositionAtCenter)
+            elif not self.selectionModel().hasSelection():
+                self.setRowsSelected((row,))
 
-        # Ensure that the focus is set
-        self.setFocus()
+    def __rowRect(self, row):
+        rect = self.visualRect(self._itemModel.index(row, 0))
+        return QRect(0, rect.y(), self.viewport().width(), rect.height())
 
-    def __cueMoved(self, before, after):
-        item = self.takeTopLevelItem(before)
-        self.insertTopLevelItem(after, item)
-        self.__setupItemWidgets(item)
+    def __updateRow(self, row):
+        if 0 <= row < self._itemModel.rowCount():
+            self.viewport().update(self.__rowRect(row))
 
-    def __cueRemoved(self, cue):
-        cue.property_changed.disconnect(self.__cuePropChanged)
-        self.takeTopLevelItem(cue.index)
+    def __startRefresh(self, *_):
+        if self.isVisible() and not self.__refreshTimer.isActive():
+            self.__refreshTimer.start()
 
-    def __modelReset(self):
-        self.reset()
-        self.clear()
+    def __refreshVisibleRows(self):
+        """Repaint the visible rows that changed since the last refresh.
 
-    def __setupItemWidgets(self, item):
-        for i, column in enumerate(CueListView.COLUMNS):
-            self.setItemWidget(item, i, column.widget(item))
+        Rows of cues changing state are repainted, for running cues only
+        the "timed" columns, everything in a single viewport update.
+        When no visible cue is running the refresh is stopped.
+        """
+        rowCount = self._itemModel.rowCount()
+        first = self.indexAt(QPoint(0, 0)).row()
+        if first < 0:
+            self.__visibleStates = {}
+            self.__refreshTimer.stop()
+            return
+
+        last = self.indexAt(QPoint(0, self.viewport().height() - 1)).row()
+        if last < 0:
+            last = rowCount - 1
+
+        timedColumns = [
+            column
+            for column, col in enumerate(CueListView.COLUMNS)
+            if col.timed and not self.isColumnHidden(column)
+        ]
+
+        region = QRegion()
+        states = {}
+        running = False
+        for row in range(first, last + 1):
+            cue = self._itemModel.cue(row)
+            state = states[cue] = cue.state
+            if state & CueListView.TIMED_STATES:
+                running = True
+
+            # Newly visible rows are already painted
+            if state != self.__visibleStates.get(cue, state):
+                region += self.__rowRect(row)
+            elif state & CueListView.TIMED_STATES:
+                rowRect = self.__rowRect(row)
+                for column in timedColumns:
+                    region += QRect(
+                        self.columnViewportPosition(column),
+                        rowRect.y(),
+                        self.columnWidth(column),
+                        rowRect.height(),
+                    )
 
-        self.updateGeometries()
+        self.__visibleStates = states
+        if not region.isEmpty():
+            self.viewport().update(region)
+        if not running:
+            self.__refreshTimer.stop()
 
     def __updateScrollRange(self, min_, max_):
         if not self.__scrollRangeGuard:
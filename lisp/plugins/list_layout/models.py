@@ -15,11 +15,19 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
+from math import inf
+
 from lisp.core.model_adapter import ModelAdapter
 from lisp.core.proxy_model import ReadOnlyProxyModel
 
 
 class CueListModel(ModelAdapter):
+    """Keep the cues in a list, ordered by their index.
+
+    Indices are updated once for each batch of changes, and only for the
+    cues that actually changed position.
+    """
+
     def __init__(self, model):
         super().__init__(model)
         self.__cues = []
@@ -31,6 +39,17 @@ class CueListModel(ModelAdapter):
         item.index = index
         self.add(item)
 
+    def insert_many(self, items, index):
+        items = tuple(items)
+        if index >= 0:
+            for item_index, item in enumerate(items, index):
+                item.index = item_index
+        else:
+            for item in items:
+                item.index = -1
+
+        self.add_many(items)
+
     def pop(self, index):
         cue = self.__cues[index]
         self.model.remove(cue)
@@ -41,39 +60,80 @@ class CueListModel(ModelAdapter):
             if new_index >= len(self.__cues):
                 new_index = len(self.__cues) - 1
 
-            cue = self.__cues.pop(old_index)
-            self.__cues.insert(new_index, cue)
+            self.move_many((old_index,), (new_index,))
+
+    def move_many(self, old_indexes, new_indexes):
+        old_indexes = tuple(old_indexes)
+        new_indexes = tuple(new_indexes)
+        if old_indexes == new_indexes:
+            return
+
+        moved = [self.__cues[index] for index in old_indexes]
+        moved_set = set(old_indexes)
+        self.__cues = [
+            cue
+            for index, cue in enumerate(self.__cues)
+            if index not in moved_set
+        ]
+
+        # Inserting in ascending order each item lands on its final index
+        for index, cue in sorted(
+            zip(new_indexes, moved), key=lambda entry: entry[0]
+        ):
+            self.__cues.insert(index, cue)
 
-            if old_index < new_index:
-                min_index = old_index
-                max_index = new_index
-            else:
-                min_index = new_index
-                max_index = old_index
+        self._update_indices(
+            min(old_indexes + new_indexes), max(old_indexes + new_indexes) + 1
+        )
 
-            self._update_indices(min_index, max_index + 1)
+        for old_index, new_index in zip(old_indexes, new_indexes):
             self.item_moved.emit(old_index, new_index)
+        self.items_moved.emit(old_indexes, new_indexes)
 
     def _model_reset(self):
         self.__cues.clear()
         self.model_reset.emit()
 
     def _item_added(self, item):
-        if not isinstance(item.index, int) or not 0 <= item.index <= len(
-            self.__cues
-        ):
-            item.index = len(self.__cues)
+        self._items_added((item,))
 
-        self.__cues.insert(item.index, item)
-        self._update_indices(item.index)
+    def _items_added(self, items):
+        start = len(self.__cues)
+        # In ascending order, so that each item lands on the requested index,
+        # items without a valid index are appended
+        for item in sorted(items, key=self.__insert_key):
+            if not isinstance(item.index, int) or not 0 <= item.index <= len(
+                self.__cues
+            ):
+                item.index = len(self.__cues)
 
-        self.item_added.emit(item)
+            self.__cues.insert(item.index, item)
+            start = min(start, item.index)
+
+        self._update_indices(start)
+
+        for item in items:
+            self.item_added.emit(item)
+        self.items_added.emit(items)
 
     def _item_removed(self, item):
-        self.__cues.pop(item.index)
-        self._update_indices(item.index)
+        self._items_removed((item,))
+
+    def _items_removed(self, items):
+        if not items:
+            return
 
-        self.item_removed.emit(item)
+        removed = set(items)
+        start = min(item.index for item in items)
+        self.__cues[start:] = [
+            cue for cue in self.__cues[start:] if cue not in removed
+        ]
+        self._update_indices(start)
+
+        # The removed items keep their (old) index
+        for item in items:
+            self.item_removed.emit(item)
+        self.items_removed.emit(items)
 
     def _update_indices(self, start, stop=-1):
         """Update the indices of cues from start to stop-1"""
@@ -81,7 +141,17 @@ class CueListModel(ModelAdapter):
             stop = len(self.__cues)
 
         for index in range(start, stop):
-            self.__cues[index].index = index
+            cue = self.__cues[index]
+            # Avoid useless property changes (and notifications)
+            if cue.index != index:
+                cue.index = index
+
+    @staticmethod
+    def __insert_key(item):
+        if isinstance(item.index, int) and item.index >= 0:
+            return item.index
+
+        return inf
 
     def __iter__(self):
         for cue in self.__cues:
@@ -119,11 +189,13 @@ class RunningCueModel(ReadOnlyProxyModel):
         if cue.duration > 0 and cue not in self.__playing:
             self.__playing.append(cue)
             self.item_added.emit(cue)
+            self.items_added.emit((cue,))
 
     def _remove(self, cue):
         try:
             self.__playing.remove(cue)
             self.item_removed.emit(cue)
+            self.items_removed.emit((cue,))
         except ValueError:
             pass
 
@@ -32,6 +32,7 @@ from lisp.cues.cue import CueAction
 from lisp.cues.cue_time import CueTime
 from lisp.cues.media_cue import MediaCue
 from lisp.plugins.list_layout.control_buttons import CueControlButtons
+from lisp.ui.meters import MeterService
 from lisp.ui.widgets import QClickSlider, DBMeter
 from lisp.ui.widgets.elidedlabel import ElidedLabel
 from lisp.ui.widgets.waveform import WaveformSlider
@@ -189,7 +190,6 @@ class RunningCueWidget(QWidget):
 class RunningMediaCueWidget(RunningCueWidget):
     def __init__(self, cue, config, **kwargs):
         super().__init__(cue, config, **kwargs)
-        self._dbmeter_element = None
 
         if (
             config.get("show.waveformSlider", False)
@@ -230,14 +230,12 @@ class RunningMediaCueWidget(RunningCueWidget):
         self.seekSlider.setVisible(visible)
 
     def set_dbmeter_visible(self, visible):
-        if self._dbmeter_element is not None:
-            self._dbmeter_element.level_ready.disconnect(self.dbmeter.plot)
-            self._dbmeter_element = None
+        MeterService().unwatch(self.dbmeter)
 
         if visible:
-            self._dbmeter_element = self.cue.media.element("DbMeter")
-            if self._dbmeter_element is not None:
-                self._dbmeter_element.level_ready.connect(self.dbmeter.plot)
+            element = self.cue.media.element("DbMeter")
+            if element is not None:
+                MeterService().watch(self.dbmeter, element)
 
         # Add/Remove the QDbMeter in the layout
         if visible and not self.dbmeter.isVisible():
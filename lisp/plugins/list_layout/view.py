@@ -73,7 +73,7 @@ class ListLayoutView(QWidget):
         # CUE VIEW (center-left)
         self.listView = CueListView(listModel, self)
         self.listView.setMinimumWidth(200)
-        self.listView.currentItemChanged.connect(self.__listViewCurrentChanged)
+        self.listView.standbyIndexChanged.connect(self.__listViewCurrentChanged)
         self.centralSplitter.addWidget(self.listView)
         self.centralSplitter.setCollapsible(0, False)
 
@@ -129,11 +129,9 @@ class ListLayoutView(QWidget):
         for n in range(splitter.count()):
             splitter.handle(n).setEnabled(enabled)
 
-    def __listViewCurrentChanged(self, current, _):
+    def __listViewCurrentChanged(self, index):
         cue = None
-        if current is not None:
-            index = self.listView.indexOfTopLevelItem(current)
-            if index < len(self.listModel):
-                cue = self.listModel.item(index)
+        if 0 <= index < len(self.listModel):
+            cue = self.listModel.item(index)
 
         self.infoPanel.cue = cue
@@ -30,6 +30,7 @@ from PyQt5.QtWidgets import (
 )
 
 from lisp.core.plugin import Plugin
+from lisp.core.signal import Signal, Connection
 from lisp.cues.media_cue import MediaCue
 from lisp.layout.cue_layout import CueLayout
 from lisp.layout.cue_menu import (
@@ -37,10 +38,7 @@ from lisp.layout.cue_menu import (
     SimpleMenuAction,
     MENU_PRIORITY_PLUGIN,
 )
-from lisp.plugins.gst_backend.gst_utils import (
-    gst_uri_metadata,
-    gst_parse_tags_list,
-)
+from lisp.plugins.gst_backend.gst_probe import GstProbeService, ProbePriority
 from lisp.ui.ui_utils import translate
 
 
@@ -62,55 +60,56 @@ class MediaInfo(Plugin):
 
         CueLayout.CuesMenu.add(self.cue_action_group, MediaCue)
 
+        # Probes are completed in background
+        self.probe_ready = Signal()
+        self.probe_ready.connect(self._show_probe, Connection.QtQueued)
+
     def _show_info(self, cue):
-        gst_meta = gst_uri_metadata(cue.media.input_uri())
+        GstProbeService().probe(
+            cue.media.input_uri(), ProbePriority.High
+        ).add_done_callback(
+            lambda future: self.probe_ready.emit(
+                cue, None if future.cancelled() else future.result()
+            )
+        )
 
-        if gst_meta is None:
+    def _show_probe(self, cue, probe):
+        if probe is None:
             return QMessageBox.warning(
                 self.app.window,
                 translate("MediaInfo", "Warning"),
                 translate("MediaInfo", "Cannot get any information."),
             )
         else:
-            info = {"URI": unquote(gst_meta.get_uri())}
+            info = {"URI": unquote(probe.uri.uri)}
             # Audio streams info
-            for stream in gst_meta.get_audio_streams():
-                name = stream.get_stream_type_nick().capitalize()
+            for stream in probe.audio_streams():
+                name = stream["type"].capitalize()
                 info[name] = {
-                    "Bitrate": str(stream.get_bitrate() // 1000) + " Kb/s",
-                    "Channels": str(stream.get_channels()),
-                    "Sample rate": str(stream.get_sample_rate()) + " Hz",
-                    "Sample size": str(stream.get_depth()) + " bit",
+                    "Bitrate": str(stream["bitrate"] // 1000) + " Kb/s",
+                    "Channels": str(stream["channels"]),
+                    "Sample rate": str(stream["sample_rate"]) + " Hz",
+                    "Sample size": str(stream["depth"]) + " bit",
                 }
+                if stream["channel_layout"]:
+                    info[name]["Channel layout"] = stream["channel_layout"]
 
             # Video streams info
-            for stream in gst_meta.get_video_streams():
-                name = stream.get_stream_type_nick().capitalize()
+            for stream in probe.video_streams():
+                name = stream["type"].capitalize()
                 info[name] = {
-                    "Height": str(stream.get_height()) + " px",
-                    "Width": str(stream.get_width()) + " px",
-                    "Framerate": str(
-                        round(
-                            stream.get_framerate_num()
-                            / stream.get_framerate_denom()
-                        )
-                    ),
+                    "Height": str(stream["height"]) + " px",
+                    "Width": str(stream["width"]) + " px",
+                    "Framerate": str(round(stream["framerate"])),
                 }
 
             # Tags
-            gst_tags = gst_meta.get_tags()
-            tags = {}
-
-            if gst_tags is not None:
-                for name, value in gst_parse_tags_list(gst_tags).items():
-                    tag_txt = str(value)
-
-                    # Include the value only if it's representation make sense
-                    if tag_txt != object.__str__(value):
-                        tags[name.capitalize()] = tag_txt
-
-                if tags:
-                    info["Tags"] = tags
+            tags = {
+                name.capitalize(): str(value)
+                for name, value in probe.tags.items()
+            }
+            if tags:
+                info["Tags"] = tags
 
             # Show the dialog
             dialog = InfoDialog(self.app.window, info, cue.name)
@@ -19,16 +19,14 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Thread, Lock
 
-import gi
-
-gi.require_version("Gst", "1.0")
-from gi.repository import Gst
 from PyQt5.QtWidgets import QMenu, QAction, QDialog
 
+from lisp.backend import get_backend
 from lisp.command.command import Command
 from lisp.core.plugin import Plugin
 from lisp.core.signal import Signal, Connection
 from lisp.cues.media_cue import MediaCue
+from lisp.plugins.gst_backend.gst_analysis import GstAnalysis
 from lisp.ui.ui_utils import translate
 from .gain_ui import GainUi, GainProgressDialog
 
@@ -39,6 +37,7 @@ class ReplayGain(Plugin):
     Name = "ReplayGain / Normalization"
     Authors = ("Francesco Ceruti",)
     Description = "Allow to normalize cues volume"
+    Depends = ("GstBackend",)
 
     RESET_VALUE = 1.0
 
@@ -190,8 +189,9 @@ class GainMainThread(Thread):
         self._running = True
 
         with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            for file in self.files.keys():
-                gain = GstGain(file, self.ref_level)
+            for file, media_list in self.files.items():
+                waveform = get_backend().media_waveform(media_list[0])
+                gain = GstGain(file, self.ref_level, waveform)
                 self._futures[executor.submit(gain.gain)] = gain
 
             for future in as_completed(self._futures):
@@ -247,92 +247,73 @@ class GainMainThread(Thread):
 
 
 class GstGain:
-    PIPELINE = (
-        'uridecodebin uri="{0}" ! audioconvert ! rganalysis '
-        "reference-level={1} ! fakesink"
-    )
+    """Compute the gain of a file.
+
+    Results are read from the analysis cache when available, otherwise
+    the file is analyzed (see `GstAnalysis`), which also generates the
+    file waveform.
+    """
 
-    def __init__(self, uri, ref_level):
+    def __init__(self, uri, ref_level, waveform):
         self.__lock = Lock()
 
         self.uri = uri
         self.ref_level = ref_level
-        self.gain_pipe = None
+        self.waveform = waveform
+        self.analysis = None
 
         # Result attributes
         self.gain_value = 0
         self.peak_value = 0
         self.completed = False
 
-    # Create a pipeline with a fake audio output and get the gain levels
     def gain(self):
-        self.gain_pipe = Gst.parse_launch(
-            GstGain.PIPELINE.format(self.uri, self.ref_level)
-        )
+        results = GstAnalysis.cached_results(self.waveform)
+
+        if "track_gain" not in results:
+            self.analysis = GstAnalysis(self.waveform)
+            self.analysis.finished.connect(self.__release)
+            self.analysis.failed.connect(self.__release)
+
+            self.__lock.acquire(False)
+            if self.analysis.start():
+                logger.info(
+                    translate(
+                        "ReplayGainInfo", "Started gain calculation for: {}"
+                    ).format(self.uri)
+                )
 
-        gain_bus = self.gain_pipe.get_bus()
-        gain_bus.add_signal_watch()
-        # Connect only the messages we want
-        gain_bus.connect("message::eos", self._on_message)
-        gain_bus.connect("message::tag", self._on_message)
-        gain_bus.connect("message::error", self._on_message)
-
-        self.gain_pipe.set_state(Gst.State.PLAYING)
-        logger.info(
-            translate(
-                "ReplayGainInfo", "Started gain calculation for: {}"
-            ).format(self.uri)
-        )
+                # Block here until the analysis is completed
+                self.__lock.acquire()
+
+            results = self.analysis.results
+            self.analysis = None
+            # We don't need the waveform data
+            self.waveform.clear()
 
-        # Block here until EOS
-        self.__lock.acquire(False)
-        self.__lock.acquire()
+        if "track_gain" in results:
+            # The gain is relative to the analysis reference level
+            self.gain_value = (
+                results["track_gain"]
+                + self.ref_level
+                - results["reference_level"]
+            )
+            self.peak_value = results["peak"]
 
-        # Reset the pipe
-        self.gain_pipe = None
+            logger.info(
+                translate("ReplayGainInfo", "Gain calculated for: {}").format(
+                    self.uri
+                )
+            )
+            self.completed = True
 
         # Return the computation result
         return self
 
     def stop(self):
-        if self.gain_pipe is not None:
-            self.gain_pipe.send_event(Gst.Event.new_eos())
-
-    def _on_message(self, bus, message):
-        try:
-            if message.type == Gst.MessageType.EOS:
-                self.__release()
-            elif message.type == Gst.MessageType.TAG:
-                tags = message.parse_tag()
-                tag = tags.get_double(Gst.TAG_TRACK_GAIN)
-                peak = tags.get_double(Gst.TAG_TRACK_PEAK)
-
-                if tag[0] and peak[0]:
-                    self.gain_pipe.set_state(Gst.State.NULL)
-                    # Save the gain results
-                    self.gain_value = tag[1]
-                    self.peak_value = peak[1]
-
-                    logger.info(
-                        translate(
-                            "ReplayGainInfo", "Gain calculated for: {}"
-                        ).format(self.uri)
-                    )
-                    self.completed = True
-                    self.__release()
-            elif message.type == Gst.MessageType.ERROR:
-                error, _ = message.parse_error()
-                self.gain_pipe.set_state(Gst.State.NULL)
-
-                logger.error(f"GStreamer: {error.message}", exc_info=error)
-                self.__release()
-        except Exception:
-            logger.exception(
-                translate(
-                    "ReplayGainError",
-                    "An error occurred during gain calculation.",
-                )
-            )
+        analysis = self.analysis
+        if analysis is not None:
+            analysis.stop()
             self.__release()
 
     def __release(self):
@@ -35,7 +35,7 @@ class TcFormat(Enum):
 
 
 class HRCueTime(CueTime):
-    _Clock = Clock(30)  # 1000 / 30  = 33.3333 milliseconds
+    _Clock = Clock(1000 / 30)  # 33.3333 milliseconds
 
 
 class TimecodeCueTracker:
@@ -47,7 +47,10 @@ class TriggersSettings(SettingsPage):
         super().__init__(**kwargs)
         self.setLayout(QVBoxLayout(self))
 
-        self.cueSelectDialog = CueSelectDialog(cues=Application().cue_model)
+        self.cueSelectDialog = CueSelectDialog(
+            cues=Application().cue_model,
+            search=Application().cue_model.searcher(),
+        )
         self.triggersModel = TriggersModel()
 
         self.triggerGroup = QGroupBox(self)
@@ -23,8 +23,11 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QDialogButtonBox,
     QTreeWidgetItem,
+    QLineEdit,
 )
 
+from lisp.ui.ui_utils import translate
+
 
 class CueSelectDialog(QDialog):
     def __init__(
@@ -32,14 +35,21 @@ class CueSelectDialog(QDialog):
         cues=None,
         properties=("index", "name"),
         selection_mode=QTreeWidget.SingleSelection,
+        search=None,
         **kwargs,
     ):
+        """
+        :param search: used to filter the cues by name, as the user types
+        :type search: lisp.cues.cue_index.CueSearch
+        """
         super().__init__(**kwargs)
 
         self.setMinimumSize(600, 400)
 
         self._properties = list(properties)
         self._cues = {}
+        self._search = search
+        self._hidden = set()
 
         self.list = QTreeWidget(self)
         self.list.setSelectionMode(selection_mode)
@@ -57,6 +67,16 @@ class CueSelectDialog(QDialog):
             self.add_cues(cues)
 
         self.setLayout(QVBoxLayout())
+
+        if search is not None:
+            self.searchEdit = QLineEdit(self)
+            self.searchEdit.setClearButtonEnabled(True)
+            self.searchEdit.setPlaceholderText(
+                translate("CueSelectDialog", "Search")
+            )
+            self.searchEdit.textChanged.connect(self._searchChanged)
+            self.layout().addWidget(self.searchEdit)
+
         self.layout().addWidget(self.list)
 
         self.buttons = QDialogButtonBox(self)
@@ -95,6 +115,22 @@ class CueSelectDialog(QDialog):
     def reset(self):
         self.list.clear()
         self._cues.clear()
+        self._hidden.clear()
+
+    def _searchChanged(self, text):
+        if text:
+            matches = set(self._search.update(text))
+            hidden = self._cues.keys() - matches
+        else:
+            hidden = set()
+
+        # Only touch the items that changed visibility
+        for cue in hidden.symmetric_difference(self._hidden):
+            item = self._cues.get(cue)
+            if item is not None:
+                item.setHidden(cue in hidden)
+
+        self._hidden = hidden
 
     def selected_cues(self):
         cues = []
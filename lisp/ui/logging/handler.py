@@ -16,6 +16,10 @@
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+from collections import deque
+from time import monotonic
+
+from PyQt5.QtCore import QTimer
 
 from lisp.core.signal import Signal, Connection
 
@@ -23,25 +27,55 @@ from lisp.core.signal import Signal, Connection
 class QLoggingHandler(logging.Handler):
     """Base class to implement Qt-safe logging handlers.
 
-    Instead of `emit` subclass must implement the `_emit` method.
+    Records are buffered, and handled in batches, in the Qt main-thread,
+    at most once every `flush_interval` milliseconds, so that a burst of
+    records doesn't flood the Qt event-loop.
+
+    Instead of `emit` subclass must implement the `_emit` method,
+    or `_emit_batch`.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, flush_interval=50, capacity=0, **kwargs):
+        """
+        :param flush_interval: minimum time (milliseconds) between batches
+        :param capacity: maximum number of buffered records, when exceeded
+                         the oldest records are discarded, 0 means no limit
+        """
         super().__init__(**kwargs)
+        self.flush_interval = flush_interval
 
-        # We need to append the new records while in the GUI thread, since
+        self.__buffer = deque(maxlen=capacity or None)
+        self.__last_flush = 0
+
+        self.__timer = QTimer()
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__flush)
+
+        # We need to handle the records while in the GUI thread, since
         # logging is asynchronous we need to use this "workaround"
-        self.new_record = Signal()
-        self.new_record.connect(self._emit, Connection.QtQueued)
+        self.new_records = Signal()
+        self.new_records.connect(self.__schedule_flush, Connection.QtQueued)
 
     def emit(self, record):
         try:
-            # The call will be processed in the Qt main-thread,
-            # since the slot is queued, the call order is preserved
-            self.new_record.emit(record)
+            # `emit` is called holding the handler lock
+            schedule = not self.__buffer
+            self.__buffer.append(record)
+
+            # Only the first record of a batch schedule the flush
+            if schedule:
+                self.new_records.emit()
         except Exception:
             self.handleError(record)
 
+    def _emit_batch(self, records):
+        """Handle a batch of records, by default calls `_emit` for each.
+
+        This function is called in the Qt main-thread
+        """
+        for record in records:
+            self._emit(record)
+
     def _emit(self, record):
         """Should implement the actual handling.
 
@@ -49,6 +83,23 @@ class QLoggingHandler(logging.Handler):
         """
         pass
 
+    def __schedule_flush(self):
+        if not self.__timer.isActive():
+            elapsed = (monotonic() - self.__last_flush) * 1000
+            self.__timer.start(max(0, int(self.flush_interval - elapsed)))
+
+    def __flush(self):
+        self.acquire()
+        try:
+            records = list(self.__buffer)
+            self.__buffer.clear()
+        finally:
+            self.release()
+
+        self.__last_flush = monotonic()
+        if records:
+            self._emit_batch(records)
+
 
 class LogModelHandler(QLoggingHandler):
     """Simple QLoggingHandler to log into a LogRecordModel"""
@@ -58,8 +109,13 @@ class LogModelHandler(QLoggingHandler):
         :param log_model: the model to send the records to
         :type log_model: lisp.ui.logging.models.LogRecordModel
         """
+        # Records exceeding the model limit would be discarded anyway
+        kwargs.setdefault("capacity", log_model.limit())
         super().__init__(**kwargs)
         self._log_model = log_model
 
+    def _emit_batch(self, records):
+        self._log_model.extend(records)
+
     def _emit(self, record):
         self._log_model.append(record)
@@ -15,8 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import deque
-
 from PyQt5.QtCore import (
     QModelIndex,
     Qt,
@@ -25,6 +23,7 @@ from PyQt5.QtCore import (
 )
 from PyQt5.QtGui import QFont, QColor
 
+from lisp.core.ring_buffer import RingBuffer
 from lisp.core.util import typename
 from lisp.ui.logging.common import (
     LogRecordRole,
@@ -50,7 +49,7 @@ class LogRecordModel(QAbstractTableModel):
 
         self._columns = list(columns.keys())
         self._columns_names = [columns[key] for key in self._columns]
-        self._records = deque()
+        self._records = RingBuffer(limit)
         self._limit = limit
 
         self._backgrounds = bg
@@ -94,25 +93,43 @@ class LogRecordModel(QAbstractTableModel):
                 return self._columns_names[index]
 
     def append(self, record):
-        pos = len(self._records)
+        self.extend((record,))
+
+    def extend(self, records):
+        """Append multiple records, notifying the views only once.
 
-        if self._limit and pos >= self._limit:
-            self.beginRemoveRows(QModelIndex(), 0, 0)
-            self._records.popleft()
+        When the limit is exceeded the oldest records are removed (before
+        the new ones are inserted).
+        """
+        if self._limit and len(records) > self._limit:
+            # Records that would be removed in the same batch
+            records = records[-self._limit :]
+        if not records:
+            return
+
+        overflow = len(self._records) + len(records) - self._limit
+        if self._limit and overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._records.popleft(overflow)
             self.endRemoveRows()
-            pos -= 1
 
-        self.beginInsertRows(QModelIndex(), pos, pos)
-        self._records.append(record)
+        pos = len(self._records)
+        self.beginInsertRows(QModelIndex(), pos, pos + len(records) - 1)
+        self._records.extend(records)
         self.endInsertRows()
 
     def clear(self):
+        self.beginResetModel()
         self._records.clear()
-        self.reset()
+        self.endResetModel()
 
     def record(self, pos):
         return self._records[pos]
 
+    def limit(self):
+        """The maximum number of stored records, 0 means no limit."""
+        return self._limit
+
 
 class LogRecordFilterModel(QSortFilterProxyModel):
     def __init__(self, levels, **kwargs):
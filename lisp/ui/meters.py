@@ -0,0 +1,153 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Lock
+
+from lisp.core.clock import Clock_33, Clock_100
+from lisp.core.singleton import Singleton
+
+
+class _MeterSource:
+    """A meter element, with the widgets watching it."""
+
+    def __init__(self, element, ready):
+        self.element = element
+        self.widgets = set()
+        # The widgets currently shown on screen
+        self.shown = set()
+        self.metering = False
+
+        self.__ready = ready
+
+    def levels_ready(self, peaks, rms, decay_peaks):
+        self.__ready(self, (peaks, rms, decay_peaks))
+
+    def set_metering(self, enable):
+        if enable != self.metering:
+            self.metering = enable
+            self.element.set_metering(enable)
+
+
+class MeterService(metaclass=Singleton):
+    """Deliver the levels of meter elements to the `DBMeter` widgets.
+
+    Elements (e.g. `DbMeter`) are metering (posting their levels) only while
+    at least one of the widgets watching them is actually shown on screen,
+    i.e. not hidden and not scrolled out of view.
+
+    Levels are collected as they arrive, and delivered once per frame,
+    only the most recent levels of each element are used, all the widgets
+    are updated in a single pass, so they are repainted together.
+
+    The elements must provide a `level_ready` signal, emitted with
+    (peaks, rms, decay_peaks), and a `set_metering(enable)` method.
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__sources = {}
+        # {element: _MeterSource}
+        self.__widgets = {}
+        # {widget: _MeterSource}
+        self.__pending = {}
+        # {_MeterSource: levels}
+
+    def watch(self, widget, element):
+        """Plot the levels of `element` in `widget` (while it's shown).
+
+        A widget can watch a single element, the previous one is unwatched.
+
+        :type widget: lisp.ui.widgets.dbmeter.DBMeter
+        """
+        self.unwatch(widget)
+
+        source = self.__sources.get(element)
+        if source is None:
+            source = self.__sources[element] = _MeterSource(
+                element, self.__levels_ready
+            )
+            element.level_ready.connect(source.levels_ready)
+
+        if not self.__widgets:
+            Clock_33.add_callback(self.__deliver)
+            Clock_100.add_callback(self.__update_shown)
+
+        source.widgets.add(widget)
+        self.__widgets[widget] = source
+        self.__set_shown(source, widget, self.__is_shown(widget))
+
+    def unwatch(self, widget):
+        source = self.__widgets.pop(widget, None)
+        if source is None:
+            return
+
+        source.widgets.discard(widget)
+        source.shown.discard(widget)
+        source.set_metering(bool(source.shown))
+
+        if not source.widgets:
+            source.element.level_ready.disconnect(source.levels_ready)
+            self.__sources.pop(source.element, None)
+            with self.__lock:
+                self.__pending.pop(source, None)
+
+        if not self.__widgets:
+            Clock_33.remove_callback(self.__deliver)
+            Clock_100.remove_callback(self.__update_shown)
+
+    def __levels_ready(self, source, levels):
+        with self.__lock:
+            self.__pending[source] = levels
+
+    def __deliver(self):
+        with self.__lock:
+            if not self.__pending:
+                return
+
+            pending = self.__pending
+            self.__pending = {}
+
+        for source, (peaks, rms, decay_peaks) in pending.items():
+            for widget in source.shown:
+                # Widgets can modify the values (e.g. for smoothing)
+                widget.plot(list(peaks), rms, list(decay_peaks))
+
+    def __update_shown(self):
+        for widget, source in tuple(self.__widgets.items()):
+            try:
+                shown = self.__is_shown(widget)
+            except RuntimeError:
+                # The widget has been deleted (without being unwatched)
+                self.unwatch(widget)
+            else:
+                if shown != (widget in source.shown):
+                    self.__set_shown(source, widget, shown)
+
+    @staticmethod
+    def __is_shown(widget):
+        return not widget.visibleRegion().isEmpty()
+
+    @staticmethod
+    def __set_shown(source, widget, shown):
+        if shown:
+            source.shown.add(widget)
+        else:
+            source.shown.discard(widget)
+            # Don't show outdated levels when the widget is visible again
+            widget.reset()
+
+        source.set_metering(bool(source.shown))
@@ -97,6 +97,14 @@ class AppGeneral(SettingsPage):
         self.localeCombo = LocaleComboBox(self.localeGroup)
         self.localeGroup.layout().addWidget(self.localeCombo)
 
+        # Session
+        self.sessionGroup = QGroupBox(self)
+        self.sessionGroup.setLayout(QVBoxLayout())
+        self.layout().addWidget(self.sessionGroup)
+
+        self.journalCheck = QCheckBox(self.sessionGroup)
+        self.sessionGroup.layout().addWidget(self.journalCheck)
+
         self.retranslateUi()
 
     def retranslateUi(self):
@@ -122,6 +130,14 @@ class AppGeneral(SettingsPage):
         )
         self.localeLabel.setText(translate("AppGeneralSettings", "Language:"))
 
+        self.sessionGroup.setTitle(translate("AppGeneralSettings", "Session"))
+        self.journalCheck.setText(
+            translate(
+                "AppGeneralSettings",
+                "Save only the changes, and allow recovering unsaved changes",
+            )
+        )
+
     def getSettings(self):
         settings = {
             "theme": {
@@ -130,6 +146,7 @@ class AppGeneral(SettingsPage):
             },
             "locale": self.localeCombo.currentLocale(),
             "layout": {},
+            "session": {"journal": self.journalCheck.isChecked()},
         }
 
         if self.startupDialogCheck.isChecked():
@@ -151,3 +168,6 @@ class AppGeneral(SettingsPage):
         self.themeCombo.setCurrentText(settings["theme"]["theme"])
         self.iconsCombo.setCurrentText(settings["theme"]["icons"])
         self.localeCombo.setCurrentLocale(settings["locale"])
+        self.journalCheck.setChecked(
+            settings.get("session", {}).get("journal", False)
+        )
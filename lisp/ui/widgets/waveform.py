@@ -1,12 +1,14 @@
 from math import floor, ceil
 
 from PyQt5.QtCore import QLineF, pyqtSignal, Qt, QRectF
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush
-from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QPixmap
+from PyQt5.QtWidgets import QWidget, QProgressDialog
 
 from lisp.backend.waveform import Waveform
+from lisp.backend.waveform_service import WaveformService, WaveformPriority
 from lisp.core.signal import Connection
 from lisp.core.util import strtime
+from lisp.ui.ui_utils import translate
 from lisp.ui.widgets.dynamicfontsize import DynamicFontSizeMixin
 
 
@@ -19,6 +21,9 @@ class WaveformWidget(QWidget):
         self._value = 0
         self._lastDrawnValue = 0
 
+        # Pre-rendered waveform (elapsed, remains), for the current size
+        self._pixmaps = None
+
         self.backgroundColor = QColor(32, 32, 32)
         self.backgroundRadius = 6
         self.elapsedPeakColor = QColor(75, 154, 250)
@@ -26,12 +31,11 @@ class WaveformWidget(QWidget):
         self.remainsPeakColor = QColor(90, 90, 90)
         self.remainsRmsColor = QColor(130, 130, 130)
 
-        # Watch for the waveform to be ready
+        # Watch for the waveform to be ready, it's loaded when shown
         self._waveform.ready.connect(self._ready, Connection.QtQueued)
-        # Load the waveform
-        self._waveform.load_waveform()
 
     def _ready(self):
+        self._pixmaps = None
         self.setMaximum(self._waveform.duration)
         self.update()
 
@@ -67,90 +71,135 @@ class WaveformWidget(QWidget):
                 # Repaint only the changed area
                 self.update(x - 1, 0, width + 2, self.height())
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._waveform.is_ready():
+            self._waveform.load_waveform(WaveformPriority.Visible)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if not self._waveform.is_ready():
+            WaveformService().cancel(self._waveform)
+
     def resizeEvent(self, event):
         self._valueToPx = self._maximum / self.width()
+        self._pixmaps = None
 
     def paintEvent(self, event):
-        halfHeight = self.height() / 2
+        if self._pixmaps is None:
+            self._pixmaps = (
+                self._renderWaveform(
+                    self.elapsedPeakColor, self.elapsedRmsColor
+                ),
+                self._renderWaveform(
+                    self.remainsPeakColor, self.remainsRmsColor
+                ),
+            )
+
         painter = QPainter()
         painter.begin(self)
 
-        # Draw the background (it will be clipped to event.rect())
+        rect = event.rect()
+        elapsedPixmap, remainsPixmap = self._pixmaps
+        if self._valueToPx:
+            elapsedWidth = floor(self._value / self._valueToPx)
+        else:
+            elapsedWidth = 0
+
+        # Blit the elapsed part
+        if rect.x() < elapsedWidth:
+            elapsedRect = QRectF(rect).intersected(
+                QRectF(0, 0, elapsedWidth, self.height())
+            )
+            painter.drawPixmap(
+                elapsedRect, elapsedPixmap, self._sourceRect(elapsedRect)
+            )
+
+        # Blit the remaining part
+        if rect.right() >= elapsedWidth:
+            remainsRect = QRectF(rect).intersected(
+                QRectF(
+                    elapsedWidth, 0, self.width() - elapsedWidth, self.height()
+                )
+            )
+            painter.drawPixmap(
+                remainsRect, remainsPixmap, self._sourceRect(remainsRect)
+            )
+
+        painter.end()
+
+        # Remember the last drawn item
+        self._lastDrawnValue = self._value
+
+    def _sourceRect(self, rect):
+        # Pixmaps are in device pixels
+        ratio = self.devicePixelRatioF()
+        return QRectF(
+            rect.x() * ratio,
+            rect.y() * ratio,
+            rect.width() * ratio,
+            rect.height() * ratio,
+        )
+
+    def _renderWaveform(self, peakColor, rmsColor):
+        """Render the whole waveform, with the given colors, to a pixmap."""
+        width = self.width()
+        height = self.height()
+        halfHeight = height / 2
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter()
+        painter.begin(pixmap)
+
+        # Draw the background
         pen = QPen(QColor(0, 0, 0, 0))
         painter.setPen(pen)
         painter.setBrush(QBrush(self.backgroundColor))
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.drawRoundedRect(self.rect(), 6, 6)
+        painter.drawRoundedRect(
+            self.rect(), self.backgroundRadius, self.backgroundRadius
+        )
         painter.setRenderHint(QPainter.Antialiasing, False)
 
-        # Draw the weveform
+        # Draw the waveform
         pen.setWidth(1)
-        painter.setPen(pen)
+        resampled = self._waveform.resample(width)
 
-        if self._valueToPx and self._waveform.is_ready():
-            peakSamples = self._waveform.peak_samples
-            rmsSamples = self._waveform.rms_samples
-            samplesToPx = len(peakSamples) / self.width()
-            elapsedWidth = floor(self._value / self._valueToPx)
+        if resampled is not None:
+            peaks, rms = resampled
+
+            peakLines = []
+            rmsLines = []
+            for x in range(width):
+                peak = peaks[x] * halfHeight
+                peakLines.append(
+                    QLineF(x, halfHeight + peak, x, halfHeight - peak)
+                )
 
-            peakElapsedLines = []
-            peakRemainsLines = []
-            rmsElapsedLines = []
-            rmsRemainsLines = []
-            for x in range(event.rect().x(), event.rect().right() + 1):
-                # Calculate re-sample interval
-                s0 = floor(x * samplesToPx)
-                s1 = ceil(x * samplesToPx + samplesToPx)
-                # Re-sample the values
-                peak = max(peakSamples[s0:s1]) * halfHeight
-                rms = (sum(rmsSamples[s0:s1]) / samplesToPx) * halfHeight
-
-                # Create lines to draw
-                peakLine = QLineF(x, halfHeight + peak, x, halfHeight - peak)
-                rmsLine = QLineF(x, halfHeight + rms, x, halfHeight - rms)
-
-                # Decide if elapsed or remaining
-                if x < elapsedWidth:
-                    peakElapsedLines.append(peakLine)
-                    rmsElapsedLines.append(rmsLine)
-                else:
-                    peakRemainsLines.append(peakLine)
-                    rmsRemainsLines.append(rmsLine)
-
-            # Draw peak for elapsed
-            if peakElapsedLines:
-                pen.setColor(self.elapsedPeakColor)
-                painter.setPen(pen)
-                painter.drawLines(peakElapsedLines)
-
-            # Draw rms for elapsed
-            if rmsElapsedLines:
-                pen.setColor(self.elapsedRmsColor)
-                painter.setPen(pen)
-                painter.drawLines(rmsElapsedLines)
-
-            # Draw peak for remaining
-            if peakRemainsLines:
-                pen.setColor(self.remainsPeakColor)
-                painter.setPen(pen)
-                painter.drawLines(peakRemainsLines)
-
-            # Draw rms for remaining
-            if rmsRemainsLines:
-                pen.setColor(self.remainsRmsColor)
-                painter.setPen(pen)
-                painter.drawLines(rmsRemainsLines)
-
-            # Remember the last drawn item
-            self._lastDrawnValue = self._value
+                r = rms[x] * halfHeight
+                rmsLines.append(QLineF(x, halfHeight + r, x, halfHeight - r))
+
+            pen.setColor(peakColor)
+            painter.setPen(pen)
+            painter.drawLines(peakLines)
+
+            pen.setColor(rmsColor)
+            painter.setPen(pen)
+            painter.drawLines(rmsLines)
         else:
             # Draw a single line in the middle
             pen.setColor(self.remainsRmsColor)
             painter.setPen(pen)
-            painter.drawLine(QLineF(0, halfHeight, self.width(), halfHeight))
+            painter.drawLine(QLineF(0, halfHeight, width, halfHeight))
 
         painter.end()
 
+        return pixmap
+
 
 class WaveformSlider(DynamicFontSizeMixin, WaveformWidget):
     """Implement an API similar to a QAbstractSlider."""
@@ -256,3 +305,35 @@ class WaveformSlider(DynamicFontSizeMixin, WaveformWidget):
             painter.drawText(rect, Qt.AlignCenter, text)
 
             painter.end()
+
+
+class WaveformProgressDialog(QProgressDialog):
+    """Show the progress of a WaveformBatch, allowing to cancel it."""
+
+    def __init__(self, batch, parent=None):
+        super().__init__(parent)
+        self._batch = batch
+
+        self.setWindowTitle(translate("Waveform", "Rendering waveforms ..."))
+        self.setMaximumSize(320, 110)
+        self.setMinimumSize(320, 110)
+        self.resize(320, 110)
+
+        self.setMaximum(batch.total)
+        self.setLabelText(f"0 / {batch.total}")
+
+        self.canceled.connect(batch.cancel)
+        batch.progress.connect(self._progress, Connection.QtQueued)
+        batch.finished.connect(self._finished, Connection.QtQueued)
+
+        if batch.is_finished():
+            # Completed before we could connect
+            self._finished()
+
+    def _progress(self, completed, total):
+        self.setValue(completed)
+        self.setLabelText(f"{completed} / {total}")
+
+    def _finished(self):
+        self.setValue(self.maximum())
+        self.deleteLater()
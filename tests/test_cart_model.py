@@ -0,0 +1,74 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from lisp.core.model import ModelException
+from lisp.cues.cue import Cue
+from lisp.cues.cue_model import CueModel
+from lisp.plugins.cart_layout.model import CueCartModel
+
+
+class TestCueCartModel(unittest.TestCase):
+    def setUp(self):
+        self.model = CueCartModel(CueModel(), rows=2, columns=2)
+        self.cues = [Cue(None) for _ in range(3)]
+        self.model.add_many(self.cues)
+
+        self.moves = []
+        self.model.items_moved.connect(self.__items_moved)
+
+    def __items_moved(self, old_indexes, new_indexes):
+        self.moves.append((old_indexes, new_indexes))
+
+    def assertCells(self, cells):
+        self.assertEqual([self.model.item(index) for index in cells], self.cues)
+        self.assertEqual([cue.index for cue in self.cues], cells)
+
+    def test_move_many_overlapping(self):
+        # Shift all the cues by one, each to the cell of the next one
+        self.model.move_many((0, 1, 2), (1, 2, 3))
+
+        self.assertCells([1, 2, 3])
+        self.assertEqual(self.moves, [((0, 1, 2), (1, 2, 3))])
+
+    def test_move_many_swap(self):
+        self.model.move_many((0, 2), (2, 0))
+
+        self.cues[0], self.cues[2] = self.cues[2], self.cues[0]
+        self.assertCells([0, 1, 2])
+
+    def test_move_many_to_used_index(self):
+        with self.assertRaises(ModelException):
+            self.model.move_many((0,), (1,))
+
+        with self.assertRaises(ModelException):
+            self.model.move_many((0, 1), (3, 3))
+
+        # Nothing is changed
+        self.assertCells([0, 1, 2])
+        self.assertEqual(self.moves, [])
+
+    def test_move(self):
+        self.model.move(2, (0, 1, 1))
+
+        self.assertCells([0, 1, 3])
+        self.assertEqual(self.moves, [((2,), (3,))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from lisp.cues.cue import Cue, CueState
+from lisp.cues.cue_model import CueModel
+
+
+class AudioCue(Cue):
+    pass
+
+
+class VideoCue(Cue):
+    pass
+
+
+class TestCueIndex(unittest.TestCase):
+    def setUp(self):
+        self.model = CueModel()
+        self.cues = [
+            cue_class(None)
+            for cue_class in (AudioCue, VideoCue, Cue, VideoCue, AudioCue)
+        ]
+        self.model.add_many(self.cues)
+
+    def test_filter_insertion_order(self):
+        self.assertEqual(list(self.model.filter()), self.cues)
+        self.assertEqual(
+            list(self.model.filter(VideoCue)), [self.cues[1], self.cues[3]]
+        )
+        self.assertEqual(
+            list(self.model.filter((AudioCue, VideoCue))),
+            [self.cues[0], self.cues[1], self.cues[3], self.cues[4]],
+        )
+
+    def test_filter_after_remove(self):
+        self.model.remove(self.cues[0])
+        self.model.add(self.cues[0])
+
+        self.assertEqual(
+            list(self.model.filter()), self.cues[1:] + self.cues[:1]
+        )
+
+    def test_in_state_insertion_order(self):
+        for cue in (self.cues[3], self.cues[0]):
+            cue._state = CueState.Running
+            cue.started.emit(cue)
+        self.cues[1]._state = CueState.Pause
+        self.cues[1].paused.emit(self.cues[1])
+
+        self.assertEqual(
+            list(self.model.in_state(CueState.Running | CueState.Pause)),
+            [self.cues[0], self.cues[1], self.cues[3]],
+        )
@@ -0,0 +1,108 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import tempfile
+import unittest
+
+from lisp.core.session_journal import SessionJournal, apply_operations
+
+# A→3, B→2, C→0, D→1
+MOVES = [
+    ["set", "A", ["index"], 3],
+    ["set", "B", ["index"], 2],
+    ["set", "C", ["index"], 0],
+    ["set", "D", ["index"], 1],
+]
+
+
+def session_dict(journal=None):
+    cues = [{"id": id_, "index": index} for index, id_ in enumerate("ABCD")]
+    meta = {"journal": journal} if journal is not None else {}
+
+    return {"meta": meta, "session": {}, "cues": cues}
+
+
+def cues_order(session):
+    return [cue["id"] for cue in session["cues"]]
+
+
+class TestApplyOperations(unittest.TestCase):
+    def test_moves(self):
+        session = session_dict()
+        apply_operations(session, MOVES)
+
+        self.assertEqual(cues_order(session), ["C", "D", "B", "A"])
+
+    def test_added_cue_is_placed_by_index(self):
+        session = session_dict()
+        apply_operations(
+            session,
+            [
+                ["set", "B", ["index"], 2],
+                ["set", "C", ["index"], 3],
+                ["set", "D", ["index"], 4],
+                ["add", {"id": "E", "index": 1}],
+            ],
+        )
+
+        self.assertEqual(cues_order(session), ["A", "E", "B", "C", "D"])
+
+
+class TestSessionJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.session_file = os.path.join(self.directory.name, "show.lsp")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_journal(self, journal_id, records):
+        with open(self.session_file + SessionJournal.FILE_SUFFIX, "w") as file:
+            header = {"journal": journal_id, "version": SessionJournal.VERSION}
+            file.write(json.dumps(header) + "\n")
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+
+    def test_recover_after_move(self):
+        self.write_journal("j", [{"ops": MOVES, "seq": 1}])
+
+        session = session_dict({"id": "j", "seq": 0})
+        journal = SessionJournal.load(self.session_file, session)
+
+        # The moves are not saved, so they're not applied when loading
+        self.assertEqual(cues_order(session), ["A", "B", "C", "D"])
+        self.assertEqual(len(journal.unsaved), 1)
+
+        journal.recover(session)
+        self.assertEqual(cues_order(session), ["C", "D", "B", "A"])
+
+    def test_load_saved_moves(self):
+        self.write_journal(
+            "j", [{"ops": MOVES, "seq": 1}, {"saved": True, "seq": 2}]
+        )
+
+        session = session_dict({"id": "j", "seq": 0})
+        journal = SessionJournal.load(self.session_file, session)
+
+        self.assertEqual(cues_order(session), ["C", "D", "B", "A"])
+        self.assertEqual(journal.unsaved, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# This file is part of Linux Show Player
+#
+# Copyright 2024 Francesco Ceruti <ceppofrancy@gmail.com>
+#
+# Linux Show Player is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Linux Show Player is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Linux Show Player.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+from threading import Event
+
+from lisp.core.worker_pool import TaskPriority, WorkerPool
+
+TIMEOUT = 5
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=2, max_overflow=2)
+        self.release = Event()
+        self.calls = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def blocking(self, name, started=None):
+        self.calls.append(name)
+        if started is not None:
+            started.set()
+        self.release.wait(TIMEOUT)
+
+    def call(self, name, done):
+        self.calls.append(name)
+        done.set()
+
+    def test_keyed_tasks_wait_completion(self):
+        started = Event()
+        done = Event()
+        self.pool.submit(self.blocking, "start", started, key="cue")
+        self.assertTrue(started.wait(TIMEOUT))
+
+        self.pool.submit(
+            self.call, "stop", done, priority=TaskPriority.High, key="cue"
+        )
+        self.assertFalse(done.wait(0.1))
+
+        self.release.set()
+        self.assertTrue(done.wait(TIMEOUT))
+        self.assertEqual(self.calls, ["start", "stop"])
+
+    def test_release_key(self):
+        done = Event()
+
+        def start():
+            self.calls.append("start")
+            self.pool.release_key()
+            self.release.wait(TIMEOUT)
+
+        self.pool.submit(start, key="cue")
+        self.pool.submit(self.call, "stop", done, key="cue")
+
+        self.assertTrue(done.wait(TIMEOUT))
+        self.assertEqual(self.calls, ["start", "stop"])
+
+    def test_bounded_workers(self):
+        started = Event()
+        first = Event()
+        self.pool.submit(first.wait, TIMEOUT)
+        for n in range(3):
+            running = Event()
+            self.pool.submit(self.blocking, n, running)
+            self.assertTrue(running.wait(TIMEOUT))
+
+        # All the workers are busy, the tasks are queued by priority
+        self.pool.submit(self.blocking, "normal")
+        self.pool.submit(
+            self.blocking, "high", started, priority=TaskPriority.High
+        )
+        self.assertFalse(started.wait(0.1))
+        self.assertEqual(self.pool.workers(), 4)
+        self.assertEqual(self.pool.pending(), 2)
+
+        # The first free worker takes the "high" task
+        first.set()
+        self.assertTrue(started.wait(TIMEOUT))
+        self.assertNotIn("normal", self.calls)